@@ -0,0 +1,49 @@
+"""composite indexes for usage events and active auth sessions
+
+Revision ID: 20260412_0025
+Revises: 20260405_0024
+Create Date: 2026-04-12 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+
+revision = "20260412_0025"
+down_revision = "20260405_0024"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # usage_events: "event_type = X AND created_at > Y" becomes one range scan
+    # instead of a BitmapAnd over two single-column indexes.
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_usage_events_type_created
+        ON usage_events (event_type, created_at DESC);
+        """
+    )
+    # ix_usage_events_org_created (org_id, created_at DESC) already exists from 0019.
+    # The single-column event_type index is a strict prefix of the new composite.
+    op.execute("DROP INDEX IF EXISTS idx_usage_events_event_type;")
+
+    # auth_sessions: session-cap and session-listing queries look for one user's
+    # non-revoked sessions that have not expired yet. idx_auth_sessions_user_id
+    # stays for the ON DELETE CASCADE path and the unfiltered per-user lookups.
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_auth_sessions_user_active
+        ON auth_sessions (user_id, expires_at)
+        WHERE revoked_at IS NULL;
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_auth_sessions_user_active;")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_usage_events_event_type ON usage_events (event_type);"
+    )
+    op.execute("DROP INDEX IF EXISTS ix_usage_events_type_created;")
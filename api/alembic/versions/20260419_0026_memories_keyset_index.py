@@ -0,0 +1,37 @@
+"""memories (project_id, created_at DESC, id DESC) index for keyset pagination
+
+Revision ID: 20260419_0026
+Revises: 20260412_0025
+Create Date: 2026-04-19 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+
+revision = "20260419_0026"
+down_revision = "20260412_0025"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # list_memories pages with (created_at, id) < (:ts, :id) ordered by
+    # created_at DESC, id DESC; including id lets the cursor bound the scan
+    # and serve the tie-break without a sort.
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_memories_project_created_id
+        ON memories (project_id, created_at DESC, id DESC);
+        """
+    )
+    # Strict prefix of the new index.
+    op.execute("DROP INDEX IF EXISTS ix_memories_project_created;")
+
+
+def downgrade() -> None:
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_memories_project_created ON memories (project_id, created_at DESC);"
+    )
+    op.execute("DROP INDEX IF EXISTS ix_memories_project_created_id;")
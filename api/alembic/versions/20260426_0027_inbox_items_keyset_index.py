@@ -0,0 +1,38 @@
+"""inbox_items (project_id, status, created_at DESC, id DESC) index
+
+Revision ID: 20260426_0027
+Revises: 20260419_0026
+Create Date: 2026-04-26 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+
+revision = "20260426_0027"
+down_revision = "20260419_0026"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The inbox list filters one project's drafts by status and orders by
+    # created_at DESC, id DESC, the same shape memories got in 0026. With the
+    # sort keys in the index the planner walks it and stops at LIMIT instead
+    # of sorting every pending draft.
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_inbox_items_project_status_created_id
+        ON inbox_items (project_id, status, created_at DESC, id DESC);
+        """
+    )
+    # Strict prefix of the new index.
+    op.execute("DROP INDEX IF EXISTS ix_inbox_items_project_status;")
+
+
+def downgrade() -> None:
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_inbox_items_project_status ON inbox_items (project_id, status);"
+    )
+    op.execute("DROP INDEX IF EXISTS ix_inbox_items_project_status_created_id;")
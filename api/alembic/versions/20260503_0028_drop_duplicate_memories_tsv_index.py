@@ -0,0 +1,28 @@
+"""drop the duplicate GIN index on memories.search_tsv
+
+Revision ID: 20260503_0028
+Revises: 20260426_0027
+Create Date: 2026-05-03 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+
+revision = "20260503_0028"
+down_revision = "20260426_0027"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # search_tsv is the stored, trigger-maintained tsvector that search and
+    # local hybrid recall rank with ts_rank_cd. 0001 indexed it as
+    # idx_memories_search_tsv and 0003 added an identical ix_memories_tsv, so
+    # every insert and content edit paid for two GIN updates.
+    op.execute("DROP INDEX IF EXISTS ix_memories_tsv;")
+
+
+def downgrade() -> None:
+    op.execute("CREATE INDEX IF NOT EXISTS ix_memories_tsv ON memories USING GIN (search_tsv);")
@@ -0,0 +1,36 @@
+"""partial covering index for the hedge p95 refresh
+
+Revision ID: 20260510_0029
+Revises: 20260503_0028
+Create Date: 2026-05-10 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+
+revision = "20260510_0029"
+down_revision = "20260503_0028"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # refresh_recall_hedge_p95_cache computes per-org percentile_cont over the
+    # last lookback window of CAG timings across every org. Only rows with a
+    # cag_duration_ms qualify, and the aggregate needs just org_id and the
+    # duration, so a partial index on created_at that carries both lets the
+    # refresh run as an index-only range scan instead of reading the heap.
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_recall_timings_cag_created
+        ON recall_timings (created_at)
+        INCLUDE (org_id, cag_duration_ms)
+        WHERE cag_duration_ms IS NOT NULL;
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_recall_timings_cag_created;")
@@ -16,12 +16,19 @@ from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from typing import Any, Iterable, Mapping, Sequence
 
-from sqlalchemy import Float, bindparam, select
+import numpy as np
+from sqlalchemy import Float, bindparam, case, func, literal, literal_column, select
 from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer
 
 from app.models import Memory
 
+try:  # pragma: no cover - optional SIMD kernels for local cosine scoring
+    import simsimd as _simsimd
+except ModuleNotFoundError:  # pragma: no cover - NumPy matmul fallback
+    _simsimd = None
+
 logger = logging.getLogger(__name__)
 
 TOKEN_RE = re.compile(r"[a-z0-9_]{2,}", re.IGNORECASE)
@@ -31,6 +38,11 @@ LOCAL_RECALL_FALLBACK_MAX_MEMORIES = max(
     1,
     int(os.getenv("LOCAL_RECALL_FALLBACK_MAX_MEMORIES", "500")),
 )
+RECENCY_HALF_LIFE_HOURS = 24.0 * 14.0
+# Reciprocal Rank Fusion constant: a memory at 1-based rank r in a signal's
+# ordering contributes weight / (RRF_K + r).
+RRF_K = 60
+_FTS_CONFIG = literal_column("'english'::regconfig")
 PRIVATE_ENGINE_FAILURE_COOLDOWN_SECONDS = max(
     1,
     int(os.getenv("PRIVATE_ENGINE_FAILURE_COOLDOWN_SECONDS", "60")),
@@ -161,7 +173,9 @@ def get_private_engine_runtime_state() -> dict[str, Any]:
 def tokenize(text: str | None) -> list[str]:
     if not text:
         return []
-    return [match.group(0).lower() for match in TOKEN_RE.finditer(text)]
+    # Lower once and let findall build the list in C instead of a per-match
+    # group()/lower() round trip.
+    return TOKEN_RE.findall(text.lower())
 
 
 def token_overlap_score(query: str | Sequence[str], text: str | Sequence[str]) -> float:
@@ -174,6 +188,19 @@ def token_overlap_score(query: str | Sequence[str], text: str | Sequence[str]) -
     return len(query_set & text_set) / max(len(query_set), 1)
 
 
+def _token_overlap_scores(query_tokens: Sequence[str], texts: Sequence[str]) -> np.ndarray:
+    """token_overlap_score for many texts against one query, as an array."""
+    query_set = frozenset(query_tokens)
+    if not query_set:
+        return np.zeros(len(texts), dtype=np.float64)
+    denominator = float(len(query_set))
+    return np.fromiter(
+        (len(query_set.intersection(tokenize(text))) / denominator for text in texts),
+        dtype=np.float64,
+        count=len(texts),
+    )
+
+
 def normalize_positive(values: Sequence[float]) -> list[float]:
     if not values:
         return []
@@ -190,7 +217,7 @@ def recency_boost(created_at: datetime | None, now: datetime | None = None) -> f
     if created_at.tzinfo is None:
         created_at = created_at.replace(tzinfo=timezone.utc)
     age_hours = max((now - created_at).total_seconds() / 3600.0, 0.0)
-    return math.exp(-age_hours / (24.0 * 14.0))
+    return math.exp(-age_hours / RECENCY_HALF_LIFE_HOURS)
 
 
 def merge_hybrid_scores(
@@ -214,17 +241,12 @@ def compute_embedding(text: str, *args: Any, **kwargs: Any) -> list[float]:
     if not payload:
         return [0.0] * DEFAULT_EMBEDDING_DIMS
 
-    vector: list[float] = []
-    counter = 0
-    while len(vector) < DEFAULT_EMBEDDING_DIMS:
-        digest = hashlib.sha256(payload + counter.to_bytes(4, "big")).digest()
-        for idx in range(0, len(digest), 2):
-            if len(vector) >= DEFAULT_EMBEDDING_DIMS:
-                break
-            chunk = int.from_bytes(digest[idx : idx + 2], "big")
-            vector.append((chunk / 65535.0) * 2.0 - 1.0)
-        counter += 1
-    return vector
+    # 16 big-endian uint16 values per SHA-256 block of payload + counter,
+    # scaled to [-1, 1]; decoded in one frombuffer instead of per chunk.
+    blocks = -(-DEFAULT_EMBEDDING_DIMS // 16)
+    digests = b"".join(hashlib.sha256(payload + counter.to_bytes(4, "big")).digest() for counter in range(blocks))
+    values = np.frombuffer(digests, dtype=">u2", count=DEFAULT_EMBEDDING_DIMS)
+    return ((values / 65535.0) * 2.0 - 1.0).tolist()
 
 
 def compute_hilbert_index(vector: Sequence[float] | None):
@@ -240,7 +262,13 @@ def compute_hilbert_index(vector: Sequence[float] | None):
 async def fetch_memories_by_ids(db: AsyncSession, memory_ids: Sequence[int]) -> list[Memory]:
     if not memory_ids:
         return []
-    rows = (await db.execute(select(Memory).where(Memory.id.in_(list(memory_ids))))).scalars().all()
+    rows = (
+        await db.execute(
+            select(Memory)
+            .options(defer(Memory.search_vector), defer(Memory.embedding_vector))
+            .where(Memory.id.in_(list(memory_ids)))
+        )
+    ).scalars().all()
     by_id = {memory.id: memory for memory in rows}
     return [by_id[memory_id] for memory_id in memory_ids if memory_id in by_id]
 
@@ -259,6 +287,75 @@ def _cosine_similarity(a: Sequence[float] | None, b: Sequence[float] | None) ->
     return max(0.0, dot / (mag_left * mag_right))
 
 
+def _normalize_positive_array(values: np.ndarray) -> np.ndarray:
+    """Array form of normalize_positive."""
+    clipped = np.maximum(values, 0.0)
+    max_value = clipped.max(initial=0.0)
+    if max_value <= 0:
+        return np.zeros_like(clipped)
+    return clipped / max_value
+
+
+def _cosine_similarities(query_embedding: Sequence[float], vectors: list[Sequence[float] | None]) -> np.ndarray:
+    """Clamped cosine similarity of every vector against the query.
+
+    Uses SimSIMD's batched cosine kernel on float32 when the package is
+    installed, otherwise one float64 NumPy matmul. Vectors whose length differs
+    from the query's go through the scalar _cosine_similarity path, which
+    compares the common prefix.
+    """
+    query = np.asarray(query_embedding, dtype=np.float64)
+    scores = np.zeros(len(vectors), dtype=np.float64)
+    if query.size == 0:
+        return scores
+    full_rows: list[int] = []
+    full_values: list[list[float]] = []
+    for idx, vector in enumerate(vectors):
+        values = _sequence_values(vector)
+        if len(values) == query.size:
+            full_rows.append(idx)
+            full_values.append(values)
+        elif values:
+            scores[idx] = _cosine_similarity(query_embedding, values)
+    if full_rows and _simsimd is not None:
+        matrix = np.asarray(full_values, dtype=np.float32)
+        distances = np.asarray(
+            _simsimd.cdist(query.astype(np.float32)[np.newaxis, :], matrix, metric="cosine"),
+            dtype=np.float64,
+        )[0]
+        # Zero vectors come back with distance 1, i.e. similarity 0.
+        scores[full_rows] = np.maximum(1.0 - distances, 0.0)
+    elif full_rows:
+        matrix = np.asarray(full_values, dtype=np.float64)
+        denom = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cosine = np.where(denom > 0, (matrix @ query) / denom, 0.0)
+        scores[full_rows] = np.maximum(cosine, 0.0)
+    return scores
+
+
+def _timestamps(created_ats: Sequence[datetime | None], missing: float) -> np.ndarray:
+    """Epoch seconds for each datetime (naive values taken as UTC)."""
+    return np.fromiter(
+        (
+            (value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)).timestamp()
+            if value is not None
+            else missing
+            for value in created_ats
+        ),
+        dtype=np.float64,
+        count=len(created_ats),
+    )
+
+
+def _recency_boosts(created_ats: list[datetime | None], now: datetime | None = None) -> np.ndarray:
+    """Array form of recency_boost; missing timestamps score 0."""
+    now = now or _utc_now()
+    timestamps = _timestamps(created_ats, np.nan)
+    age_hours = np.maximum((now.timestamp() - timestamps) / 3600.0, 0.0)
+    return np.nan_to_num(np.exp(-age_hours / RECENCY_HALF_LIFE_HOURS), nan=0.0)
+
+
 def score_memories_local(
     query: str,
     memories,
@@ -271,28 +368,34 @@ def score_memories_local(
 
     weights = weights or HybridWeights()
     query_tokens = tokenize(query)
-    query_embedding = compute_embedding(query)
-    token_scores = [token_overlap_score(query_tokens, _memory_text(memory)) for memory in memories]
-    vector_scores = [_cosine_similarity(query_embedding, _memory_vector(memory)) for memory in memories]
-    recency_scores = [recency_boost(_memory_created_at(memory)) for memory in memories]
-    merged = merge_hybrid_scores(
-        token_scores=normalize_positive(token_scores),
-        vector_scores=normalize_positive(vector_scores),
-        recency_scores=normalize_positive(recency_scores),
-        weights=weights,
+    created_ats = [_memory_created_at(memory) for memory in memories]
+    token_scores = _token_overlap_scores(query_tokens, [_memory_text(memory) for memory in memories])
+    vector_scores = _cosine_similarities(compute_embedding(query), [_memory_vector(memory) for memory in memories])
+    merged = (
+        weights.fts * _normalize_positive_array(token_scores)
+        + weights.vector * _normalize_positive_array(vector_scores)
+        + weights.recency * _normalize_positive_array(_recency_boosts(created_ats))
     )
 
-    ranked_pairs = list(zip(memories, merged))
-    ranked_pairs.sort(
-        key=lambda item: (
-            item[1],
-            _memory_created_at(item[0]) or datetime.min.replace(tzinfo=timezone.utc),
-            _memory_id(item[0]) or 0,
-        ),
-        reverse=True,
+    # Order by (score, created_at, id) descending. With a limit, argpartition
+    # finds the k-th best score and only rows at or above it (ties included)
+    # are fully sorted.
+    candidates = np.arange(len(memories))
+    if limit is not None and limit < len(memories):
+        if limit <= 0:
+            return []
+        kth = np.partition(merged, len(memories) - limit)[len(memories) - limit]
+        candidates = np.flatnonzero(merged >= kth)
+    created_keys = _timestamps([created_ats[idx] for idx in candidates], -np.inf)
+    id_keys = np.fromiter(
+        (_memory_id(memories[idx]) or 0 for idx in candidates),
+        dtype=np.int64,
+        count=len(candidates),
     )
+    order = candidates[np.lexsort((-id_keys, -created_keys, -merged[candidates]))]
     if limit is not None:
-        ranked_pairs = ranked_pairs[:limit]
+        order = order[:limit]
+    ranked_pairs = [(memories[idx], float(merged[idx])) for idx in order]
 
     first = ranked_pairs[0][0]
     if isinstance(first, Mapping):
@@ -305,6 +408,75 @@ def score_memories_local(
     return ranked_pairs
 
 
+def _normalized(score):
+    """SQL twin of normalize_positive: divide by the max over the result set."""
+    return func.coalesce(score / func.nullif(func.max(score).over(), 0), 0.0)
+
+
+def build_local_hybrid_stmt(
+    *,
+    project_id: int,
+    query_text: str,
+    limit: int,
+    config: HybridRecallConfig,
+    max_candidates: int,
+):
+    """Rank the project's most recent memories inside Postgres.
+
+    Candidates are the newest ``max_candidates`` rows that match any query token
+    through the ``search_tsv`` GIN index. The FTS (ts_rank_cd) and vector
+    (cosine similarity) orderings are merged with weighted Reciprocal Rank
+    Fusion, so neither score scale needs normalizing; recency decay, normalized
+    by its maximum, is added on top as a boost no larger than a first-place
+    RRF hit. Only the top ``limit`` (id, score) pairs leave the database.
+    """
+    terms = " | ".join(dict.fromkeys(tokenize(query_text)))
+    # Scalar subquery so the tsquery is parsed once per execution (InitPlan)
+    # even under a generic prepared plan, then shared by rank and filter.
+    tsquery = select(func.to_tsquery(_FTS_CONFIG, terms)).scalar_subquery()
+    distance = func.nullif(
+        Memory.embedding_vector.cosine_distance(compute_embedding(query_text)),
+        literal(float("nan"), Float()),
+    )
+    age_hours = func.greatest(func.extract("epoch", func.now() - Memory.created_at) / 3600.0, 0.0)
+
+    candidates = (
+        select(Memory.id)
+        .where(Memory.project_id == project_id)
+        .order_by(Memory.created_at.desc(), Memory.id.desc())
+        .limit(max_candidates)
+    )
+    matches = (
+        select(
+            Memory.id.label("id"),
+            Memory.created_at.label("created_at"),
+            func.ts_rank_cd(Memory.search_tsv, tsquery).label("fts"),
+            func.greatest(1.0 - func.coalesce(distance, 1.0), 0.0).label("vector"),
+            func.exp(-age_hours / RECENCY_HALF_LIFE_HOURS).label("recency"),
+        )
+        .where(Memory.id.in_(candidates), Memory.search_tsv.op("@@")(tsquery))
+        .subquery()
+    )
+    fts_rank = func.rank().over(order_by=matches.c.fts.desc())
+    vector_rank = func.rank().over(order_by=matches.c.vector.desc())
+    score = (
+        literal(config.fts_weight, Float()) / (RRF_K + fts_rank)
+        # Memories without a usable embedding get no vector contribution.
+        + case(
+            (matches.c.vector > 0, literal(config.vector_weight, Float()) / (RRF_K + vector_rank)),
+            else_=0.0,
+        )
+        + (config.recency_weight / (RRF_K + 1)) * _normalized(matches.c.recency)
+    ).label("score")
+    ranked = select(matches.c.id, matches.c.created_at, score).subquery()
+    return (
+        select(ranked.c.id, ranked.c.score)
+        .where(ranked.c.score > 0)
+        .order_by(ranked.c.score.desc(), ranked.c.created_at.desc(), ranked.c.id.desc())
+        .limit(limit)
+    )
+
+
 async def _run_hybrid_rag_recall_local(
     db: AsyncSession,
     *,
@@ -314,21 +486,23 @@ async def _run_hybrid_rag_recall_local(
     config: HybridRecallConfig | None = None,
 ) -> dict[str, Any]:
     config = config or HybridRecallConfig()
-    memories = (
-        await db.execute(
-            select(Memory)
-            .where(Memory.project_id == project_id)
-            .order_by(Memory.created_at.desc(), Memory.id.desc())
-            .limit(LOCAL_RECALL_FALLBACK_MAX_MEMORIES)
-        )
-    ).scalars().all()
+    input_ids = list(
+        (
+            await db.execute(
+                select(Memory.id)
+                .where(Memory.project_id == project_id)
+                .order_by(Memory.created_at.desc(), Memory.id.desc())
+                .limit(LOCAL_RECALL_FALLBACK_MAX_MEMORIES)
+            )
+        ).scalars()
+    )
 
     base_score_details = {
         "source": "local-fallback",
-        "candidate_count": len(memories),
+        "candidate_count": len(input_ids),
         "fallback_max_memories": LOCAL_RECALL_FALLBACK_MAX_MEMORIES,
     }
-    if not memories:
+    if not input_ids:
         return {
             "strategy": "recency",
             "input_ids": [],
@@ -337,25 +511,29 @@ async def _run_hybrid_rag_recall_local(
             "score_details": {**base_score_details, "reason": "no_memories"},
         }
 
-    ranked = score_memories_local(
-        query_text,
-        memories,
-        weights=HybridWeights(
-            fts=config.fts_weight,
-            vector=config.vector_weight,
-            recency=config.recency_weight,
-        ),
-    )
-    positive = [(memory, score) for memory, score in ranked if score > 0]
-    if positive:
-        top = positive[:limit]
+    top = []
+    if tokenize(query_text):
+        top = (
+            await db.execute(
+                build_local_hybrid_stmt(
+                    project_id=project_id,
+                    query_text=query_text,
+                    limit=limit,
+                    config=config,
+                    max_candidates=LOCAL_RECALL_FALLBACK_MAX_MEMORIES,
+                )
+            )
+        ).all()
+    if top:
         return {
             "strategy": "hybrid",
-            "input_ids": [memory.id for memory in memories],
-            "ranked_ids": [memory.id for memory, _ in top],
-            "scores": {memory.id: round(score, 6) for memory, score in top},
+            "input_ids": input_ids,
+            "ranked_ids": [memory_id for memory_id, _ in top],
+            "scores": {memory_id: round(score, 6) for memory_id, score in top},
             "score_details": {
                 **base_score_details,
+                "fusion": "rrf",
+                "rrf_k": RRF_K,
                 "weights": {
                     "fts": config.fts_weight,
                     "vector": config.vector_weight,
@@ -364,11 +542,10 @@ async def _run_hybrid_rag_recall_local(
             },
         }
 
-    recent = memories[:limit]
     return {
         "strategy": "recency",
-        "input_ids": [memory.id for memory in memories],
-        "ranked_ids": [memory.id for memory in recent],
+        "input_ids": input_ids,
+        "ranked_ids": input_ids[:limit],
         "scores": {},
         "score_details": {**base_score_details, "reason": "no_hybrid_match"},
     }
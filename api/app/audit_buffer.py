@@ -0,0 +1,165 @@
+"""Deferred, batched writer for org audit logs.
+
+Off by default: write_audit adds the AuditLog row to the request session so it
+commits atomically with the change it describes. With AUDIT_LOG_BUFFERED=true
+rows are staged on the session instead and, only once that session commits,
+handed to an in-process queue. A lifespan task drains the queue every
+AUDIT_FLUSH_INTERVAL_MS or AUDIT_FLUSH_MAX_ROWS rows with a single COPY.
+Rows still queued when the process dies are lost, which is why this is opt-in.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session
+
+from .models import AuditLog
+
+logger = logging.getLogger(__name__)
+
+AUDIT_LOG_BUFFERED = os.getenv("AUDIT_LOG_BUFFERED", "false").strip().lower() == "true"
+AUDIT_FLUSH_INTERVAL_MS = max(1, int(os.getenv("AUDIT_FLUSH_INTERVAL_MS", "100")))
+AUDIT_FLUSH_MAX_ROWS = max(1, int(os.getenv("AUDIT_FLUSH_MAX_ROWS", "500")))
+
+_COLUMNS = (
+    "org_id",
+    "actor_user_id",
+    "api_key_prefix",
+    "action",
+    "entity_type",
+    "entity_id",
+    "metadata",
+    "created_at",
+)
+_PENDING_KEY = "audit_buffer_pending"
+# Queued by stop(): the writer flushes the batch it is collecting and exits.
+_STOP = object()
+
+_QUEUE: asyncio.Queue[Any] | None = None
+_WRITER_TASK: asyncio.Task | None = None
+
+
+def enabled() -> bool:
+    return _QUEUE is not None
+
+
+def stage(
+    db: AsyncSession,
+    *,
+    org_id: int,
+    actor_user_id: int | None,
+    api_key_prefix: str | None,
+    action: str,
+    entity_type: str,
+    entity_id: int,
+    metadata: dict[str, Any],
+) -> None:
+    """Attach an audit row to ``db``; it is queued only if the session commits."""
+    record = (
+        org_id,
+        actor_user_id,
+        api_key_prefix,
+        action,
+        entity_type,
+        entity_id,
+        json.dumps(metadata),
+        datetime.now(timezone.utc),
+    )
+    db.sync_session.info.setdefault(_PENDING_KEY, []).append(record)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_pending(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending or _QUEUE is None:
+        return
+    for record in pending:
+        _QUEUE.put_nowait(record)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+async def _write_batch(engine: AsyncEngine, batch: list[tuple[Any, ...]]) -> None:
+    try:
+        async with engine.connect() as conn:
+            raw = await conn.get_raw_connection()
+            await raw.driver_connection.copy_records_to_table(
+                AuditLog.__tablename__, records=batch, columns=_COLUMNS
+            )
+        return
+    except Exception:
+        logger.warning("[audit] COPY of %d rows failed; retrying as INSERT", len(batch), exc_info=True)
+    try:
+        rows = [dict(zip(_COLUMNS, record)) for record in batch]
+        for row in rows:
+            row["metadata_json"] = json.loads(row.pop("metadata"))
+        async with engine.begin() as conn:
+            await conn.execute(insert(AuditLog), rows)
+    except Exception:
+        logger.error("[audit] dropped %d buffered audit rows", len(batch), exc_info=True)
+
+
+async def _drain(queue: asyncio.Queue[Any], engine: AsyncEngine) -> None:
+    loop = asyncio.get_running_loop()
+    while True:
+        record = await queue.get()
+        if record is _STOP:
+            return
+        batch = [record]
+        stopping = False
+        deadline = loop.time() + AUDIT_FLUSH_INTERVAL_MS / 1000
+        while len(batch) < AUDIT_FLUSH_MAX_ROWS:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                record = await asyncio.wait_for(queue.get(), remaining)
+            except asyncio.TimeoutError:
+                break
+            if record is _STOP:
+                stopping = True
+                break
+            batch.append(record)
+        await _write_batch(engine, batch)
+        if stopping:
+            return
+
+
+def start(engine: AsyncEngine) -> None:
+    global _QUEUE, _WRITER_TASK
+    if not AUDIT_LOG_BUFFERED or _WRITER_TASK is not None:
+        return
+    _QUEUE = asyncio.Queue()
+    _WRITER_TASK = asyncio.create_task(_drain(_QUEUE, engine))
+
+
+async def stop(engine: AsyncEngine) -> None:
+    """Stop the writer and flush whatever is still queued.
+
+    The writer is asked to finish rather than cancelled, so a batch it is
+    already writing completes. Rows committed while it winds down are still
+    queued and written here.
+    """
+    global _QUEUE, _WRITER_TASK
+    if _WRITER_TASK is None or _QUEUE is None:
+        return
+    _QUEUE.put_nowait(_STOP)
+    await _WRITER_TASK
+    leftover: list[tuple[Any, ...]] = []
+    while not _QUEUE.empty():
+        leftover.append(_QUEUE.get_nowait())
+    _QUEUE = None
+    _WRITER_TASK = None
+    if leftover:
+        await _write_batch(engine, leftover)
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
 from datetime import timedelta
+from heapq import nsmallest
 import logging
 import os
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
 from sqlalchemy import delete, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer
 from urllib.parse import urlparse
 
 from .auth_utils import (
@@ -53,6 +56,7 @@ from .models import (
     Waitlist,
 )
 from .rate_limit import check_request_link_limits, check_verify_limits
+from .routes import _json_list_response
 from .schemas import (
     AdminContextCompilationDiffOut,
     AdminContextCompilationDetailOut,
@@ -700,8 +704,8 @@ async def verify_link(
         await db.execute(select(AuthUser).where(func.lower(AuthUser.email) == email).limit(1))
     ).scalar_one_or_none()
     if auth_user is None:
-        auth_user_count = (await db.execute(select(func.count(AuthUser.id)))).scalar_one()
-        auth_user = AuthUser(email=email, is_admin=(auth_user_count == 0), invite_accepted_at=now)
+        has_auth_users = (await db.execute(select(select(AuthUser.id).exists()))).scalar_one()
+        auth_user = AuthUser(email=email, is_admin=not has_auth_users, invite_accepted_at=now)
         db.add(auth_user)
         await db.flush()
     if auth_user.is_disabled:
@@ -1433,6 +1437,12 @@ async def usage_stats(request: Request, db: AsyncSession = Depends(get_db)) -> l
         return []
 
 
+# Recall logs and compilations carry JSON blobs per row; dump the whole page
+# with one pydantic-core call instead of FastAPI re-validating each model.
+_RECALL_LOG_LIST_ADAPTER = TypeAdapter(list[AdminRecallLogOut])
+_COMPILATION_LIST_ADAPTER = TypeAdapter(list[AdminContextCompilationOut])
+
+
 @router.get("/admin/recall/logs", response_model=list[AdminRecallLogOut])
 async def admin_recall_logs(
     request: Request,
@@ -1440,7 +1450,7 @@ async def admin_recall_logs(
     offset: int = Query(default=0, ge=0),
     project_id: int | None = Query(default=None, ge=1),
     db: AsyncSession = Depends(get_db),
-) -> list[AdminRecallLogOut]:
+) -> Response:
     _require_admin_auth(request)
     org_id = getattr(request.state, "org_id", None)
     if org_id is None:
@@ -1458,8 +1468,8 @@ async def admin_recall_logs(
             .limit(limit)
         )
     ).scalars().all()
-    return [
-        AdminRecallLogOut(
+    return _json_list_response(_RECALL_LOG_LIST_ADAPTER, [
+        AdminRecallLogOut.model_construct(
             id=row.id,
             org_id=row.org_id,
             project_id=row.project_id,
@@ -1473,7 +1483,7 @@ async def admin_recall_logs(
             created_at=row.created_at,
         )
         for row in rows
-    ]
+    ])
 
 
 @router.get("/admin/recall/compilations", response_model=list[AdminContextCompilationOut])
@@ -1484,7 +1494,7 @@ async def admin_recall_compilations(
     project_id: int | None = Query(default=None, ge=1),
     target_format: str | None = Query(default=None),
     db: AsyncSession = Depends(get_db),
-) -> list[AdminContextCompilationOut]:
+) -> Response:
     _require_admin_auth(request)
     org_id = getattr(request.state, "org_id", None)
     if org_id is None:
@@ -1506,8 +1516,8 @@ async def admin_recall_compilations(
             .limit(limit)
         )
     ).scalars().all()
-    return [
-        AdminContextCompilationOut(
+    return _json_list_response(_COMPILATION_LIST_ADAPTER, [
+        AdminContextCompilationOut.model_construct(
             id=row.id,
             org_id=row.org_id,
             project_id=row.project_id,
@@ -1524,7 +1534,7 @@ async def admin_recall_compilations(
             created_at=row.created_at,
         )
         for row in rows
-    ]
+    ])
 
 
 @router.get("/admin/recall/compilations/history", response_model=list[AdminContextCompilationHistoryEntryOut])
@@ -1939,7 +1949,10 @@ async def admin_recall_memory_signals(
         if last_feedback_at is None or row.created_at > last_feedback_at:
             bucket["last_feedback_at"] = row.created_at
 
-    ranked_memory_ids = sorted(
+    # Only the top ``limit`` ids are needed; a bounded heap avoids sorting
+    # every memory that ever received feedback.
+    ranked_memory_ids = nsmallest(
+        limit,
         grouped,
         key=lambda memory_id: (
             -(
@@ -1951,7 +1964,7 @@ async def admin_recall_memory_signals(
             ),
             -(memory_id),
         ),
-    )[:limit]
+    )
     memories = (
         await db.execute(
             select(Memory).where(Memory.id.in_(ranked_memory_ids))
@@ -2008,11 +2021,22 @@ async def admin_recall_review_queue(
     if org_id is None:
         raise HTTPException(status_code=400, detail="X-Org-Id required")
 
+    normalized_status = (review_status or "").strip().lower()
+    if normalized_status and normalized_status not in {"open", "resolved", "archived"}:
+        raise HTTPException(status_code=422, detail="review_status must be one of: open, resolved, archived")
+    normalized_net = (net_direction or "").strip().lower()
+    if normalized_net and normalized_net not in {"positive", "negative", "neutral"}:
+        raise HTTPException(status_code=422, detail="net_direction must be one of: positive, negative, neutral")
+
+    # Every org memory is scanned to find flagged ones, so stream the rows in
+    # batches and skip the columns the queue never shows.
     stmt = (
         select(Memory)
+        .options(defer(Memory.content), defer(Memory.search_vector), defer(Memory.embedding_vector))
         .join(Project, Project.id == Memory.project_id)
         .where(Project.org_id == org_id)
         .order_by(func.coalesce(Memory.updated_at, Memory.created_at).desc(), Memory.id.desc())
+        .execution_options(yield_per=500)
     )
     if project_id is not None:
         stmt = stmt.where(Memory.project_id == project_id)
@@ -2027,15 +2051,8 @@ async def admin_recall_review_queue(
             )
         )
 
-    memories = (await db.execute(stmt)).scalars().all()
-    normalized_status = (review_status or "").strip().lower()
-    if normalized_status and normalized_status not in {"open", "resolved", "archived"}:
-        raise HTTPException(status_code=422, detail="review_status must be one of: open, resolved, archived")
-    normalized_net = (net_direction or "").strip().lower()
-    if normalized_net and normalized_net not in {"positive", "negative", "neutral"}:
-        raise HTTPException(status_code=422, detail="net_direction must be one of: positive, negative, neutral")
     flagged: list[Memory] = []
-    for memory in memories:
+    async for memory in await db.stream_scalars(stmt):
         review_status, review_notes, metadata = _memory_review_metadata(memory)
         marked_for_review = bool(metadata.get("marked_for_review"))
         archived = bool(metadata.get("archived_from_recall_admin"))
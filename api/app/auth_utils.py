@@ -1,8 +1,11 @@
 from __future__ import annotations
 
 import hashlib
+import ipaddress
 import secrets
+import socket
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 import os
 
 MAGIC_LINK_TTL_MINUTES = int(os.getenv("MAGIC_LINK_TTL_MINUTES", "10"))
@@ -36,17 +39,42 @@ def session_expiry() -> datetime:
     return now_utc() + timedelta(days=SESSION_TTL_DAYS)
 
 
+_V4_MASK = 0xFFFFFF00
+_V6_MASK = ((1 << 128) - 1) ^ ((1 << 64) - 1)
+_V4_MAPPED = 0xFFFF << 32
+
+
+@lru_cache(maxsize=4096)
+def _network_prefix(ip: str) -> str:
+    # /24 for IPv4, /64 for IPv6, masked as integers on the C-parsed address.
+    # Anything inet_pton rejects (e.g. scoped IPv6) goes through ipaddress.
+    try:
+        if ":" not in ip:
+            packed = socket.inet_pton(socket.AF_INET, ip)
+            return f"{socket.inet_ntoa((int.from_bytes(packed, 'big') & _V4_MASK).to_bytes(4, 'big'))}/24"
+        value = int.from_bytes(socket.inet_pton(socket.AF_INET6, ip), "big")
+    except OSError:
+        return _network_prefix_slow(ip)
+    if value >> 32 == _V4_MAPPED >> 32:
+        return f"{socket.inet_ntoa((value & _V4_MASK).to_bytes(4, 'big'))}/24"
+    return f"{socket.inet_ntop(socket.AF_INET6, (value & _V6_MASK).to_bytes(16, 'big'))}/64"
+
+
+def _network_prefix_slow(ip: str) -> str:
+    try:
+        addr = ipaddress.ip_address(ip)
+    except ValueError:
+        return ip
+    if addr.version == 6 and addr.ipv4_mapped is not None:
+        addr = addr.ipv4_mapped
+    return str(ipaddress.ip_network((addr, 24 if addr.version == 4 else 64), strict=False))
+
+
 def ip_prefix(ip: str | None) -> str | None:
     if not ip:
         return None
     ip = ip.strip()
-    if ":" in ip:
-        parts = ip.split(":")
-        return ":".join(parts[:4]) + "::/64"
-    parts = ip.split(".")
-    if len(parts) == 4:
-        return ".".join(parts[:3]) + ".0/24"
-    return ip
+    return _network_prefix(ip) if ip else None
 
 
 def ua_hash(user_agent: str | None) -> str | None:
@@ -6,11 +6,11 @@ import os
 BILLING_PROVIDER = os.getenv("BILLING_PROVIDER", "none").strip().lower()
 
 
-def emit_usage_event(*, event_type: str, user_id: int | None) -> None:
+def emit_usage_event(*, event_type: str, user_id: int | None, quantity: int = 1) -> None:
     """No-op billing hook for future Stripe/Paddle usage metering."""
     if BILLING_PROVIDER in {"", "none"}:
         return
     # Future integration point:
     # - enqueue metering event to billing connector
     # - include org + tier context
-    _ = (event_type, user_id)
+    _ = (event_type, user_id, quantity)
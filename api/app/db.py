@@ -1,13 +1,15 @@
 from __future__ import annotations
 
 import hashlib
+import hmac
 import os
 import secrets
+import uuid
 from typing import AsyncGenerator
 
-from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy import event
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 from pgvector.asyncpg import register_vector
 import time
 import logging
@@ -22,17 +24,49 @@ _POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
 _MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
 _POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
 _POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # 30 min — prevents stale connections
+# Pre-ping costs a SELECT 1 round trip on every checkout. Deployments whose
+# database does not drop idle connections can turn it off and rely on
+# pool_recycle instead.
+_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").strip().lower() == "true"
+# asyncpg's statement cache and SQLAlchemy's prepared-statement cache both
+# default to 100 entries per connection; the recall, search and counter
+# statements alone take a good share of that, so keep more of them prepared.
+_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "256"))
+
+# Set DB_PGBOUNCER=true when DATABASE_URL points at PgBouncer in transaction
+# pooling mode. PgBouncer then owns pooling, so the engine keeps no pool of its
+# own, and asyncpg's prepared-statement caches are disabled because a statement
+# prepared on one server connection does not exist on the next.
+DB_PGBOUNCER = os.getenv("DB_PGBOUNCER", "false").strip().lower() == "true"
+
+
+def pgbouncer_connect_args() -> dict:
+    return {
+        "statement_cache_size": 0,
+        "prepared_statement_cache_size": 0,
+        "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+    }
+
 
 # SQLite doesn't support pool parameters; only apply them for PostgreSQL
 _IS_PG = "postgresql" in DATABASE_URL or "postgres" in DATABASE_URL
 _engine_kwargs: dict = {"echo": False, "future": True}
-if _IS_PG:
+if _IS_PG and DB_PGBOUNCER:
+    _engine_kwargs.update({
+        "poolclass": NullPool,
+        "connect_args": pgbouncer_connect_args(),
+    })
+elif _IS_PG:
     _engine_kwargs.update({
         "pool_size": _POOL_SIZE,
         "max_overflow": _MAX_OVERFLOW,
         "pool_timeout": _POOL_TIMEOUT,
         "pool_recycle": _POOL_RECYCLE,
-        "pool_pre_ping": True,
+        "pool_pre_ping": _POOL_PRE_PING,
+        "connect_args": {
+            "statement_cache_size": _STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": _STATEMENT_CACHE_SIZE,
+        },
     })
 
 engine: AsyncEngine = create_async_engine(DATABASE_URL, **_engine_kwargs)
@@ -58,7 +92,9 @@ def after_cursor_execute(conn, cursor, statement, parameters, context, executema
     if total > 0.2:  # Log queries running over 200ms
         logging.warning("Slow Query Detected: %f seconds for statement: %s", total, statement)
 
-AsyncSessionLocal = sessionmaker(
+# Built once per process and shared by every request. expire_on_commit=False
+# keeps attributes readable after commit() without a reload round trip.
+AsyncSessionLocal = async_sessionmaker(
     bind=engine,
     class_=AsyncSession,
     expire_on_commit=False,
@@ -69,9 +105,31 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
-def hash_api_key(raw_key: str) -> str:
+# Optional server-side pepper for API key digests. When set, keys are stored as
+# HMAC-SHA256(secret, key) so a leaked api_keys table cannot be checked offline.
+# Keys minted before the secret was configured keep matching via their legacy
+# unkeyed SHA-256 digest (see api_key_hash_candidates).
+API_KEY_HASH_SECRET: str = os.getenv("API_KEY_HASH_SECRET", "").strip()
+
+
+def _legacy_hash_api_key(raw_key: str) -> str:
     return hashlib.sha256(raw_key.encode("utf-8")).hexdigest()
 
 
+def hash_api_key(raw_key: str) -> str:
+    if not API_KEY_HASH_SECRET:
+        return _legacy_hash_api_key(raw_key)
+    return hmac.new(
+        API_KEY_HASH_SECRET.encode("utf-8"), raw_key.encode("utf-8"), hashlib.sha256
+    ).hexdigest()
+
+
+def api_key_hash_candidates(raw_key: str) -> list[str]:
+    """Digests a presented key may be stored under, current scheme first."""
+    current = hash_api_key(raw_key)
+    legacy = _legacy_hash_api_key(raw_key)
+    return [current] if current == legacy else [current, legacy]
+
+
 def generate_api_key() -> str:
     return f"cck_{secrets.token_urlsafe(24)}"
@@ -17,7 +17,6 @@ from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from .analyzer.algorithm import compute_embedding, compute_hilbert_index
 from .db import get_db
 from .models import (
     InboxItem,
@@ -26,18 +25,19 @@ from .models import (
 )
 from .routes import (
     RequestContext,
-    _content_hash,
+    _embed_and_hash,
     _increment_daily_counter,
-    _increment_usage_period,
+    _forget_latest_memories,
+    _resolve_project_org_id,
+    _usage_event_values,
     get_actor_context,
     get_project_or_404,
     require_role,
     write_audit,
-    write_usage,
-    DAILY_MEMORY_LIMIT,
     _check_daily_limit,
 )
 from .schemas import InboxItemEditIn, InboxItemOut, InboxListOut, MemoryOut
+from .worker import tasks as worker_tasks
 
 inbox_router = APIRouter(tags=["inbox"])
 
@@ -65,9 +65,7 @@ def _item_to_out(item: InboxItem) -> InboxItemOut:
 async def _get_inbox_item_or_404(
     db: AsyncSession, item_id: int, ctx: RequestContext
 ) -> InboxItem:
-    item = (
-        await db.execute(select(InboxItem).where(InboxItem.id == item_id).limit(1))
-    ).scalar_one_or_none()
+    item = await db.get(InboxItem, item_id)
     if item is None:
         raise HTTPException(status_code=404, detail="Inbox item not found")
     # Verify the caller can access the project this item belongs to.
@@ -94,9 +92,9 @@ async def list_inbox(
     Pass ``?status=all`` to see every item regardless of lifecycle stage.
     """
     require_role(ctx, "viewer")
-    project = await get_project_or_404(db, project_id, ctx)
+    await _resolve_project_org_id(db, project_id, ctx)
 
-    stmt = select(InboxItem).where(InboxItem.project_id == project.id)
+    stmt = select(InboxItem).where(InboxItem.project_id == project_id)
     if status != "all":
         stmt = stmt.where(InboxItem.status == status)
 
@@ -109,7 +107,7 @@ async def list_inbox(
     ).scalars().all()
 
     return InboxListOut(
-        project_id=project.id,
+        project_id=project_id,
         total=len(items),
         items=[_item_to_out(i) for i in items],
     )
@@ -158,12 +156,16 @@ async def approve_inbox_item(
         raise HTTPException(status_code=422, detail="content must not be empty")
 
     auth_user_id: int | None = getattr(request.state, "auth_user_id", None) if request else None
-    await _check_daily_limit(db, auth_user_id, "memories_created", DAILY_MEMORY_LIMIT)
+    await _check_daily_limit(
+        db,
+        auth_user_id,
+        "memories_created",
+        is_unlimited=getattr(request.state, "auth_is_unlimited", None) if request else None,
+    )
 
     # Compute embedding + Hilbert index (same as create_memory route).
     embedding_text = " ".join(p for p in [final_title or "", final_content] if p).strip()
-    embedding = compute_embedding(embedding_text)
-    hilbert = compute_hilbert_index(embedding)
+    [(embedding, hilbert, content_hash)] = await _embed_and_hash([embedding_text], [final_content])
 
     memory = Memory(
         project_id=item.project_id,
@@ -173,7 +175,7 @@ async def approve_inbox_item(
         title=final_title,
         content=final_content,
         metadata_json={"inbox_item_id": item.id, "confidence_score": float(item.confidence_score)},
-        content_hash=_content_hash(final_content),
+        content_hash=content_hash,
         search_vector=embedding,
         embedding_vector=embedding,
         hilbert_index=hilbert,
@@ -187,9 +189,8 @@ async def approve_inbox_item(
     item.reviewed_at = datetime.now(timezone.utc)
 
     # Retrieve project for audit / usage helpers.
-    project = (
-        await db.execute(select(Project).where(Project.id == item.project_id).limit(1))
-    ).scalar_one()
+    # Loaded by _get_inbox_item_or_404, so this is an identity-map hit.
+    project = await db.get(Project, item.project_id)
 
     await write_audit(
         db,
@@ -200,25 +201,25 @@ async def approve_inbox_item(
         entity_id=memory.id,
         metadata={"type": memory.type, "inbox_item_id": item.id},
     )
-    if request:
-        await write_usage(
-            db,
-            request=request,
-            ctx=ctx,
-            event_type="memory_created",
-            org_id=project.org_id,
-            project_id=project.id,
-        )
-    await _increment_daily_counter(db, auth_user_id, "memories_created")
-    await _increment_usage_period(db, auth_user_id, "memories_created")
+    await _increment_daily_counter(
+        db,
+        auth_user_id,
+        "memories_created",
+        with_usage_period=True,
+        usage_events=[
+            _usage_event_values(request, event_type="memory_created", org_id=project.org_id, project_id=project.id)
+        ]
+        if request
+        else None,
+        is_unlimited=getattr(request.state, "auth_is_unlimited", None) if request else None,
+    )
     await db.commit()
-    await db.refresh(memory)
+    _forget_latest_memories(project.id)
 
     # Fire-and-forget embedding worker task (no-op until WORKER_ENABLED=true).
-    from app.worker.tasks import compute_memory_embedding, _enqueue_if_enabled
-    _enqueue_if_enabled(compute_memory_embedding, memory.id)
+    worker_tasks._enqueue_if_enabled(worker_tasks.compute_memory_embedding, memory.id)
 
-    return MemoryOut(
+    return MemoryOut.model_construct(
         id=memory.id,
         project_id=memory.project_id,
         created_by_user_id=memory.created_by_user_id,
@@ -255,9 +256,8 @@ async def reject_inbox_item(
 
     item.status = "rejected"
     item.reviewed_at = datetime.now(timezone.utc)
-    project = (
-        await db.execute(select(Project).where(Project.id == item.project_id).limit(1))
-    ).scalar_one()
+    # Loaded by _get_inbox_item_or_404, so this is an identity-map hit.
+    project = await db.get(Project, item.project_id)
     await write_audit(
         db,
         ctx=ctx,
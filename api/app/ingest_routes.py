@@ -35,6 +35,7 @@ from .routes import (
     write_audit,
 )
 from .schemas import IntegrationsCapabilitiesOut, RawCaptureIn, RawCaptureOut, RawCaptureQueuedOut
+from .worker import tasks as worker_tasks
 
 logger = logging.getLogger(__name__)
 
@@ -72,12 +73,8 @@ def _safe_confidence(value: Any, default: float = 0.8) -> float:
 async def _project_belongs_to_org(db: AsyncSession, *, project_id: int | None, org_id: int) -> bool:
     if project_id is None:
         return False
-    project = (
-        await db.execute(
-            select(Project.id).where(Project.id == project_id, Project.org_id == org_id).limit(1)
-        )
-    ).scalar_one_or_none()
-    return project is not None
+    project = await db.get(Project, project_id)
+    return project is not None and project.org_id == org_id
 
 
 def _set_capture_headers(response: Response, *, capture_id: int, processing_status: str) -> None:
@@ -125,9 +122,8 @@ async def _run_refinery_inline(
     without needing a Celery worker.  When a real LLM is wired up, only
     tasks.refine_content_with_llm needs to change — this path benefits too.
     """
-    from .worker.tasks import refine_content_with_llm
 
-    drafts = _coerce_refinery_drafts(refine_content_with_llm(capture.payload))
+    drafts = _coerce_refinery_drafts(worker_tasks.refine_content_with_llm(capture.payload))
 
     existing_items = (
         await db.execute(select(InboxItem).where(InboxItem.raw_capture_id == capture.id))
@@ -326,9 +322,8 @@ async def ingest_raw(
     if _WORKER_ENABLED:
         # Async path: commit first, then hand off to Celery.
         await db.commit()
-        from .worker.tasks import _enqueue_if_enabled, process_raw_capture_task
         try:
-            _enqueue_if_enabled(process_raw_capture_task, capture_id)
+            worker_tasks._enqueue_if_enabled(worker_tasks.process_raw_capture_task, capture_id)
         except Exception as exc:
             await _mark_worker_dispatch_failure(
                 db,
@@ -441,9 +436,8 @@ async def replay_raw_capture(
             metadata={"mode": "worker"},
         )
         await db.commit()
-        from .worker.tasks import _enqueue_if_enabled, process_raw_capture_task
         try:
-            _enqueue_if_enabled(process_raw_capture_task, capture.id)
+            worker_tasks._enqueue_if_enabled(worker_tasks.process_raw_capture_task, capture.id)
         except Exception as exc:
             await _mark_worker_dispatch_failure(
                 db,
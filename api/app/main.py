@@ -6,6 +6,7 @@ import os
 import socket
 from contextlib import asynccontextmanager
 from datetime import datetime, timezone
+from typing import Any
 from urllib.parse import urlparse
 
 from fastapi import FastAPI, HTTPException, Request, Depends
@@ -13,16 +14,17 @@ from fastapi.exceptions import RequestValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-from sqlalchemy import func, select
+from pydantic_core import to_json
+from sqlalchemy import exists, func, select
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
 from .analyzer.cag import evaporation_interval_seconds, evaporate_pheromones, warm_cag_cache
 from .auth_utils import SESSION_COOKIE_NAME, hash_token, now_utc
-from .db import AsyncSessionLocal, hash_api_key, get_db
-from . import external_auth
+from .db import AsyncSessionLocal, api_key_hash_candidates, engine, hash_api_key, get_db
+from . import audit_buffer, external_auth
 from .models import ApiKey, AuthSession, AuthUser, Membership, Organization, User
 from .auth_routes import router as auth_router
-from .routes import router
+from .routes import RequestContext, router
 from .ingest_routes import ingest_router
 from .inbox_routes import inbox_router
 
@@ -110,7 +112,9 @@ async def ensure_dev_bootstrap_api_key() -> tuple[bool, int]:
         key_hash = hash_api_key(BOOTSTRAP_API_KEY)
         prefix = BOOTSTRAP_API_KEY[:8]
         existing_key = (
-            await session.execute(select(ApiKey).where(ApiKey.key_hash == key_hash).limit(1))
+            await session.execute(
+                select(ApiKey).where(ApiKey.key_hash.in_(api_key_hash_candidates(BOOTSTRAP_API_KEY))).limit(1)
+            )
         ).scalar_one_or_none()
         if existing_key is None:
             session.add(
@@ -125,6 +129,7 @@ async def ensure_dev_bootstrap_api_key() -> tuple[bool, int]:
         else:
             existing_key.org_id = org.id
             existing_key.name = BOOTSTRAP_KEY_NAME
+            existing_key.key_hash = key_hash
             existing_key.prefix = prefix
             existing_key.revoked_at = None
 
@@ -147,7 +152,7 @@ class _AuthContext:
     __slots__ = (
         "api_key_id", "org_id", "role", "actor_user_id", "actor_email",
         "api_key_prefix", "bootstrap_mode", "auth_user_id", "auth_is_admin",
-        "auth_session_id",
+        "auth_is_unlimited", "auth_session_id",
     )
 
     def __init__(self, **kw):
@@ -159,7 +164,8 @@ class _AuthContext:
         return cls(
             api_key_id=None, org_id=None, role=None, actor_user_id=None,
             actor_email=None, api_key_prefix=None, bootstrap_mode=False,
-            auth_user_id=None, auth_is_admin=False, auth_session_id=None,
+            auth_user_id=None, auth_is_admin=False, auth_is_unlimited=False,
+            auth_session_id=None,
         )
 
 
@@ -173,7 +179,17 @@ def _apply_auth_context(request: Request, ctx: _AuthContext) -> None:
     request.state.bootstrap_mode = ctx.bootstrap_mode
     request.state.auth_user_id = ctx.auth_user_id
     request.state.auth_is_admin = ctx.auth_is_admin
+    request.state.auth_is_unlimited = ctx.auth_is_unlimited
     request.state.auth_session_id = ctx.auth_session_id
+    request.state.ctx = RequestContext(
+        api_key_id=ctx.api_key_id,
+        org_id=ctx.org_id,
+        role=ctx.role,
+        actor_user_id=ctx.actor_user_id,
+        actor_email=ctx.actor_email,
+        api_key_prefix=ctx.api_key_prefix,
+        bootstrap_mode=ctx.bootstrap_mode,
+    )
 
 
 async def _find_or_create_domain_user_for_auth(
@@ -292,6 +308,7 @@ async def _resolve_session_auth(
         bootstrap_mode=False,
         auth_user_id=auth_user.id,
         auth_is_admin=bool(auth_user.is_admin),
+        auth_is_unlimited=bool(auth_user.is_unlimited),
         auth_session_id=auth_session.id,
     )
 
@@ -353,6 +370,7 @@ async def _resolve_external_bearer_auth(
             auth_user.is_admin
             or (external_auth.trust_admin_claims_enabled() and identity.is_admin)
         ),
+        auth_is_unlimited=bool(auth_user.is_unlimited),
         auth_session_id=None,
     )
 
@@ -369,7 +387,9 @@ async def _resolve_api_key_auth(
     hashed = hash_api_key(provided_key)
     api_key_row = (
         await session.execute(
-            select(ApiKey).where(ApiKey.key_hash == hashed, ApiKey.revoked_at.is_(None)).limit(1)
+            select(ApiKey)
+            .where(ApiKey.key_hash.in_(api_key_hash_candidates(provided_key)), ApiKey.revoked_at.is_(None))
+            .limit(1)
         )
     ).scalar_one_or_none()
     if api_key_row is None:
@@ -387,6 +407,8 @@ async def _resolve_api_key_auth(
             .values(
                 last_used_at=datetime.now(timezone.utc),
                 use_count=ApiKey.use_count + 1,
+                # Upgrade legacy unkeyed digests to the current scheme on first use.
+                key_hash=hashed,
             )
         )
         await session.commit()
@@ -416,6 +438,7 @@ async def _resolve_api_key_auth(
         bootstrap_mode=False,
         auth_user_id=None,
         auth_is_admin=False,
+        auth_is_unlimited=False,
         auth_session_id=None,
     )
 
@@ -458,6 +481,7 @@ async def _resolve_bootstrap_auth(
         bootstrap_mode=True,
         auth_user_id=None,
         auth_is_admin=False,
+        auth_is_unlimited=False,
         auth_session_id=None,
     )
 
@@ -512,6 +536,8 @@ async def lifespan(app: FastAPI):
 
         _CAG_EVAPORATION_TASK = asyncio.create_task(_evaporation_loop())
 
+    audit_buffer.start(engine)
+
     if BOOTSTRAP_MODE_ENABLED:
         logger.info(
             "[bootstrap] BOOTSTRAP_MODE=true BOOTSTRAP_API_KEY_present=%s",
@@ -527,6 +553,7 @@ async def lifespan(app: FastAPI):
     yield
 
     # ── Shutdown ───────────────────────────────────────────────────────────────
+    await audit_buffer.stop(engine)
     if _CAG_EVAPORATION_TASK is not None:
         _CAG_EVAPORATION_TASK.cancel()
         try:
@@ -538,7 +565,20 @@ async def lifespan(app: FastAPI):
 
 # ── App ────────────────────────────────────────────────────────────────────────
 
-app = FastAPI(title="ContextCache API", version="0.1.0", lifespan=lifespan)
+
+class _CoreJSONResponse(JSONResponse):
+    """JSONResponse rendered by pydantic-core's Rust encoder instead of json.dumps."""
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
+
+
+app = FastAPI(
+    title="ContextCache API",
+    version="0.1.0",
+    lifespan=lifespan,
+    default_response_class=_CoreJSONResponse,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -592,6 +632,9 @@ async def api_key_middleware(request: Request, call_next):
                 return ctx
             if ctx is not None:
                 _apply_auth_context(request, ctx)
+                # Hand the connection back to the pool before the route runs; the
+                # route gets its own session via get_db().
+                await session.close()
                 return await call_next(request)
 
         # ── 2. External bearer-token auth (future auth service) ───────────
@@ -602,29 +645,23 @@ async def api_key_middleware(request: Request, call_next):
             if isinstance(result, JSONResponse):
                 return result
             _apply_auth_context(request, result)
+            await session.close()
             return await call_next(request)
 
-        # ── 3. Count active keys (needed for bootstrap gate) ────────────────
-        active_key_count = (
-            await session.execute(select(func.count(ApiKey.id)).where(ApiKey.revoked_at.is_(None)))
+        # ── 3. Any active key? (needed for bootstrap gate) ──────────────────
+        # EXISTS stops at the first live row instead of counting them all.
+        has_active_key = (
+            await session.execute(select(exists().where(ApiKey.revoked_at.is_(None))))
         ).scalar_one()
-        org_count = (await session.execute(select(func.count(Organization.id)))).scalar_one()
-        default_org_id = None
-        if org_count == 1:
-            default_org_id = (
-                await session.execute(select(Organization.id).order_by(Organization.id.asc()).limit(1))
-            ).scalar_one_or_none()
-
-        if active_key_count == 0 and not BOOTSTRAP_MODE_ENABLED:
+
+        if not has_active_key and not BOOTSTRAP_MODE_ENABLED:
             # Only return 503 if the system has never been set up (no users exist).
             # If users exist but all keys were revoked, return 401 — the system IS
             # configured, the caller just isn't authenticated.  Returning 503 here
             # when the frontend calls /auth/me causes a hydration crash: the server
             # renders the landing page but the client renders ServiceUnavailable.
-            user_count = (
-                await session.execute(select(func.count(AuthUser.id)))
-            ).scalar_one()
-            if user_count == 0:
+            has_users = (await session.execute(select(select(AuthUser.id).exists()))).scalar_one()
+            if not has_users:
                 return JSONResponse(
                     status_code=503,
                     content={"detail": "Service unavailable: system not configured"},
@@ -636,7 +673,13 @@ async def api_key_middleware(request: Request, call_next):
             )
 
         # ── 4. Bootstrap mode (BOOTSTRAP_MODE=true + no keys) ───────────────
-        if active_key_count == 0 and BOOTSTRAP_MODE_ENABLED:
+        if not has_active_key and BOOTSTRAP_MODE_ENABLED:
+            # Default to the only org when exactly one exists; LIMIT 2 is
+            # enough to tell "one" from "many" without a full count.
+            org_ids = (
+                await session.execute(select(Organization.id).order_by(Organization.id.asc()).limit(2))
+            ).scalars().all()
+            default_org_id = org_ids[0] if len(org_ids) == 1 else None
             if not provided_key:
                 logger.warning(
                     "[auth] No api_keys exist; granting bootstrap access. "
@@ -644,6 +687,7 @@ async def api_key_middleware(request: Request, call_next):
                 )
             ctx = await _resolve_bootstrap_auth(header_org_id, default_org_id, session)
             _apply_auth_context(request, ctx)
+            await session.close()
             return await call_next(request)
 
         # ── 5. API key auth ─────────────────────────────────────────────────
@@ -24,7 +24,9 @@ from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
 class Base(DeclarativeBase):
-    pass
+    # Populate server-side defaults (created_at, ...) from INSERT ... RETURNING
+    # at flush time, so create routes don't need a refresh() after commit.
+    __mapper_args__ = {"eager_defaults": True}
 
 
 # ---------------------------------------------------------------------------
@@ -55,6 +57,7 @@ class User(Base):
 
 class Membership(Base):
     __tablename__ = "memberships"
+    __table_args__ = (UniqueConstraint("org_id", "user_id", name="uq_memberships_org_user"),)
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     org_id: Mapped[int] = mapped_column(ForeignKey("organizations.id", ondelete="CASCADE"), index=True)
@@ -62,6 +65,10 @@ class Membership(Base):
     role: Mapped[str] = mapped_column(String(20), nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
+    # lazy="raise": always load explicitly (joinedload) so async code never
+    # triggers an implicit lazy load.
+    user: Mapped[User] = relationship(lazy="raise")
+
 
 # ---------------------------------------------------------------------------
 # Projects
@@ -101,6 +108,7 @@ class Memory(Base):
     __tablename__ = "memories"
     __table_args__ = (
         Index("ix_memories_project_hilbert_index", "project_id", "hilbert_index"),
+        Index("ix_memories_project_created_id", "project_id", text("created_at DESC"), text("id DESC")),
     )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
@@ -329,6 +337,12 @@ class RecallTiming(Base):
     __table_args__ = (
         Index("ix_recall_timings_org_created", "org_id", "created_at"),
         Index("ix_recall_timings_served_by_created", "served_by", "created_at"),
+        Index(
+            "ix_recall_timings_cag_created",
+            "created_at",
+            postgresql_include=["org_id", "cag_duration_ms"],
+            postgresql_where=text("cag_duration_ms IS NOT NULL"),
+        ),
     )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
@@ -492,6 +506,14 @@ class AuthMagicLink(Base):
 
 class AuthSession(Base):
     __tablename__ = "auth_sessions"
+    __table_args__ = (
+        Index(
+            "ix_auth_sessions_user_active",
+            "user_id",
+            "expires_at",
+            postgresql_where=text("revoked_at IS NULL"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("auth_users.id", ondelete="CASCADE"), index=True)
@@ -630,15 +652,19 @@ class Waitlist(Base):
 class UsageEvent(Base):
     """Raw usage event log — one row per action."""
     __tablename__ = "usage_events"
+    __table_args__ = (
+        Index("ix_usage_events_type_created", "event_type", text("created_at DESC")),
+        Index("ix_usage_events_org_created", "org_id", text("created_at DESC")),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     user_id: Mapped[int | None] = mapped_column(ForeignKey("auth_users.id"), nullable=True, index=True)
-    event_type: Mapped[str] = mapped_column(String(64), nullable=False, index=True)
+    event_type: Mapped[str] = mapped_column(String(64), nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), index=True)
     ip_prefix: Mapped[str | None] = mapped_column(String(64), nullable=True, index=True)
     user_agent_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
     project_id: Mapped[int | None] = mapped_column(Integer, nullable=True, index=True)
-    org_id: Mapped[int | None] = mapped_column(Integer, nullable=True, index=True)
+    org_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
 
 
 class UsageCounter(Base):
@@ -720,7 +746,13 @@ class InboxItem(Base):
     """
     __tablename__ = "inbox_items"
     __table_args__ = (
-        Index("ix_inbox_items_project_status", "project_id", "status"),
+        Index(
+            "ix_inbox_items_project_status_created_id",
+            "project_id",
+            "status",
+            text("created_at DESC"),
+            text("id DESC"),
+        ),
     )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
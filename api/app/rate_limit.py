@@ -3,11 +3,14 @@ from __future__ import annotations
 from collections import defaultdict, deque
 from datetime import datetime, timedelta, timezone
 import os
+import threading
 
 try:
     import redis
+    from redis import asyncio as redis_asyncio
 except Exception:  # pragma: no cover - handled by runtime checks
     redis = None
+    redis_asyncio = None
 
 APP_ENV = os.getenv("APP_ENV", "dev").strip().lower()
 REDIS_URL = os.getenv("REDIS_URL", os.getenv("CELERY_BROKER_URL", "redis://redis:6379/0")).strip()
@@ -17,6 +20,7 @@ AUTH_VERIFY_RATE_LIMIT_PER_IP_PER_HOUR = int(os.getenv("AUTH_VERIFY_RATE_LIMIT_P
 RECALL_RATE_LIMIT_PER_IP_PER_HOUR = int(os.getenv("RECALL_RATE_LIMIT_PER_IP_PER_HOUR", "240"))
 RECALL_RATE_LIMIT_PER_ACCOUNT_PER_HOUR = int(os.getenv("RECALL_RATE_LIMIT_PER_ACCOUNT_PER_HOUR", "240"))
 HEDGE_P95_CACHE_TTL_SECONDS = int(os.getenv("HEDGE_P95_CACHE_TTL_SECONDS", "900"))
+REDIS_MAX_CONNECTIONS = max(1, int(os.getenv("REDIS_MAX_CONNECTIONS", "64")))
 
 # Write-endpoint burst limits — prevents flooding DB with projects/memories/orgs
 # via a valid API key. Configurable via env vars; 0 = disabled.
@@ -26,7 +30,10 @@ INGEST_RATE_LIMIT_PER_IP_PER_MINUTE = int(os.getenv("INGEST_RATE_LIMIT_PER_IP_PE
 INGEST_RATE_LIMIT_PER_ACCOUNT_PER_MINUTE = int(os.getenv("INGEST_RATE_LIMIT_PER_ACCOUNT_PER_MINUTE", "30"))
 
 _REQUESTS: dict[str, deque[datetime]] = defaultdict(deque)
+# Request handlers may run the checks in worker threads (asyncio.to_thread).
+_REQUESTS_LOCK = threading.Lock()
 _REDIS_CLIENT = None
+_ASYNC_REDIS_CLIENT = None
 
 
 def _get_redis_client():
@@ -63,6 +70,26 @@ def _allow_redis(key: str, limit: int, ttl_seconds: int) -> bool:
         return _allow(key, limit, ttl_seconds)
 
 
+def _get_async_redis_client():
+    """Shared asyncio client for lookups awaited on the request path.
+
+    Only the hedge p95 read uses it; the rate-limit checks stay on the sync
+    client (run via asyncio.to_thread by the routes).
+    """
+    global _ASYNC_REDIS_CLIENT
+    if _ASYNC_REDIS_CLIENT is None and redis_asyncio is not None and REDIS_URL:
+        try:
+            _ASYNC_REDIS_CLIENT = redis_asyncio.Redis.from_url(
+                REDIS_URL,
+                decode_responses=True,
+                protocol=3,
+                max_connections=REDIS_MAX_CONNECTIONS,
+            )
+        except Exception:
+            _ASYNC_REDIS_CLIENT = None
+    return _ASYNC_REDIS_CLIENT
+
+
 def get_counter(key: str) -> int:
     client = _get_redis_client()
     if client is None:
@@ -87,12 +114,12 @@ def incr_counter(key: str, ttl_seconds: int) -> int:
         return 0
 
 
-def get_cached_hedge_p95_ms(org_id: int) -> int | None:
-    client = _get_redis_client()
+async def get_cached_hedge_p95_ms(org_id: int) -> int | None:
+    client = _get_async_redis_client()
     if client is None:
         return None
     try:
-        value = client.get(f"hedge:p95:org:{org_id}")
+        value = await client.get(f"hedge:p95:org:{org_id}")
         if value is None:
             return None
         parsed = int(value)
@@ -122,13 +149,14 @@ def _allow(key: str, limit: int, ttl_seconds: int) -> bool:
         return True
     now = datetime.now(timezone.utc)
     window = now - timedelta(seconds=ttl_seconds)
-    q = _REQUESTS[key]
-    while q and q[0] < window:
-        q.popleft()
-    if len(q) >= limit:
-        return False
-    q.append(now)
-    return True
+    with _REQUESTS_LOCK:
+        q = _REQUESTS[key]
+        while q and q[0] < window:
+            q.popleft()
+        if len(q) >= limit:
+            return False
+        q.append(now)
+        return True
 
 
 def check_request_link_limits(ip: str, email: str) -> tuple[bool, str | None]:
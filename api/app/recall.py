@@ -41,6 +41,13 @@ from typing import List, Tuple
 
 from .analyzer.algorithm import _build_pack
 
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _compress(text: str) -> str:
+    # Collapse runs of whitespace/newlines into a single space.
+    return _WHITESPACE_RE.sub(" ", (text or "").strip())
+
 
 def _build_toon_pack(query: str, items: List[Tuple[str, str]]) -> str:
     """Build a TOON-formatted memory pack.
@@ -51,10 +58,6 @@ def _build_toon_pack(query: str, items: List[Tuple[str, str]]) -> str:
     if not items:
         return f"Memories[0] {{ type, content }}:\n(no memories)"
 
-    def _compress(text: str) -> str:
-        # Collapse runs of whitespace/newlines into a single space.
-        return re.sub(r"\s+", " ", (text or "").strip())
-
     lines = [f"Memories[{len(items)}] {{ type, content }}:"]
     for mem_type, content in items:
         t = (mem_type or "note").strip()
@@ -65,9 +68,6 @@ def _build_toon_pack(query: str, items: List[Tuple[str, str]]) -> str:
 
 
 def _build_toon_x_pack(query: str, items: List[Tuple[str, str]]) -> str:
-    def _compress(text: str) -> str:
-        return re.sub(r"\s+", " ", (text or "").strip())
-
     header_query = _compress(query)
     lines = [f'CTX/1 q="{header_query}" n={len(items)}']
     for index, (mem_type, content) in enumerate(items, start=1):
@@ -4,7 +4,7 @@ import argparse
 import asyncio
 from datetime import datetime, timezone
 
-from sqlalchemy import select
+from sqlalchemy import select, update
 
 from .db import AsyncSessionLocal, generate_api_key, hash_api_key
 from .migrate import run_migrations
@@ -21,6 +21,9 @@ def parse_args() -> argparse.Namespace:
 async def rotate_key(org_id: int, name: str) -> None:
     await run_migrations()
 
+    plaintext = generate_api_key()
+    key_hash = hash_api_key(plaintext)
+
     async with AsyncSessionLocal() as session:
         org = (
             await session.execute(select(Organization).where(Organization.id == org_id).limit(1))
@@ -28,23 +31,23 @@ async def rotate_key(org_id: int, name: str) -> None:
         if org is None:
             raise RuntimeError(f"Organization {org_id} not found")
 
-        active_named_keys = (
+        revoked_ids = (
             await session.execute(
-                select(ApiKey).where(
+                update(ApiKey)
+                .where(
                     ApiKey.org_id == org_id,
                     ApiKey.name == name,
                     ApiKey.revoked_at.is_(None),
                 )
+                .values(revoked_at=datetime.now(timezone.utc))
+                .returning(ApiKey.id)
             )
         ).scalars().all()
-        for key in active_named_keys:
-            key.revoked_at = datetime.now(timezone.utc)
 
-        plaintext = generate_api_key()
         new_key = ApiKey(
             org_id=org_id,
             name=name,
-            key_hash=hash_api_key(plaintext),
+            key_hash=key_hash,
             prefix=plaintext[:8],
         )
         session.add(new_key)
@@ -52,7 +55,7 @@ async def rotate_key(org_id: int, name: str) -> None:
         await session.refresh(new_key)
 
         print(f"Rotated key for org_id={org_id}, org_name={org.name}, key_name={name}")
-        print(f"Revoked active named keys: {len(active_named_keys)}")
+        print(f"Revoked active named keys: {len(revoked_ids)}")
         print(f"New API key (store now, shown once): {plaintext}")
         print(f"New API key prefix: {new_key.prefix}")
 
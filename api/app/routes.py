@@ -1,32 +1,53 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import hashlib
 import hmac
 import json
 import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import date as _today_date
 from datetime import datetime, timedelta, timezone
-from typing import Any, List
+from typing import Any, Awaitable, Callable, List, Sequence
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
-from sqlalchemy import desc, func, select
-from sqlalchemy.dialects.postgresql import insert as pg_insert
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import (
+    Integer,
+    Row,
+    String,
+    bindparam,
+    delete,
+    desc,
+    exists,
+    func,
+    lambda_stmt,
+    literal,
+    literal_column,
+    select,
+    tuple_,
+    union_all,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, aggregate_order_by, insert as pg_insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import aliased
+from sqlalchemy.orm import aliased, defer, joinedload
+from sqlalchemy.orm.attributes import set_committed_value
 
 from .analyzer.algorithm import (
     HybridRecallConfig,
     RecallEngineUnavailableError,
     compute_embedding,
     compute_hilbert_index,
-    fetch_memories_by_ids,
     run_hybrid_rag_recall,
 )
-from .analyzer.cag import is_local_cag, maybe_answer_from_cache
-from .auth_utils import now_utc
+from .analyzer.cag import CAG_ENABLED, is_local_cag, maybe_answer_from_cache
+from . import audit_buffer
+from .auth_utils import ip_prefix, now_utc
 from .db import AsyncSessionLocal, generate_api_key, get_db, hash_api_key
 from .billing import emit_usage_event
 from .models import (
@@ -70,6 +91,7 @@ from .schemas import (
     ApiKeyOut,
     AuditLogOut,
     MemoryCaptureIn,
+    MemoryBatchCreate,
     MemoryCreate,
     MemoryOut,
     MeOut,
@@ -99,6 +121,7 @@ from .schemas import (
     IntegrationsCapabilitiesOut,
 )
 from .compiler import build_mir_from_recall, refresh_mir_bundle, render_toon_x
+from .worker import tasks as worker_tasks
 
 # ── Daily usage limits (env-configurable, 0 = no limit) ─────────────────────
 def _env_int(primary: str, fallback: str, default: str) -> int:
@@ -117,11 +140,26 @@ RECALL_WEIGHT_VECTOR = float(os.getenv("VECTOR_WEIGHT", os.getenv("RECALL_WEIGHT
 RECALL_WEIGHT_RECENCY = float(os.getenv("RECENCY_WEIGHT", os.getenv("RECALL_WEIGHT_RECENCY", "0.10")))
 RECALL_VECTOR_MIN_SCORE = float(os.getenv("RECALL_VECTOR_MIN_SCORE", "0.20"))
 RECALL_VECTOR_CANDIDATES = int(os.getenv("RECALL_VECTOR_CANDIDATES", "200"))
+RECALL_CACHE_TTL_SECONDS = float(os.getenv("RECALL_CACHE_TTL_SECONDS", "60"))
+RECALL_CACHE_MAX_ITEMS = int(os.getenv("RECALL_CACHE_MAX_ITEMS", "1024"))
+RECALL_LATEST_CACHE_TTL_SECONDS = float(os.getenv("RECALL_LATEST_CACHE_TTL_SECONDS", "5"))
+RECALL_PACK_CACHE_MAX_ITEMS = int(os.getenv("RECALL_PACK_CACHE_MAX_ITEMS", "2048"))
+PROJECT_SCOPE_CACHE_TTL_SECONDS = float(os.getenv("PROJECT_SCOPE_CACHE_TTL_SECONDS", "60"))
+PROJECT_SCOPE_CACHE_MAX_ITEMS = int(os.getenv("PROJECT_SCOPE_CACHE_MAX_ITEMS", "10000"))
+EMBEDDING_THREAD_LIMIT = max(1, int(os.getenv("EMBEDDING_THREAD_LIMIT", "4")))
+CAG_LOOKUP_THREADS = max(1, int(os.getenv("CAG_LOOKUP_THREADS", str(os.cpu_count() or 4))))
 HEDGE_DELAY_MS = int(os.getenv("HEDGE_DELAY_MS", "120"))
 HEDGE_MIN_DELAY_MS = int(os.getenv("HEDGE_MIN_DELAY_MS", "25"))
 HEDGE_USE_P95_CACHE = (
     os.getenv("HEDGE_USE_P95_CACHE", os.getenv("HEDGE_USE_P95", "true")).strip().lower() == "true"
 )
+HEDGE_P95_LOCAL_TTL_SECONDS = float(os.getenv("HEDGE_P95_LOCAL_TTL_SECONDS", "60"))
+USAGE_TOTALS_CACHE_TTL_SECONDS = float(os.getenv("USAGE_TOTALS_CACHE_TTL_SECONDS", "30"))
+USAGE_TOTALS_CACHE_MAX_ITEMS = int(os.getenv("USAGE_TOTALS_CACHE_MAX_ITEMS", "10000"))
+# Opt-outs for high-write deployments: org audit rows and usage events from
+# the API routes. Login/auth security events are always recorded.
+AUDIT_LOG_ENABLED = os.getenv("AUDIT_LOG_ENABLED", "true").strip().lower() == "true"
+USAGE_EVENTS_ENABLED = os.getenv("USAGE_EVENTS_ENABLED", "true").strip().lower() == "true"
 API_VERSION = os.getenv("API_VERSION", "2026-03-20").strip() or "2026-03-20"
 BRAIN_BATCH_MAX_TARGETS = int(os.getenv("BRAIN_BATCH_MAX_TARGETS", "1000"))
 BRAIN_BATCH_DB_CHUNK_SIZE = int(os.getenv("BRAIN_BATCH_DB_CHUNK_SIZE", "200"))
@@ -130,6 +168,11 @@ BRAIN_BATCH_UNDO_WINDOW_SECONDS = int(os.getenv("BRAIN_BATCH_UNDO_WINDOW_SECONDS
 router = APIRouter()
 
 ROLE_RANK: dict[str, int] = {"viewer": 1, "member": 2, "admin": 3, "owner": 4}
+# Roles that satisfy each minimum, so require_role is a single set lookup.
+ROLES_AT_LEAST: dict[str, frozenset[str]] = {
+    minimum: frozenset(role for role, rank in ROLE_RANK.items() if rank >= min_rank)
+    for minimum, min_rank in ROLE_RANK.items()
+}
 DEFAULT_PLAN_CODE = "free"
 SUPER_PLAN_CODE = "super"
 REVERSIBLE_BATCH_ACTIONS: dict[str, str] = {
@@ -140,7 +183,7 @@ REVERSIBLE_BATCH_ACTIONS: dict[str, str] = {
 }
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RequestContext:
     api_key_id: int | None
     org_id: int | None
@@ -151,28 +194,22 @@ class RequestContext:
     bootstrap_mode: bool
 
 
-def get_request_context(request: Request) -> RequestContext:
-    if not hasattr(request.state, "bootstrap_mode"):
+async def get_request_context(request: Request) -> RequestContext:
+    # Built once by the auth middleware alongside the rest of request.state.
+    ctx = getattr(request.state, "ctx", None)
+    if ctx is None:
         raise HTTPException(status_code=401, detail="Unauthorized")
-    return RequestContext(
-        api_key_id=getattr(request.state, "api_key_id", None),
-        org_id=request.state.org_id,
-        role=request.state.role,
-        actor_user_id=request.state.actor_user_id,
-        actor_email=request.state.actor_email,
-        api_key_prefix=request.state.api_key_prefix,
-        bootstrap_mode=request.state.bootstrap_mode,
-    )
+    return ctx
 
 
-def get_actor_context(request: Request) -> RequestContext:
-    return get_request_context(request)
+async def get_actor_context(request: Request) -> RequestContext:
+    return await get_request_context(request)
 
 
 def require_role(ctx: RequestContext, minimum: RoleType) -> None:
-    if ctx.role is None:
-        raise HTTPException(status_code=403, detail="No membership for this org")
-    if ROLE_RANK[ctx.role] < ROLE_RANK[minimum]:
+    if ctx.role not in ROLES_AT_LEAST[minimum]:
+        if ctx.role is None:
+            raise HTTPException(status_code=403, detail="No membership for this org")
         raise HTTPException(status_code=403, detail="Forbidden")
 
 
@@ -203,13 +240,13 @@ def _api_key_access_request_out(
     requester: User,
     reviewer: User | None,
 ) -> ApiKeyAccessRequestOut:
-    return ApiKeyAccessRequestOut(
+    return ApiKeyAccessRequestOut.model_construct(
         id=req.id,
         org_id=req.org_id,
         requester_user_id=req.requester_user_id,
         requester_email=requester.email,
         requester_display_name=requester.display_name,
-        status=req.status,  # type: ignore[arg-type]
+        status=req.status,
         reason=req.reason,
         review_note=req.review_note,
         created_at=req.created_at,
@@ -334,6 +371,20 @@ async def write_audit(
     entity_id: int,
     metadata: dict[str, Any] | None = None,
 ) -> None:
+    if not AUDIT_LOG_ENABLED:
+        return
+    if audit_buffer.enabled():
+        audit_buffer.stage(
+            db,
+            org_id=org_id,
+            actor_user_id=ctx.actor_user_id,
+            api_key_prefix=ctx.api_key_prefix,
+            action=action,
+            entity_type=entity_type,
+            entity_id=entity_id,
+            metadata=metadata or {},
+        )
+        return
     db.add(
         AuditLog(
             org_id=org_id,
@@ -352,15 +403,7 @@ def _ip_prefix_from_request(request: Request) -> str | None:
     raw_ip = request.headers.get("cf-connecting-ip", "").strip()
     if not raw_ip:
         raw_ip = request.client.host if request.client else ""
-    if not raw_ip:
-        return None
-    if ":" in raw_ip:
-        parts = raw_ip.split(":")
-        return ":".join(parts[:4]) + "::/64"
-    parts = raw_ip.split(".")
-    if len(parts) == 4:
-        return ".".join(parts[:3]) + ".0/24"
-    return raw_ip
+    return ip_prefix(raw_ip)
 
 
 async def write_usage(
@@ -372,69 +415,86 @@ async def write_usage(
     org_id: int | None = None,
     project_id: int | None = None,
 ) -> None:
-    db.add(
-        UsageEvent(
-            user_id=getattr(request.state, "auth_user_id", None),
-            event_type=event_type,
-            ip_prefix=_ip_prefix_from_request(request),
-            project_id=project_id,
-            org_id=org_id,
-        )
-    )
+    if not USAGE_EVENTS_ENABLED:
+        return
+    db.add(UsageEvent(**_usage_event_values(request, event_type=event_type, org_id=org_id, project_id=project_id)))
 
 
-async def _get_usage_counter(db: AsyncSession, auth_user_id: int) -> UsageCounter | None:
-    """Return today's UsageCounter for auth_user_id, or None if no row yet."""
-    return (
-        await db.execute(
-            select(UsageCounter)
-            .where(UsageCounter.user_id == auth_user_id, UsageCounter.day == _today_date.today())
-            .limit(1)
-        )
-    ).scalar_one_or_none()
+def _usage_event_values(
+    request: Request,
+    *,
+    event_type: str,
+    org_id: int | None,
+    project_id: int | None,
+) -> dict[str, Any]:
+    return {
+        "user_id": getattr(request.state, "auth_user_id", None),
+        "event_type": event_type,
+        "ip_prefix": _ip_prefix_from_request(request),
+        "project_id": project_id,
+        "org_id": org_id,
+    }
 
 
+# (next local midnight as epoch seconds, today's date); refreshed on rollover.
+_TODAY_CACHE: tuple[float, _today_date] | None = None
+
+
+def _today() -> _today_date:
+    """date.today(), recomputed only once the cached day has ended."""
+    global _TODAY_CACHE
+    now = time.time()
+    if _TODAY_CACHE is not None and now < _TODAY_CACHE[0]:
+        return _TODAY_CACHE[1]
+    today = _today_date.fromtimestamp(now)
+    next_midnight = datetime.combine(today + timedelta(days=1), datetime.min.time()).timestamp()
+    _TODAY_CACHE = (next_midnight, today)
+    return today
+
+
+@functools.lru_cache(maxsize=8)
 def _weekly_anchor(today: _today_date) -> _today_date:
     return today - timedelta(days=today.weekday())
 
 
+# (period, field) -> limit, built once from the env-driven constants above.
+_PERIOD_LIMITS: dict[tuple[str, str], int] = {
+    ("day", "memories_created"): DAILY_MEMORY_LIMIT,
+    ("day", "recall_queries"): DAILY_RECALL_LIMIT,
+    ("day", "projects_created"): DAILY_PROJECT_LIMIT,
+    ("week", "memories_created"): WEEKLY_MEMORY_LIMIT,
+    ("week", "recall_queries"): WEEKLY_RECALL_LIMIT,
+    ("week", "projects_created"): WEEKLY_PROJECT_LIMIT,
+}
+
+
 def _period_limit_for_field(field: str, period: str) -> int:
-    if period == "week":
-        if field == "memories_created":
-            return WEEKLY_MEMORY_LIMIT
-        if field == "recall_queries":
-            return WEEKLY_RECALL_LIMIT
-        if field == "projects_created":
-            return WEEKLY_PROJECT_LIMIT
-        return 0
-    if field == "memories_created":
-        return DAILY_MEMORY_LIMIT
-    if field == "recall_queries":
-        return DAILY_RECALL_LIMIT
-    if field == "projects_created":
-        return DAILY_PROJECT_LIMIT
-    return 0
-
-
-async def _get_usage_total(
+    return _PERIOD_LIMITS.get((period, field), 0)
+
+
+async def _get_usage_day_week_totals(
     db: AsyncSession,
     auth_user_id: int,
-    field: str,
+    fields: Sequence[str],
     *,
-    start_day: _today_date,
-    end_day: _today_date,
-) -> int:
-    column = UsageCounter.__table__.c[field]
-    total = (
+    today: _today_date,
+) -> dict[str, tuple[int, int]]:
+    """Return {field: (today_total, week_to_date_total)} from one aggregate query."""
+    columns: list[Any] = []
+    for field in fields:
+        column = UsageCounter.__table__.c[field]
+        columns.append(func.coalesce(func.sum(column).filter(UsageCounter.day == today), 0))
+        columns.append(func.coalesce(func.sum(column), 0))
+    row = (
         await db.execute(
-            select(func.coalesce(func.sum(column), 0)).where(
+            select(*columns).where(
                 UsageCounter.user_id == auth_user_id,
-                UsageCounter.day >= start_day,
-                UsageCounter.day <= end_day,
+                UsageCounter.day >= _weekly_anchor(today),
+                UsageCounter.day <= today,
             )
         )
-    ).scalar_one()
-    return int(total or 0)
+    ).one()
+    return {field: (int(row[2 * idx] or 0), int(row[2 * idx + 1] or 0)) for idx, field in enumerate(fields)}
 
 
 async def _get_auth_user_for_limits(db: AsyncSession, auth_user_id: int) -> AuthUser | None:
@@ -443,151 +503,383 @@ async def _get_auth_user_for_limits(db: AsyncSession, auth_user_id: int) -> Auth
     ).scalar_one_or_none()
 
 
-def _effective_usage_limit(limit: int, *, is_unlimited: bool) -> int:
-    return 0 if is_unlimited else limit
+def _effective_usage_limit(field: str, period: str, *, is_unlimited: bool) -> int:
+    return 0 if is_unlimited else _period_limit_for_field(field, period)
+
+
+# (auth user, counter field) -> (expires_at, day, day total, week total) as
+# last returned by _increment_daily_counter in this process. The increment
+# enforces the limits atomically; this only lets the up-front check skip its
+# aggregate query while a user is known to be under both limits.
+_USAGE_TOTALS_CACHE: OrderedDict[tuple[int, str], tuple[float, _today_date, int, int]] = OrderedDict()
+
+
+def _remember_usage_totals(auth_user_id: int, field: str, day: _today_date, current_day: int, current_week: int) -> None:
+    if USAGE_TOTALS_CACHE_TTL_SECONDS <= 0:
+        return
+    key = (auth_user_id, field)
+    _USAGE_TOTALS_CACHE[key] = (time.monotonic() + USAGE_TOTALS_CACHE_TTL_SECONDS, day, current_day, current_week)
+    _USAGE_TOTALS_CACHE.move_to_end(key)
+    while len(_USAGE_TOTALS_CACHE) > USAGE_TOTALS_CACHE_MAX_ITEMS:
+        _USAGE_TOTALS_CACHE.popitem(last=False)
 
 
-async def _check_daily_limit(db: AsyncSession, auth_user_id: int | None, field: str, limit: int) -> None:
-    """Raise HTTP 429 if the user has hit their daily limit for *field*.
+async def _check_daily_limit(
+    db: AsyncSession,
+    auth_user_id: int | None,
+    field: str,
+    *,
+    is_unlimited: bool | None = None,
+) -> None:
+    """Raise HTTP 429 if the user has hit their daily or weekly limit for *field*.
 
     Skips the check when:
     - auth_user_id is None (API-key-only calls, no auth user)
     - auth_user.is_unlimited is True (per-user bypass)
+
+    Request handlers pass ``is_unlimited`` from ``request.state``, where the
+    auth middleware stores it off the AuthUser row it already loaded; the
+    AuthUser is only looked up here when the caller has no such flag.
     """
     if auth_user_id is None:
         return
-    # Per-user bypass check (one extra query, fine at alpha scale)
-    au = await _get_auth_user_for_limits(db, auth_user_id)
-    if au is not None and au.is_unlimited:
+    if is_unlimited is None:
+        au = await _get_auth_user_for_limits(db, auth_user_id)
+        is_unlimited = au is not None and bool(au.is_unlimited)
+    if is_unlimited:
         return
-    today = _today_date.today()
-    if limit > 0:
-        current_day = await _get_usage_total(db, auth_user_id, field, start_day=today, end_day=today)
-        if current_day >= limit:
-            raise HTTPException(
-                status_code=429,
-                detail=f"Daily limit reached ({limit}). Resets at midnight UTC.",
-            )
-
+    limit = _period_limit_for_field(field, "day")
     week_limit = _period_limit_for_field(field, "week")
-    if week_limit > 0:
-        week_start = _weekly_anchor(today)
-        current_week = await _get_usage_total(
-            db,
-            auth_user_id,
-            field,
-            start_day=week_start,
-            end_day=today,
+    if limit <= 0 and week_limit <= 0:
+        return
+    today = _today()
+    cached = _USAGE_TOTALS_CACHE.get((auth_user_id, field))
+    if (
+        cached is not None
+        and cached[0] > time.monotonic()
+        and cached[1] == today
+        and (limit <= 0 or cached[2] < limit)
+        and (week_limit <= 0 or cached[3] < week_limit)
+    ):
+        # Under both limits as of this process's last increment. Other
+        # processes may have counted more since; the increment catches that.
+        return
+    # Day and week-to-date totals come back from a single aggregate.
+    current_day, current_week = (
+        await _get_usage_day_week_totals(db, auth_user_id, [field], today=today)
+    )[field]
+    if limit > 0 and current_day >= limit:
+        raise HTTPException(
+            status_code=429,
+            detail=f"Daily limit reached ({limit}). Resets at midnight UTC.",
+        )
+    if week_limit > 0 and current_week >= week_limit:
+        raise HTTPException(status_code=429, detail=f"Weekly limit reached ({week_limit}).")
+
+
+async def _check_rate_and_db_limits(
+    check: Callable[[str, str], tuple[bool, str | None]],
+    client_ip: str,
+    account_key: str,
+    *db_checks: Awaitable[Any],
+) -> None:
+    """Run a rate-limit check concurrently with DB-side limit checks.
+
+    The rate limiter talks to Redis through the blocking client, so it runs in
+    a worker thread and its round trip overlaps the DB checks instead of
+    stalling the event loop ahead of them. A rate-limit denial still wins over
+    errors from the DB checks, as when the two ran one after the other.
+    """
+    rate_result, *db_results = await asyncio.gather(
+        asyncio.to_thread(check, client_ip, account_key),
+        *db_checks,
+        return_exceptions=True,
+    )
+    if isinstance(rate_result, BaseException):
+        raise rate_result
+    allowed, detail = rate_result
+    if not allowed:
+        code = 503 if detail and detail.startswith("Service unavailable") else 429
+        raise HTTPException(status_code=code, detail=detail)
+    for result in db_results:
+        if isinstance(result, BaseException):
+            raise result
+
+
+_USAGE_PERIOD_COLUMNS = {
+    "memories_created": "memories_created",
+    "recall_queries": "search_queries",
+    "search_queries": "search_queries",
+}
+
+
+@functools.lru_cache(maxsize=4)
+def _month_bounds(year: int, month: int) -> tuple[datetime, datetime]:
+    """(first instant, last second) of a UTC calendar month."""
+    period_start = datetime(year, month, 1, tzinfo=timezone.utc)
+    next_month = datetime(year + (1 if month == 12 else 0), 1 if month == 12 else month + 1, 1, tzinfo=timezone.utc)
+    return period_start, next_month - timedelta(seconds=1)
+
+
+def _usage_period_upsert(auth_user_id: int, field: str, amount: int):
+    """ON CONFLICT upsert adding ``amount`` to this month's usage_periods row.
+
+    None when ``field`` has no monthly counterpart.
+    """
+    column = _USAGE_PERIOD_COLUMNS.get(field)
+    if column is None:
+        return None
+    now = datetime.now(timezone.utc)
+    period_start, period_end = _month_bounds(now.year, now.month)
+    return (
+        pg_insert(UsagePeriod)
+        .values(user_id=auth_user_id, period_start=period_start, period_end=period_end, **{column: amount})
+        .on_conflict_do_update(
+            index_elements=["user_id", "period_start"],
+            set_={column: UsagePeriod.__table__.c[column] + amount, "updated_at": func.now()},
         )
-        if current_week >= week_limit:
-            raise HTTPException(status_code=429, detail=f"Weekly limit reached ({week_limit}).")
+    )
 
 
-async def _increment_daily_counter(db: AsyncSession, auth_user_id: int | None, field: str) -> None:
+async def _increment_daily_counter(
+    db: AsyncSession,
+    auth_user_id: int | None,
+    field: str,
+    amount: int = 1,
+    *,
+    with_usage_period: bool = False,
+    usage_events: list[dict[str, Any]] | None = None,
+    is_unlimited: bool | None = None,
+) -> None:
     """Atomically increment a daily counter field for auth_user_id (upsert).
 
     Uses PostgreSQL INSERT … ON CONFLICT DO UPDATE for a single round-trip.
-    Safe under concurrent requests — no read-modify-write race.
+    Safe under concurrent requests — no read-modify-write race. The limit
+    checks ride on the same statement: RETURNING gives today's new total and
+    the earlier days of the week are summed alongside it. With
+    ``with_usage_period`` this month's usage_periods upsert rides along as
+    another CTE instead of costing its own round trip, and so do the
+    ``usage_events`` rows (``_usage_event_values`` dicts) when given.
+    Unlimited users are still counted but never get the 429; as in
+    ``_check_daily_limit``, ``is_unlimited=None`` means "look it up", which
+    only happens once a total is actually over a limit.
     """
+    if not USAGE_EVENTS_ENABLED:
+        usage_events = None
     if auth_user_id is None:
+        if usage_events:
+            db.add_all([UsageEvent(**values) for values in usage_events])
         return
-    today = _today_date.today()
-    # Build the upsert: insert a row with count=1; if it already exists for
-    # (user_id, day), increment the target column by 1.
-    stmt = (
+    today = _today()
+    column = UsageCounter.__table__.c[field]
+    # Build the upsert: insert a row with count=amount; if it already exists
+    # for (user_id, day), increment the target column by amount.
+    bumped = (
         pg_insert(UsageCounter)
-        .values(user_id=auth_user_id, day=today, **{field: 1})
+        .values(user_id=auth_user_id, day=today, **{field: amount})
         .on_conflict_do_update(
             index_elements=["user_id", "day"],
-            set_={field: UsageCounter.__table__.c[field] + 1},
+            set_={field: column + amount},
         )
+        .returning(column.label("day_total"))
+        .cte("bumped")
     )
-    await db.execute(stmt)
-    day_limit = _period_limit_for_field(field, "day")
-    if day_limit > 0:
-        current_day = await _get_usage_total(db, auth_user_id, field, start_day=today, end_day=today)
-        if current_day > day_limit:
-            raise HTTPException(status_code=429, detail=f"Daily limit reached ({day_limit}).")
-
-    week_limit = _period_limit_for_field(field, "week")
-    if week_limit > 0:
-        current_week = await _get_usage_total(
-            db,
-            auth_user_id,
-            field,
-            start_day=_weekly_anchor(today),
-            end_day=today,
+    # A data-modifying CTE is invisible to the rest of its statement, so the
+    # week sum stops before today and adds the freshly returned day total.
+    earlier_in_week = (
+        select(func.coalesce(func.sum(column), 0))
+        .where(
+            UsageCounter.user_id == auth_user_id,
+            UsageCounter.day >= _weekly_anchor(today),
+            UsageCounter.day < today,
         )
-        if current_week > week_limit:
-            raise HTTPException(status_code=429, detail=f"Weekly limit reached ({week_limit}).")
-
+        .scalar_subquery()
+    )
+    stmt = select(bumped.c.day_total, bumped.c.day_total + earlier_in_week)
+    period_upsert = _usage_period_upsert(auth_user_id, field, amount) if with_usage_period else None
+    if period_upsert is not None:
+        # Unreferenced data-modifying CTEs still run; add_cte makes sure it
+        # is rendered.
+        stmt = stmt.add_cte(period_upsert.cte("period_bumped"))
+    if usage_events:
+        stmt = stmt.add_cte(pg_insert(UsageEvent).values(usage_events).cte("usage_logged"))
+    current_day, current_week = (await db.execute(stmt)).one()
 
-async def _increment_usage_period(db: AsyncSession, auth_user_id: int | None, field: str, amount: int = 1) -> None:
-    if auth_user_id is None:
+    day_limit = _period_limit_for_field(field, "day")
+    week_limit = _period_limit_for_field(field, "week")
+    day_over = day_limit > 0 and current_day > day_limit
+    week_over = week_limit > 0 and current_week > week_limit
+    if (day_over or week_over) and is_unlimited is None:
+        au = await _get_auth_user_for_limits(db, auth_user_id)
+        is_unlimited = au is not None and bool(au.is_unlimited)
+    if is_unlimited:
         return
-    now = datetime.now(timezone.utc)
-    period_start = datetime(now.year, now.month, 1, tzinfo=timezone.utc)
-    next_month = datetime(now.year + (1 if now.month == 12 else 0), 1 if now.month == 12 else now.month + 1, 1, tzinfo=timezone.utc)
-    period_end = next_month - timedelta(seconds=1)
-    period = (
-        await db.execute(
-            select(UsagePeriod).where(
-                UsagePeriod.user_id == auth_user_id,
-                UsagePeriod.period_start == period_start,
-            ).limit(1)
-        )
-    ).scalar_one_or_none()
-    if period is None:
-        period = UsagePeriod(
-            user_id=auth_user_id,
-            period_start=period_start,
-            period_end=period_end,
-            memories_created=0,
-            search_queries=0,
-            bytes_ingested=0,
-        )
-        db.add(period)
-        await db.flush()
-    if field == "memories_created":
-        period.memories_created = int(period.memories_created or 0) + amount
-    elif field in {"recall_queries", "search_queries"}:
-        period.search_queries = int(period.search_queries or 0) + amount
+    if day_over:
+        raise HTTPException(status_code=429, detail=f"Daily limit reached ({day_limit}).")
+    if week_over:
+        raise HTTPException(status_code=429, detail=f"Weekly limit reached ({week_limit}).")
+    _remember_usage_totals(auth_user_id, field, today, current_day, current_week)
 
 
-def _billing_hook(event_type: str, user_id: int | None) -> None:
-    emit_usage_event(event_type=event_type, user_id=user_id)
+def _billing_hook(event_type: str, user_id: int | None, quantity: int = 1) -> None:
+    emit_usage_event(event_type=event_type, user_id=user_id, quantity=quantity)
 
 
 async def get_org_or_404(db: AsyncSession, org_id: int) -> Organization:
-    org = (
-        await db.execute(select(Organization).where(Organization.id == org_id).limit(1))
-    ).scalar_one_or_none()
+    org = await db.get(Organization, org_id)
     if org is None:
         raise HTTPException(status_code=404, detail="Org not found")
     return org
 
 
-async def get_project_or_404(db: AsyncSession, project_id: int, ctx: RequestContext) -> Project:
+def _project_scope_clauses(project_id: int, ctx: RequestContext) -> list[Any]:
+    """WHERE clauses that restrict ``Project`` to ``project_id`` within the caller's org."""
     if ctx.org_id is None and not ctx.bootstrap_mode:
         raise HTTPException(status_code=400, detail="X-Org-Id required")
-    project_query = select(Project).where(Project.id == project_id)
+    clauses: list[Any] = [Project.id == project_id]
     if ctx.org_id is not None:
-        project_query = project_query.where(Project.org_id == ctx.org_id)
-    project = (await db.execute(project_query.limit(1))).scalar_one_or_none()
-    if project is None:
+        clauses.append(Project.org_id == ctx.org_id)
+    return clauses
+
+
+# project_id -> (expires_at, org_id). A project never changes org, so a hit
+# answers the scope check without a query; delete_project evicts its entry and
+# other processes stop serving a deleted project within the TTL.
+_PROJECT_ORG_CACHE: OrderedDict[int, tuple[float, int]] = OrderedDict()
+
+
+def _forget_project(project_id: int) -> None:
+    _PROJECT_ORG_CACHE.pop(project_id, None)
+
+
+async def _resolve_project_org_id(db: AsyncSession, project_id: int, ctx: RequestContext) -> int:
+    """Return the org_id of a project visible to ``ctx``; 404 otherwise.
+
+    For handlers that only need the project's id and org, this replaces
+    get_project_or_404 with a cached lookup.
+    """
+    _project_scope_clauses(project_id, ctx)  # 400 when X-Org-Id is missing
+    now = time.monotonic()
+    entry = _PROJECT_ORG_CACHE.get(project_id)
+    if entry is not None and entry[0] > now:
+        org_id = entry[1]
+    else:
+        org_id = (await db.execute(select(Project.org_id).where(Project.id == project_id))).scalar_one_or_none()
+        if org_id is None:
+            _forget_project(project_id)
+            raise HTTPException(status_code=404, detail="Project not found")
+        if PROJECT_SCOPE_CACHE_TTL_SECONDS > 0:
+            _PROJECT_ORG_CACHE[project_id] = (now + PROJECT_SCOPE_CACHE_TTL_SECONDS, org_id)
+            _PROJECT_ORG_CACHE.move_to_end(project_id)
+            while len(_PROJECT_ORG_CACHE) > PROJECT_SCOPE_CACHE_MAX_ITEMS:
+                _PROJECT_ORG_CACHE.popitem(last=False)
+    if ctx.org_id is not None and org_id != ctx.org_id:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return org_id
+
+
+async def _ensure_project_exists(db: AsyncSession, project_id: int, ctx: RequestContext) -> None:
+    """Raise 404 unless the project is visible to ``ctx``.
+
+    Only called after a joined query came back empty, to tell "no such
+    project" apart from "project has no matching rows".
+    """
+    found = (
+        await db.execute(select(exists().where(*_project_scope_clauses(project_id, ctx))))
+    ).scalar()
+    if not found:
         raise HTTPException(status_code=404, detail="Project not found")
-    if not ctx.bootstrap_mode and ctx.org_id is not None and project.org_id != ctx.org_id:
+
+
+async def _ensure_org_exists(db: AsyncSession, org_id: int) -> None:
+    """Raise 404 unless the org exists.
+
+    Org-scoped routes skip the up-front get_org_or_404 and only call this when
+    their own org-filtered query came back empty.
+    """
+    found = (await db.execute(select(exists().where(Organization.id == org_id)))).scalar()
+    if not found:
+        raise HTTPException(status_code=404, detail="Org not found")
+
+
+async def _flush_org_child(db: AsyncSession) -> None:
+    """Flush a pending row whose org_id FK doubles as the org existence check."""
+    try:
+        await db.flush()
+    except IntegrityError as exc:
+        await db.rollback()
+        if getattr(exc.orig, "sqlstate", None) == "23503":  # foreign_key_violation
+            raise HTTPException(status_code=404, detail="Org not found") from exc
+        raise
+
+
+def _scoped_project_id(project_id: int, ctx: RequestContext):
+    """Scalar subquery yielding ``project_id`` if visible to ``ctx``, else NULL.
+
+    Assigned to ``Memory.project_id`` so the INSERT itself performs the scope
+    check; a NULL trips the NOT NULL constraint and _flush_project_child turns
+    that into a 404.
+    """
+    return select(Project.id).where(*_project_scope_clauses(project_id, ctx)).scalar_subquery()
+
+
+async def _flush_project_child(db: AsyncSession) -> None:
+    """Flush pending rows that reference a project that may no longer exist.
+
+    A _scoped_project_id subquery that matched nothing trips NOT NULL; a plain
+    project_id whose project was deleted trips the foreign key.
+    """
+    try:
+        await db.flush()
+    except IntegrityError as exc:
+        await db.rollback()
+        # not_null_violation / foreign_key_violation
+        if getattr(exc.orig, "sqlstate", None) in {"23502", "23503"}:
+            raise HTTPException(status_code=404, detail="Project not found") from exc
+        raise
+
+
+async def get_project_or_404(db: AsyncSession, project_id: int, ctx: RequestContext) -> Project:
+    _project_scope_clauses(project_id, ctx)  # 400 when X-Org-Id is missing
+    # Primary-key get: answered from the identity map when the project is
+    # already loaded in this session (e.g. inbox approve re-reading it).
+    project = await db.get(Project, project_id)
+    if project is None or (ctx.org_id is not None and project.org_id != ctx.org_id):
         raise HTTPException(status_code=404, detail="Project not found")
     return project
 
 
+async def _get_scoped_memory_or_404(
+    db: AsyncSession, project_id: int, memory_id: int, ctx: RequestContext
+) -> tuple[Memory, int, list[str]]:
+    """Fetch a memory with its project's org_id and tag names in a single round trip."""
+    row = (
+        await db.execute(
+            select(Memory, Project.org_id, _MEMORY_TAG_NAMES)
+            .options(*_SKIP_EMBEDDINGS)
+            .join(Project, Project.id == Memory.project_id)
+            .where(*_project_scope_clauses(project_id, ctx), Memory.id == memory_id)
+            .limit(1)
+        )
+    ).first()
+    if row is None:
+        await _ensure_project_exists(db, project_id, ctx)
+        raise HTTPException(status_code=404, detail="Memory not found")
+    return row[0], row[1], row[2] or []
+
+
 @router.get("/me", response_model=MeOut)
-async def get_me(ctx: RequestContext = Depends(get_actor_context)) -> MeOut:
-    return MeOut(
-        org_id=ctx.org_id,
-        role=ctx.role,
-        api_key_prefix=ctx.api_key_prefix,
-        actor_user_id=ctx.actor_user_id,
+async def get_me(request: Request) -> Response:
+    # Frontends poll this; read the middleware's auth state directly instead of
+    # going through the dependency graph and response-model validation.
+    ctx = await get_request_context(request)
+    return _json_response(
+        MeOut.model_construct(
+            org_id=ctx.org_id,
+            role=ctx.role,
+            api_key_prefix=ctx.api_key_prefix,
+            actor_user_id=ctx.actor_user_id,
+        )
     )
 
 
@@ -653,44 +945,28 @@ async def get_my_usage(
     if auth_user is None:
         raise HTTPException(status_code=401, detail="Unauthorized")
 
-    counter = await _get_usage_counter(db, auth_user_id)
-    today = _today_date.today()
+    today = _today()
     week_anchor = _weekly_anchor(today)
+    totals = await _get_usage_day_week_totals(
+        db, auth_user_id, ["memories_created", "recall_queries", "projects_created"], today=today
+    )
     is_unlimited = bool(auth_user.is_unlimited)
     return UsageOut(
         day=today.isoformat(),
-        memories_created=counter.memories_created if counter else 0,
-        recall_queries=counter.recall_queries if counter else 0,
-        projects_created=counter.projects_created if counter else 0,
+        memories_created=totals["memories_created"][0],
+        recall_queries=totals["recall_queries"][0],
+        projects_created=totals["projects_created"][0],
         week_start=week_anchor.isoformat(),
-        weekly_memories_created=await _get_usage_total(
-            db,
-            auth_user_id,
-            "memories_created",
-            start_day=week_anchor,
-            end_day=today,
-        ),
-        weekly_recall_queries=await _get_usage_total(
-            db,
-            auth_user_id,
-            "recall_queries",
-            start_day=week_anchor,
-            end_day=today,
-        ),
-        weekly_projects_created=await _get_usage_total(
-            db,
-            auth_user_id,
-            "projects_created",
-            start_day=week_anchor,
-            end_day=today,
-        ),
+        weekly_memories_created=totals["memories_created"][1],
+        weekly_recall_queries=totals["recall_queries"][1],
+        weekly_projects_created=totals["projects_created"][1],
         limits=UsageLimitsOut(
-            memories_per_day=_effective_usage_limit(DAILY_MEMORY_LIMIT, is_unlimited=is_unlimited),
-            recalls_per_day=_effective_usage_limit(DAILY_RECALL_LIMIT, is_unlimited=is_unlimited),
-            projects_per_day=_effective_usage_limit(DAILY_PROJECT_LIMIT, is_unlimited=is_unlimited),
-            memories_per_week=_effective_usage_limit(WEEKLY_MEMORY_LIMIT, is_unlimited=is_unlimited),
-            recalls_per_week=_effective_usage_limit(WEEKLY_RECALL_LIMIT, is_unlimited=is_unlimited),
-            projects_per_week=_effective_usage_limit(WEEKLY_PROJECT_LIMIT, is_unlimited=is_unlimited),
+            memories_per_day=_effective_usage_limit("memories_created", "day", is_unlimited=is_unlimited),
+            recalls_per_day=_effective_usage_limit("recall_queries", "day", is_unlimited=is_unlimited),
+            projects_per_day=_effective_usage_limit("projects_created", "day", is_unlimited=is_unlimited),
+            memories_per_week=_effective_usage_limit("memories_created", "week", is_unlimited=is_unlimited),
+            recalls_per_week=_effective_usage_limit("recall_queries", "week", is_unlimited=is_unlimited),
+            projects_per_week=_effective_usage_limit("projects_created", "week", is_unlimited=is_unlimited),
         ),
     )
 
@@ -751,16 +1027,8 @@ async def create_org(
             await db.flush()
         bootstrap_actor_user_id = bootstrap_user.id
 
-    if bootstrap_actor_user_id is not None:
-        existing_membership = (
-            await db.execute(
-                select(Membership.id)
-                .where(Membership.org_id == org.id, Membership.user_id == bootstrap_actor_user_id)
-                .limit(1)
-            )
-        ).scalar_one_or_none()
-        if existing_membership is None:
-            db.add(Membership(org_id=org.id, user_id=bootstrap_actor_user_id, role="owner"))
+    # The org was flushed a few lines up, so it cannot have memberships yet.
+    db.add(Membership(org_id=org.id, user_id=bootstrap_actor_user_id, role="owner"))
 
     await write_audit(
         db,
@@ -772,7 +1040,6 @@ async def create_org(
         metadata={"name": org.name},
     )
     await db.commit()
-    await db.refresh(org)
     return OrgOut(id=org.id, name=org.name, created_at=org.created_at)
 
 
@@ -780,7 +1047,7 @@ async def create_org(
 async def list_orgs(
     db: AsyncSession = Depends(get_db),
     ctx: RequestContext = Depends(get_actor_context),
-) -> List[OrgOut]:
+) -> Response:
     if ctx.bootstrap_mode:
         rows = (await db.execute(select(Organization).order_by(Organization.id.desc()))).scalars().all()
     elif ctx.org_id is not None:
@@ -791,7 +1058,9 @@ async def list_orgs(
         ).scalars().all()
     else:
         rows = []
-    return [OrgOut(id=o.id, name=o.name, created_at=o.created_at) for o in rows]
+    return _json_list_response(
+        _ORG_LIST_ADAPTER, [OrgOut.model_construct(id=o.id, name=o.name, created_at=o.created_at) for o in rows]
+    )
 
 
 @router.patch("/orgs/{org_id}", response_model=OrgOut)
@@ -876,17 +1145,19 @@ async def create_membership(
     elif payload.display_name and not user.display_name:
         user.display_name = payload.display_name
 
-    membership = (
-        await db.execute(
-            select(Membership).where(Membership.org_id == org_id, Membership.user_id == user.id).limit(1)
+    # Single-statement upsert on uq_memberships_org_user: no read-then-write
+    # race between concurrent invites for the same user.
+    stmt = (
+        pg_insert(Membership)
+        .values(org_id=org_id, user_id=user.id, role=payload.role)
+        .on_conflict_do_update(
+            index_elements=["org_id", "user_id"],
+            set_={"role": payload.role},
         )
-    ).scalar_one_or_none()
-    if membership is None:
-        membership = Membership(org_id=org_id, user_id=user.id, role=payload.role)
-        db.add(membership)
-        await db.flush()
-    else:
-        membership.role = payload.role
+        .returning(Membership)
+        .execution_options(populate_existing=True)
+    )
+    membership = (await db.execute(stmt)).scalar_one()
 
     await write_audit(
         db,
@@ -898,7 +1169,6 @@ async def create_membership(
         metadata={"email": user.email, "role": membership.role},
     )
     await db.commit()
-    await db.refresh(membership)
     return MembershipOut(
         id=membership.id,
         org_id=membership.org_id,
@@ -915,31 +1185,39 @@ async def list_memberships(
     org_id: int,
     db: AsyncSession = Depends(get_db),
     ctx: RequestContext = Depends(get_actor_context),
-) -> List[MembershipOut]:
+) -> Response:
     ensure_org_access(ctx, org_id)
     require_role(ctx, "owner")
-    await get_org_or_404(db, org_id)
-
     rows = (
         await db.execute(
-            select(Membership, User)
+            select(
+                Membership.id,
+                Membership.org_id,
+                Membership.user_id,
+                User.email,
+                User.display_name,
+                Membership.role,
+                Membership.created_at,
+            )
             .join(User, User.id == Membership.user_id)
             .where(Membership.org_id == org_id)
             .order_by(Membership.id.asc())
         )
     ).all()
-    return [
-        MembershipOut(
-            id=membership.id,
-            org_id=membership.org_id,
-            user_id=membership.user_id,
-            email=user.email,
-            display_name=user.display_name,
-            role=membership.role,
-            created_at=membership.created_at,
+    if not rows:
+        await _ensure_org_exists(db, org_id)
+    return _json_list_response(_MEMBERSHIP_LIST_ADAPTER, [
+        MembershipOut.model_construct(
+            id=row.id,
+            org_id=row.org_id,
+            user_id=row.user_id,
+            email=row.email,
+            display_name=row.display_name,
+            role=row.role,
+            created_at=row.created_at,
         )
-        for membership, user in rows
-    ]
+        for row in rows
+    ])
 
 
 @router.patch("/orgs/{org_id}/memberships/{membership_id}", response_model=MembershipOut)
@@ -952,25 +1230,23 @@ async def update_membership(
 ) -> MembershipOut:
     ensure_org_access(ctx, org_id)
     require_role(ctx, "owner")
-    await get_org_or_404(db, org_id)
-
     membership = (
         await db.execute(
             select(Membership)
+            .options(joinedload(Membership.user, innerjoin=True))
             .where(Membership.org_id == org_id, Membership.id == membership_id)
             .limit(1)
         )
     ).scalar_one_or_none()
     if membership is None:
+        await _ensure_org_exists(db, org_id)
         raise HTTPException(status_code=404, detail="Membership not found")
 
     if membership.user_id == ctx.actor_user_id and payload.role != "owner":
         raise HTTPException(status_code=409, detail="Cannot change your own role from owner")
 
     membership.role = payload.role
-    user = (
-        await db.execute(select(User).where(User.id == membership.user_id).limit(1))
-    ).scalar_one()
+    user = membership.user
 
     await write_audit(
         db,
@@ -1003,16 +1279,16 @@ async def delete_membership(
 ) -> None:
     ensure_org_access(ctx, org_id)
     require_role(ctx, "owner")
-    await get_org_or_404(db, org_id)
-
     membership = (
         await db.execute(
             select(Membership)
+            .options(joinedload(Membership.user, innerjoin=True))
             .where(Membership.org_id == org_id, Membership.id == membership_id)
             .limit(1)
         )
     ).scalar_one_or_none()
     if membership is None:
+        await _ensure_org_exists(db, org_id)
         raise HTTPException(status_code=404, detail="Membership not found")
 
     if membership.role == "owner":
@@ -1025,9 +1301,7 @@ async def delete_membership(
         if owner_count <= 1:
             raise HTTPException(status_code=409, detail="Cannot remove the last owner")
 
-    user = (
-        await db.execute(select(User).where(User.id == membership.user_id).limit(1))
-    ).scalar_one()
+    user = membership.user
 
     await write_audit(
         db,
@@ -1049,14 +1323,24 @@ async def list_audit_logs(
     offset: int = Query(default=0, ge=0),
     db: AsyncSession = Depends(get_db),
     ctx: RequestContext = Depends(get_actor_context),
-) -> List[AuditLogOut]:
+) -> Response:
     ensure_org_access(ctx, org_id)
     require_role(ctx, "owner")
-    await get_org_or_404(db, org_id)
 
     rows = (
         await db.execute(
-            select(AuditLog, User.email)
+            select(
+                AuditLog.id,
+                AuditLog.org_id,
+                AuditLog.actor_user_id,
+                AuditLog.api_key_prefix,
+                AuditLog.action,
+                AuditLog.entity_type,
+                AuditLog.entity_id,
+                AuditLog.metadata_json,
+                AuditLog.created_at,
+                User.email,
+            )
             .outerjoin(User, User.id == AuditLog.actor_user_id)
             .where(AuditLog.org_id == org_id)
             .order_by(AuditLog.created_at.desc(), AuditLog.id.desc())
@@ -1064,8 +1348,10 @@ async def list_audit_logs(
             .limit(limit)
         )
     ).all()
-    return [
-        AuditLogOut(
+    if not rows:
+        await _ensure_org_exists(db, org_id)
+    return _json_list_response(_AUDIT_LOG_LIST_ADAPTER, [
+        AuditLogOut.model_construct(
             id=log.id,
             org_id=log.org_id,
             actor_user_id=log.actor_user_id,
@@ -1073,11 +1359,11 @@ async def list_audit_logs(
             action=log.action,
             entity_type=log.entity_type,
             entity_id=log.entity_id,
-            metadata={**(log.metadata_json or {}), **({"actor_email": email} if email else {})},
+            metadata={**(log.metadata_json or {}), **({"actor_email": log.email} if log.email else {})},
             created_at=log.created_at,
         )
-        for log, email in rows
-    ]
+        for log in rows
+    ])
 
 
 @router.post("/orgs/{org_id}/projects", response_model=ProjectOut, status_code=201)
@@ -1090,14 +1376,17 @@ async def create_org_project(
 ) -> ProjectOut:
     ensure_org_access(ctx, org_id)
     require_role(ctx, "member")
-    await get_org_or_404(db, org_id)
-
     auth_user_id: int | None = getattr(request.state, "auth_user_id", None)
-    await _check_daily_limit(db, auth_user_id, "projects_created", DAILY_PROJECT_LIMIT)
+    await _check_daily_limit(
+        db,
+        auth_user_id,
+        "projects_created",
+        is_unlimited=getattr(request.state, "auth_is_unlimited", None),
+    )
 
     project = Project(name=payload.name, org_id=org_id, created_by_user_id=ctx.actor_user_id)
     db.add(project)
-    await db.flush()
+    await _flush_org_child(db)
     await write_audit(
         db,
         ctx=ctx,
@@ -1107,13 +1396,19 @@ async def create_org_project(
         entity_id=project.id,
         metadata={"name": project.name},
     )
-    await write_usage(db, request=request, ctx=ctx, event_type="project_created", org_id=org_id, project_id=project.id)
-    await _increment_daily_counter(db, auth_user_id, "projects_created")
-    await _increment_usage_period(db, auth_user_id, "projects_created")
+    await _increment_daily_counter(
+        db,
+        auth_user_id,
+        "projects_created",
+        with_usage_period=True,
+        usage_events=[
+            _usage_event_values(request, event_type="project_created", org_id=org_id, project_id=project.id)
+        ],
+        is_unlimited=getattr(request.state, "auth_is_unlimited", None),
+    )
     _billing_hook("project_created", auth_user_id)
     await db.commit()
-    await db.refresh(project)
-    return ProjectOut(
+    return ProjectOut.model_construct(
         id=project.id,
         org_id=project.org_id,
         created_by_user_id=project.created_by_user_id,
@@ -1127,16 +1422,16 @@ async def list_org_projects(
     org_id: int,
     db: AsyncSession = Depends(get_db),
     ctx: RequestContext = Depends(get_actor_context),
-) -> List[ProjectOut]:
+) -> Response:
     ensure_org_access(ctx, org_id)
     require_role(ctx, "viewer")
-    await get_org_or_404(db, org_id)
-
     rows = (
         await db.execute(select(Project).where(Project.org_id == org_id).order_by(Project.id.desc()))
     ).scalars().all()
-    return [
-        ProjectOut(
+    if not rows:
+        await _ensure_org_exists(db, org_id)
+    projects = [
+        ProjectOut.model_construct(
             id=p.id,
             org_id=p.org_id,
             created_by_user_id=p.created_by_user_id,
@@ -1145,6 +1440,7 @@ async def list_org_projects(
         )
         for p in rows
     ]
+    return _json_list_response(_PROJECT_LIST_ADAPTER, projects)
 
 
 @router.post("/orgs/{org_id}/api-keys", response_model=ApiKeyCreatedOut, status_code=201)
@@ -1157,19 +1453,20 @@ async def create_org_api_key(
 ) -> ApiKeyCreatedOut:
     super_admin = _is_super_admin(request)
     _enforce_org_api_key_access(ctx, org_id, super_admin=super_admin)
-    await get_org_or_404(db, org_id)
+    # Mint and hash before the first query so no key material work happens
+    # while the session's transaction is open.
+    plaintext = generate_api_key()
+    key_hash = hash_api_key(plaintext)
     await _enforce_org_api_key_limit(db, org_id=org_id, super_admin=super_admin)
 
-    plaintext = generate_api_key()
-    prefix = plaintext[:8]
     key = ApiKey(
         org_id=org_id,
         name=payload.name,
-        key_hash=hash_api_key(plaintext),
-        prefix=prefix,
+        key_hash=key_hash,
+        prefix=plaintext[:8],
     )
     db.add(key)
-    await db.flush()
+    await _flush_org_child(db)
     await write_audit(
         db,
         ctx=ctx,
@@ -1180,7 +1477,6 @@ async def create_org_api_key(
         metadata={"name": key.name, "prefix": key.prefix},
     )
     await db.commit()
-    await db.refresh(key)
     return ApiKeyCreatedOut(
         id=key.id,
         org_id=key.org_id,
@@ -1198,17 +1494,19 @@ async def list_org_api_keys(
     request: Request,
     db: AsyncSession = Depends(get_db),
     ctx: RequestContext = Depends(get_actor_context),
-) -> List[ApiKeyOut]:
+) -> Response:
     _enforce_org_api_key_access(ctx, org_id, super_admin=_is_super_admin(request))
-    await get_org_or_404(db, org_id)
-
     keys = (
         await db.execute(
-            select(ApiKey).where(ApiKey.org_id == org_id).order_by(ApiKey.created_at.desc(), ApiKey.id.desc())
+            select(*_API_KEY_OUT_COLUMNS)
+            .where(ApiKey.org_id == org_id)
+            .order_by(ApiKey.created_at.desc(), ApiKey.id.desc())
         )
-    ).scalars().all()
-    return [
-        ApiKeyOut(
+    ).all()
+    if not keys:
+        await _ensure_org_exists(db, org_id)
+    return _json_list_response(_API_KEY_LIST_ADAPTER, [
+        ApiKeyOut.model_construct(
             id=k.id,
             org_id=k.org_id,
             name=k.name,
@@ -1219,7 +1517,7 @@ async def list_org_api_keys(
             use_count=k.use_count,
         )
         for k in keys
-    ]
+    ])
 
 
 @router.post("/orgs/{org_id}/api-keys/{key_id}/revoke", response_model=ApiKeyOut)
@@ -1231,14 +1529,13 @@ async def revoke_org_api_key(
     ctx: RequestContext = Depends(get_actor_context),
 ) -> ApiKeyOut:
     _enforce_org_api_key_access(ctx, org_id, super_admin=_is_super_admin(request))
-    await get_org_or_404(db, org_id)
-
     key = (
         await db.execute(
             select(ApiKey).where(ApiKey.org_id == org_id, ApiKey.id == key_id).limit(1)
         )
     ).scalar_one_or_none()
     if key is None:
+        await _ensure_org_exists(db, org_id)
         raise HTTPException(status_code=404, detail="API key not found")
     if key.revoked_at is None:
         key.revoked_at = datetime.now(timezone.utc)
@@ -1329,14 +1626,13 @@ async def list_api_key_access_requests(
     request: Request,
     db: AsyncSession = Depends(get_db),
     ctx: RequestContext = Depends(get_actor_context),
-) -> List[ApiKeyAccessRequestOut]:
+) -> Response:
     super_admin = _is_super_admin(request)
     if not super_admin:
         ensure_org_access(ctx, org_id)
         require_role(ctx, "viewer")
         if ctx.actor_user_id is None:
             raise HTTPException(status_code=403, detail="Forbidden")
-    await get_org_or_404(db, org_id)
 
     reviewer = aliased(User)
     stmt = (
@@ -1350,7 +1646,12 @@ async def list_api_key_access_requests(
     rows = (
         await db.execute(stmt.order_by(ApiKeyAccessRequest.created_at.desc(), ApiKeyAccessRequest.id.desc()))
     ).all()
-    return [_api_key_access_request_out(req, requester, reviewed_by) for req, requester, reviewed_by in rows]
+    if not rows:
+        await _ensure_org_exists(db, org_id)
+    return _json_list_response(
+        _API_KEY_ACCESS_REQUEST_LIST_ADAPTER,
+        [_api_key_access_request_out(req, requester, reviewed_by) for req, requester, reviewed_by in rows],
+    )
 
 
 @router.post(
@@ -1366,7 +1667,6 @@ async def approve_api_key_access_request(
     ctx: RequestContext = Depends(get_actor_context),
 ) -> ApiKeyAccessRequestOut:
     _enforce_org_api_key_access(ctx, org_id, super_admin=_is_super_admin(request))
-    await get_org_or_404(db, org_id)
 
     req = (
         await db.execute(
@@ -1376,6 +1676,7 @@ async def approve_api_key_access_request(
         )
     ).scalar_one_or_none()
     if req is None:
+        await _ensure_org_exists(db, org_id)
         raise HTTPException(status_code=404, detail="API key access request not found")
     if req.status != "pending":
         raise HTTPException(status_code=409, detail="Request already reviewed")
@@ -1391,7 +1692,7 @@ async def approve_api_key_access_request(
         raise HTTPException(status_code=409, detail="Requester is no longer a member of this org")
 
     old_role = membership.role
-    if ROLE_RANK.get(membership.role, 0) < ROLE_RANK["admin"]:
+    if membership.role not in ROLES_AT_LEAST["admin"]:
         membership.role = "admin"
 
     req.status = "approved"
@@ -1439,7 +1740,6 @@ async def reject_api_key_access_request(
     ctx: RequestContext = Depends(get_actor_context),
 ) -> ApiKeyAccessRequestOut:
     _enforce_org_api_key_access(ctx, org_id, super_admin=_is_super_admin(request))
-    await get_org_or_404(db, org_id)
 
     req = (
         await db.execute(
@@ -1449,6 +1749,7 @@ async def reject_api_key_access_request(
         )
     ).scalar_one_or_none()
     if req is None:
+        await _ensure_org_exists(db, org_id)
         raise HTTPException(status_code=404, detail="API key access request not found")
     if req.status != "pending":
         raise HTTPException(status_code=409, detail="Request already reviewed")
@@ -1484,18 +1785,20 @@ async def list_all_api_keys_admin(
     request: Request,
     org_id: int | None = Query(default=None, ge=1),
     db: AsyncSession = Depends(get_db),
-) -> List[ApiKeyOut]:
+) -> Response:
     if not _is_super_admin(request):
         raise HTTPException(status_code=403, detail="Forbidden")
 
-    stmt = select(ApiKey)
+    stmt = select(*_API_KEY_OUT_COLUMNS)
     if org_id is not None:
         stmt = stmt.where(ApiKey.org_id == org_id)
-    keys = (
-        await db.execute(stmt.order_by(ApiKey.created_at.desc(), ApiKey.id.desc()))
-    ).scalars().all()
-    return [
-        ApiKeyOut(
+    # Unpaginated across every org: stream through a server-side cursor so the
+    # full Row list is never buffered next to the response models.
+    keys = await db.stream(
+        stmt.order_by(ApiKey.created_at.desc(), ApiKey.id.desc()).execution_options(yield_per=500)
+    )
+    return _json_list_response(_API_KEY_LIST_ADAPTER, [
+        ApiKeyOut.model_construct(
             id=k.id,
             org_id=k.org_id,
             name=k.name,
@@ -1505,8 +1808,8 @@ async def list_all_api_keys_admin(
             last_used_at=k.last_used_at,
             use_count=k.use_count,
         )
-        for k in keys
-    ]
+        async for k in keys
+    ])
 
 
 # Legacy endpoints kept for compatibility; all are org-scoped by request context.
@@ -1532,7 +1835,7 @@ async def create_project(
 async def list_projects(
     db: AsyncSession = Depends(get_db),
     ctx: RequestContext = Depends(get_actor_context),
-) -> List[ProjectOut]:
+) -> Response:
     if ctx.org_id is None:
         raise HTTPException(status_code=400, detail="X-Org-Id required")
     return await list_org_projects(org_id=ctx.org_id, db=db, ctx=ctx)
@@ -1546,7 +1849,7 @@ async def get_project(
 ) -> ProjectOut:
     require_role(ctx, "viewer")
     project = await get_project_or_404(db, project_id, ctx)
-    return ProjectOut(
+    return ProjectOut.model_construct(
         id=project.id,
         org_id=project.org_id,
         created_by_user_id=project.created_by_user_id,
@@ -1583,7 +1886,7 @@ async def update_project(
     )
     await db.commit()
     await db.refresh(project)
-    return ProjectOut(
+    return ProjectOut.model_construct(
         id=project.id,
         org_id=project.org_id,
         created_by_user_id=project.created_by_user_id,
@@ -1612,53 +1915,227 @@ async def delete_project(
     )
     await db.delete(project)
     await db.commit()
+    _forget_project(project_id)
 
 
-def _content_hash(content: str) -> str:
-    return hashlib.sha256(content.encode()).hexdigest()
+# Embeddings run in worker threads so a slow engine model (or a large batch)
+# does not stall the event loop; the semaphore caps how many threads the
+# request handlers can occupy at once.
+_EMBED_SEM = asyncio.Semaphore(EMBEDDING_THREAD_LIMIT)
 
 
-async def _load_tag_names(db: AsyncSession, memory_ids: list[int]) -> dict[int, list[str]]:
-    """Load tag names for a list of memory IDs. Returns {memory_id: [tag_name, ...]}."""
-    if not memory_ids:
-        return {}
-    rows = (
-        await db.execute(
-            select(MemoryTag.memory_id, Tag.name)
-            .join(Tag, Tag.id == MemoryTag.tag_id)
-            .where(MemoryTag.memory_id.in_(memory_ids))
-            .order_by(Tag.name)
-        )
-    ).all()
-    result: dict[int, list[str]] = {mid: [] for mid in memory_ids}
-    for memory_id, tag_name in rows:
-        result[memory_id].append(tag_name)
-    return result
+def _embed_with_hilbert(texts: list[str]) -> list[tuple[list[float], Any]]:
+    return [(embedding, compute_hilbert_index(embedding)) for embedding in map(compute_embedding, texts)]
 
 
-async def _upsert_tags(db: AsyncSession, project_id: int, tag_names: list[str]) -> list[Tag]:
-    """Return Tag objects for the given names, creating any that don't exist."""
-    clean = [n.strip().lower()[:100] for n in tag_names if n.strip()][:20]
-    tags: list[Tag] = []
-    for name in clean:
-        tag = (
-            await db.execute(
-                select(Tag)
-                .where(Tag.project_id == project_id, func.lower(Tag.name) == name)
-                .limit(1)
-            )
-        ).scalar_one_or_none()
-        if tag is None:
-            tag = Tag(project_id=project_id, name=name)
-            db.add(tag)
-            await db.flush()
-        tags.append(tag)
-    return tags
+async def _embed_texts(texts: list[str]) -> list[tuple[list[float], Any]]:
+    """(embedding, hilbert_index) per text, computed off the event loop."""
+    async with _EMBED_SEM:
+        return await asyncio.to_thread(_embed_with_hilbert, texts)
 
 
-def _memory_to_out(m: Memory, tag_names: list[str]) -> MemoryOut:
-    return MemoryOut(
-        id=m.id,
+def _embed_and_hash_sync(texts: list[str], contents: list[str]) -> list[tuple[list[float], Any, str]]:
+    return [
+        (embedding, hilbert_index, _content_hash(content))
+        for (embedding, hilbert_index), content in zip(_embed_with_hilbert(texts), contents)
+    ]
+
+
+async def _embed_and_hash(texts: list[str], contents: list[str]) -> list[tuple[list[float], Any, str]]:
+    """Like ``_embed_texts`` plus each content's ``_content_hash``, in the same thread hop."""
+    async with _EMBED_SEM:
+        return await asyncio.to_thread(_embed_and_hash_sync, texts, contents)
+
+
+def _content_hash(content: str) -> str:
+    # Stored in memories.content_hash and matched by the mock-data seeder, so
+    # the algorithm is part of the data format. SHA-256 also beats BLAKE2b on
+    # hosts with SHA extensions, which is where this runs.
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def _clean_tag_names(tag_names: list[str]) -> list[str]:
+    """Normalize tag names: stripped, lowercased, max 100 chars, first 20 distinct."""
+    clean: list[str] = []
+    seen: set[str] = set()
+    for raw in tag_names:
+        name = raw.strip().lower()[:100]
+        if name and name not in seen:
+            seen.add(name)
+            clean.append(name)
+            if len(clean) == 20:
+                break
+    return clean
+
+
+async def _upsert_clean_tags(
+    db: AsyncSession,
+    project_id: int,
+    names: list[str],
+    *,
+    link_memory_id: int | None = None,
+) -> list[Tag]:
+    """Resolve already-cleaned tag names in one statement.
+
+    The lookup of existing tags (case-insensitive, so legacy mixed-case names
+    still match) and the insert of the missing ones run as two CTEs of one
+    query. With ``link_memory_id`` the memory_tags rows for that memory ride
+    along as a third CTE. Returns one Tag per distinct name, in first-seen
+    order.
+    """
+    names = list(dict.fromkeys(names))
+    if not names:
+        return []
+    tag_columns = (Tag.id, Tag.project_id, Tag.name, Tag.created_at)
+    existing = (
+        select(*tag_columns)
+        .where(Tag.project_id == project_id, func.lower(Tag.name).in_(names))
+        .cte("existing")
+    )
+    wanted = func.unnest(literal(names, ARRAY(String))).table_valued("name").render_derived(name="wanted")
+    inserted = (
+        pg_insert(Tag)
+        .from_select(
+            ["project_id", "name"],
+            select(literal(project_id, Integer), wanted.c.name).where(
+                wanted.c.name.not_in(select(func.lower(existing.c.name)))
+            ),
+        )
+        .on_conflict_do_nothing(index_elements=["project_id", "name"])
+        .returning(*tag_columns)
+        .cte("inserted")
+    )
+    candidates = union_all(select(existing), select(inserted)).subquery("candidates")
+    # One tag per lowercased name, the oldest when legacy case variants exist.
+    ranked = select(
+        candidates,
+        func.row_number()
+        .over(partition_by=func.lower(candidates.c.name), order_by=candidates.c.id)
+        .label("variant"),
+    ).subquery("ranked")
+    resolved = select(*(ranked.c[column.key] for column in tag_columns)).where(ranked.c.variant == 1).cte("resolved")
+    rows = select(resolved)
+    if link_memory_id is not None:
+        linked = (
+            pg_insert(MemoryTag)
+            .from_select(["memory_id", "tag_id"], select(literal(link_memory_id, Integer), resolved.c.id))
+            .on_conflict_do_nothing(index_elements=["memory_id", "tag_id"])
+        )
+        rows = rows.add_cte(linked.cte("linked"))
+    found = {tag.name.lower(): tag for tag in await db.scalars(select(Tag).from_statement(rows))}
+    # Names another request inserted after this statement's snapshot.
+    raced = [name for name in names if name not in found]
+    if raced:
+        for tag in await db.scalars(select(Tag).where(Tag.project_id == project_id, Tag.name.in_(raced))):
+            found[tag.name] = tag
+        if link_memory_id is not None:
+            await _link_memory_tags(db, [(link_memory_id, found[name].id) for name in raced])
+    return [found[name] for name in names]
+
+
+async def _upsert_tags(
+    db: AsyncSession,
+    project_id: int,
+    tag_names: list[str],
+    *,
+    link_memory_id: int | None = None,
+) -> list[Tag]:
+    """Return Tag objects for the given names, creating any that don't exist."""
+    return await _upsert_clean_tags(db, project_id, _clean_tag_names(tag_names), link_memory_id=link_memory_id)
+
+
+async def _link_memory_tags(db: AsyncSession, links: list[tuple[int, int]]) -> None:
+    """Insert (memory_id, tag_id) links in one statement; existing links are kept."""
+    if not links:
+        return
+    await db.execute(
+        pg_insert(MemoryTag)
+        .values([{"memory_id": memory_id, "tag_id": tag_id} for memory_id, tag_id in links])
+        .on_conflict_do_nothing(index_elements=["memory_id", "tag_id"])
+    )
+
+
+def _json_response(payload: BaseModel, response: Response | None = None) -> Response:
+    """Serialize a response model straight to JSON bytes with pydantic-core.
+
+    Skips FastAPI's jsonable_encoder + json.dumps pass for large payloads.
+    Headers set on the injected ``response`` are carried over, since FastAPI
+    does not merge them into a Response returned by the endpoint.
+    """
+    out = Response(content=payload.model_dump_json(), media_type="application/json")
+    if response is not None:
+        out.raw_headers.extend(response.raw_headers)
+    return out
+
+
+_MEMORY_LIST_ADAPTER = TypeAdapter(list[MemoryOut])
+_PROJECT_LIST_ADAPTER = TypeAdapter(list[ProjectOut])
+_MEMBERSHIP_LIST_ADAPTER = TypeAdapter(list[MembershipOut])
+_AUDIT_LOG_LIST_ADAPTER = TypeAdapter(list[AuditLogOut])
+_API_KEY_LIST_ADAPTER = TypeAdapter(list[ApiKeyOut])
+_ORG_LIST_ADAPTER = TypeAdapter(list[OrgOut])
+_API_KEY_ACCESS_REQUEST_LIST_ADAPTER = TypeAdapter(list[ApiKeyAccessRequestOut])
+
+# Columns ApiKeyOut reads; key listings select these rather than ApiKey
+# entities so key_hash and the ORM bookkeeping never leave the row.
+_API_KEY_OUT_COLUMNS = (
+    ApiKey.id,
+    ApiKey.org_id,
+    ApiKey.name,
+    ApiKey.prefix,
+    ApiKey.created_at,
+    ApiKey.revoked_at,
+    ApiKey.last_used_at,
+    ApiKey.use_count,
+)
+
+
+def _json_list_response(adapter: TypeAdapter[Any], items: list[Any], *, status_code: int = 200) -> Response:
+    """List counterpart of _json_response, reusing a module-level serializer."""
+    return Response(content=adapter.dump_json(items), media_type="application/json", status_code=status_code)
+
+
+# Embeddings are written on create/update but never read back through the ORM
+# on API paths. Leaving both columns unloaded avoids shipping and parsing two
+# 1536-float payloads (JSONB + pgvector text) per row.
+_SKIP_EMBEDDINGS = (defer(Memory.search_vector), defer(Memory.embedding_vector))
+
+# Read-only list paths select just the columns MemoryOut needs and hand the
+# Core rows (attribute access by column key) straight to the *_to_out helpers,
+# skipping ORM identity-map and instrumentation work per row.
+_MEMORY_OUT_COLUMNS = (
+    Memory.id,
+    Memory.project_id,
+    Memory.created_by_user_id,
+    Memory.type,
+    Memory.source,
+    Memory.title,
+    Memory.content,
+    Memory.metadata_json,
+    Memory.created_at,
+    Memory.updated_at,
+)
+
+# Sorted tag names as a correlated array_agg, so memory reads return tags in
+# the same statement instead of a follow-up tag query. NULL when the memory
+# has no tags.
+_MEMORY_TAG_NAMES = (
+    select(func.array_agg(aggregate_order_by(Tag.name, Tag.name)))
+    .select_from(MemoryTag)
+    .join(Tag, Tag.id == MemoryTag.tag_id)
+    .where(MemoryTag.memory_id == Memory.id)
+    .correlate(Memory)
+    .scalar_subquery()
+    .label("tag_names")
+)
+
+
+# Row -> response helpers use model_construct: the rows are trusted DB data,
+# and the routes serialize them unvalidated through _json_response /
+# _json_list_response rather than FastAPI's response_model pass.
+def _memory_to_out(m: Memory | Row[Any], tag_names: list[str]) -> MemoryOut:
+    return MemoryOut.model_construct(
+        id=m.id,
         project_id=m.project_id,
         created_by_user_id=m.created_by_user_id,
         type=m.type,
@@ -1672,8 +2149,8 @@ def _memory_to_out(m: Memory, tag_names: list[str]) -> MemoryOut:
     )
 
 
-def _recall_item_to_out(m: Memory, tag_names: list[str], rank_score: float | None) -> RecallItemOut:
-    return RecallItemOut(
+def _recall_item_to_out(m: Memory | Row[Any], tag_names: list[str], rank_score: float | None) -> RecallItemOut:
+    return RecallItemOut.model_construct(
         id=m.id,
         project_id=m.project_id,
         created_by_user_id=m.created_by_user_id,
@@ -1759,6 +2236,7 @@ async def _load_batch_memories(
         rows = (
             await db.execute(
                 select(Memory)
+                .options(*_SKIP_EMBEDDINGS)
                 .join(Project, Project.id == Memory.project_id)
                 .where(Project.org_id == org_id, Memory.id.in_(chunk))
             )
@@ -1869,15 +2347,7 @@ async def _run_brain_batch_action(
                     )
                 )
                 continue
-            existing_link = (
-                await db.execute(
-                    select(MemoryTag)
-                    .where(MemoryTag.memory_id == memory.id, MemoryTag.tag_id == tag.id)
-                    .limit(1)
-                )
-            ).scalar_one_or_none()
-            if existing_link is None:
-                db.add(MemoryTag(memory_id=memory.id, tag_id=tag.id))
+            await _link_memory_tags(db, [(memory.id, tag.id)])
             results.append(BrainBatchResultItem(id=raw_id, success=True))
             continue
 
@@ -1962,6 +2432,11 @@ async def _run_brain_batch_action(
             )
         )
 
+    if action_type in mutating_actions:
+        # Evicted before the caller commits; a recall racing the commit can
+        # re-cache old rows for at most the TTL.
+        _forget_latest_memories(*{memory.project_id for memory in memory_by_id.values()})
+
     succeeded = sum(1 for r in results if r.success)
     return BrainBatchOut(
         actionId=payload.actionId,
@@ -1977,6 +2452,20 @@ async def _run_brain_batch_action(
     )
 
 
+@functools.lru_cache(maxsize=4)
+def _integration_mac(secret: str, algo: str) -> Any:
+    """Keyed MAC for ``secret``; callers copy() it rather than re-keying.
+
+    ``sha256`` is HMAC-SHA256. ``blake2b`` is BLAKE2b's native keyed mode
+    (32-byte digest, key capped at BLAKE2b's 64-byte limit), cheaper per
+    byte on large bodies.
+    """
+    key = secret.encode("utf-8")
+    if algo == "blake2b":
+        return hashlib.blake2b(key=key[:64], digest_size=32)
+    return hmac.new(key, digestmod=hashlib.sha256)
+
+
 def _check_integration_signature(request: Request, body_bytes: bytes) -> None:
     secret = os.getenv("INTEGRATION_SIGNING_SECRET", "").strip()
     if not secret:
@@ -1984,7 +2473,11 @@ def _check_integration_signature(request: Request, body_bytes: bytes) -> None:
     provided = request.headers.get("x-integration-signature", "").strip()
     if not provided:
         raise HTTPException(status_code=401, detail="Missing integration signature")
-    provided_hash = provided.split("=", 1)[1] if provided.startswith("sha256=") else provided
+    algo, _, provided_hash = provided.partition("=")
+    if not provided_hash:
+        algo, provided_hash = "sha256", provided
+    elif algo not in {"sha256", "blake2b"}:
+        raise HTTPException(status_code=401, detail="Unsupported integration signature algorithm")
     timestamp_raw = request.headers.get("x-integration-timestamp", "").strip()
     allow_legacy_signature = os.getenv("INTEGRATION_ALLOW_LEGACY_SIGNATURE", "true").strip().lower() == "true"
     if timestamp_raw:
@@ -1999,59 +2492,60 @@ def _check_integration_signature(request: Request, body_bytes: bytes) -> None:
             raise HTTPException(status_code=401, detail="Stale integration signature")
         if timestamp_value > now_ts + max_future_skew_seconds:
             raise HTTPException(status_code=401, detail="Integration timestamp is too far in the future")
-        signed_payload = timestamp_raw.encode("utf-8") + b"." + body_bytes
-        expected_hash = hmac.new(secret.encode("utf-8"), signed_payload, hashlib.sha256).hexdigest()
-        if not hmac.compare_digest(provided_hash, expected_hash):
+        # Signed payload is "<timestamp>.<body>"; feed it in pieces to skip
+        # copying the body.
+        mac = _integration_mac(secret, algo).copy()
+        mac.update(timestamp_raw.encode("utf-8") + b".")
+        mac.update(body_bytes)
+        if not hmac.compare_digest(provided_hash, mac.hexdigest()):
             raise HTTPException(status_code=401, detail="Invalid integration signature")
         return
     if not allow_legacy_signature:
         raise HTTPException(status_code=401, detail="Missing integration timestamp")
-    expected_hash = hmac.new(secret.encode("utf-8"), body_bytes, hashlib.sha256).hexdigest()
-    if not hmac.compare_digest(provided_hash, expected_hash):
+    mac = _integration_mac(secret, algo).copy()
+    mac.update(body_bytes)
+    if not hmac.compare_digest(provided_hash, mac.hexdigest()):
         raise HTTPException(status_code=401, detail="Invalid integration signature")
 
 
-async def _write_recall_log(
+async def _write_recall_telemetry(
     db: AsyncSession,
     *,
+    request: Request,
     project: Project,
     ctx: RequestContext,
     strategy: str,
     query_text: str,
     input_memory_ids: list[int],
     ranked_memory_ids: list[int],
-    weights: dict[str, float] | None = None,
-    score_details: dict[str, Any] | None = None,
-) -> None:
-    db.add(
-        RecallLog(
-            org_id=project.org_id,
-            project_id=project.id,
-            actor_user_id=ctx.actor_user_id,
-            strategy=strategy,
-            query_text=query_text,
-            input_memory_ids=input_memory_ids,
-            ranked_memory_ids=ranked_memory_ids,
-            weights_json=weights or {},
-            score_details_json=score_details or {},
-        )
-    )
-
-
-async def _write_recall_timing(
-    db: AsyncSession,
-    *,
-    project: Project,
-    ctx: RequestContext,
+    weights: dict[str, float] | None,
+    score_details: dict[str, Any] | None,
     served_by: str,
-    strategy: str,
     hedge_delay_ms: int,
     cag_duration_ms: int | None,
     rag_duration_ms: int | None,
     total_duration_ms: int,
 ) -> None:
-    db.add(
-        RecallTiming(
+    """Insert recall's usage event, RecallLog and RecallTiming rows in one statement.
+
+    Nothing reads these rows back, so instead of three ORM inserts at flush
+    the log and usage inserts ride along as data-modifying CTEs of the
+    timing insert: one round trip.
+    """
+    recall_logged = pg_insert(RecallLog).values(
+        org_id=project.org_id,
+        project_id=project.id,
+        actor_user_id=ctx.actor_user_id,
+        strategy=strategy,
+        query_text=query_text,
+        input_memory_ids=input_memory_ids,
+        ranked_memory_ids=ranked_memory_ids,
+        weights_json=weights or {},
+        score_details_json=score_details or {},
+    )
+    stmt = (
+        pg_insert(RecallTiming)
+        .values(
             org_id=project.org_id,
             project_id=project.id,
             actor_user_id=ctx.actor_user_id,
@@ -2062,7 +2556,14 @@ async def _write_recall_timing(
             rag_duration_ms=rag_duration_ms,
             total_duration_ms=total_duration_ms,
         )
+        .add_cte(recall_logged.cte("recall_logged"))
     )
+    if USAGE_EVENTS_ENABLED:
+        usage_logged = pg_insert(UsageEvent).values(
+            **_usage_event_values(request, event_type="recall_called", org_id=project.org_id, project_id=project.id)
+        )
+        stmt = stmt.add_cte(usage_logged.cte("usage_logged"))
+    await db.execute(stmt)
 
 
 def _model_dump_json(model: Any) -> dict[str, Any]:
@@ -2110,7 +2611,9 @@ async def _upsert_query_profile(
             last_served_by=served_by,
             total_queries=1,
             last_compilation_id=compilation_id,
-            last_queried_at=now_utc(),
+            # Transaction time, like the server-defaulted timestamps on the
+            # recall log and usage rows written alongside this upsert.
+            last_queried_at=func.now(),
         )
         .on_conflict_do_update(
             constraint="uq_query_profiles_project_normalized_query",
@@ -2122,8 +2625,8 @@ async def _upsert_query_profile(
                 "last_served_by": served_by,
                 "total_queries": QueryProfile.total_queries + 1,
                 "last_compilation_id": compilation_id,
-                "last_queried_at": now_utc(),
-                "updated_at": now_utc(),
+                "last_queried_at": func.now(),
+                "updated_at": func.now(),
             },
         )
         .returning(QueryProfile.id)
@@ -2131,25 +2634,34 @@ async def _upsert_query_profile(
     return (await db.execute(stmt)).scalar_one()
 
 
-async def _lookup_query_profile(
+async def _get_project_and_query_profile_or_404(
     db: AsyncSession,
-    *,
     project_id: int,
+    ctx: RequestContext,
     query_text: str,
-) -> QueryProfile | None:
+) -> tuple[Project, QueryProfile | None]:
+    """Resolve the project (404 if out of scope) and its saved profile for this query.
+
+    Both come back from one statement; the profile is outer-joined so a query
+    without one still returns the project.
+    """
     normalized_query = _normalize_query_profile_key(query_text)
     if not normalized_query:
-        return None
-    return (
+        return await get_project_or_404(db, project_id, ctx), None
+    row = (
         await db.execute(
-            select(QueryProfile)
-            .where(
-                QueryProfile.project_id == project_id,
-                QueryProfile.normalized_query == normalized_query,
+            select(Project, QueryProfile)
+            .outerjoin(
+                QueryProfile,
+                (QueryProfile.project_id == Project.id) & (QueryProfile.normalized_query == normalized_query),
             )
+            .where(*_project_scope_clauses(project_id, ctx))
             .limit(1)
         )
-    ).scalar_one_or_none()
+    ).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return row[0], row[1]
 
 
 def _query_profile_auto_resolution(profile: QueryProfile | None) -> tuple[str | None, str | None]:
@@ -2286,11 +2798,33 @@ import math
 _ACTIVE_CAG_TASKS = 0
 _ACTIVE_RAG_TASKS = 0
 
-def _resolve_hedge_delay_ms(org_id: int) -> int:
+# CAG lookups score the query against the cache (embedding + similarity), so
+# they stay off the event loop, but on their own pool: sharing the default
+# executor with to_thread callers would queue hedged lookups behind them.
+_CAG_EXECUTOR = ThreadPoolExecutor(max_workers=CAG_LOOKUP_THREADS, thread_name_prefix="cag-lookup")
+
+# org_id -> (expires_at, p95 ms or None). The worker refreshes the Redis copy
+# every few minutes, so a short local TTL keeps the Redis GET off most
+# recalls.
+_HEDGE_P95_CACHE: dict[int, tuple[float, int | None]] = {}
+
+
+async def _hedge_p95_ms(org_id: int) -> int | None:
+    now = time.monotonic()
+    entry = _HEDGE_P95_CACHE.get(org_id)
+    if entry is not None and entry[0] > now:
+        return entry[1]
+    value = await get_cached_hedge_p95_ms(org_id)
+    if HEDGE_P95_LOCAL_TTL_SECONDS > 0:
+        _HEDGE_P95_CACHE[org_id] = (now + HEDGE_P95_LOCAL_TTL_SECONDS, value)
+    return value
+
+
+async def _resolve_hedge_delay_ms(org_id: int) -> int:
     fallback = max(HEDGE_MIN_DELAY_MS, HEDGE_DELAY_MS)
     base_delay = fallback
     if HEDGE_USE_P95_CACHE:
-        cached = get_cached_hedge_p95_ms(org_id)
+        cached = await _hedge_p95_ms(org_id)
         if cached is not None:
             base_delay = max(HEDGE_MIN_DELAY_MS, int(cached))
             
@@ -2316,13 +2850,131 @@ async def _timed_cag_lookup(query_text: str) -> tuple[Any, int]:
     try:
         loop = asyncio.get_running_loop()
         started = loop.time()
-        answer = await asyncio.to_thread(maybe_answer_from_cache, query_text)
+        answer = await loop.run_in_executor(_CAG_EXECUTOR, maybe_answer_from_cache, query_text)
         elapsed = int((loop.time() - started) * 1000)
         return answer, elapsed
     finally:
         _ACTIVE_CAG_TASKS -= 1
 
 
+# Ranked RAG results keyed by (project, query, limit, config, memory fingerprint).
+# The fingerprint changes whenever a memory is added, edited or deleted, so a
+# hit is only ever served against the same memory set; the TTL bounds how long
+# an entry lingers. All access happens on the event loop, so no lock is needed.
+_RECALL_CACHE: OrderedDict[tuple[Any, ...], tuple[float, dict[str, Any]]] = OrderedDict()
+# Same keys -> the future of the request currently running that recall, so a
+# burst of identical queries runs the hybrid search once (single flight).
+_RECALL_INFLIGHT: dict[tuple[Any, ...], asyncio.Future[dict[str, Any]]] = {}
+
+
+async def _project_memory_fingerprint(db: AsyncSession, project_id: int) -> tuple[Any, ...]:
+    row = (
+        await db.execute(
+            select(func.max(Memory.id), func.count(), func.max(Memory.updated_at)).where(
+                Memory.project_id == project_id
+            )
+        )
+    ).one()
+    return tuple(row)
+
+
+def _recall_cache_get(key: tuple[Any, ...], now: float) -> dict[str, Any] | None:
+    entry = _RECALL_CACHE.get(key)
+    if entry is None:
+        return None
+    expires_at, result = entry
+    if expires_at <= now:
+        del _RECALL_CACHE[key]
+        return None
+    _RECALL_CACHE.move_to_end(key)
+    return result
+
+
+def _recall_cache_put(key: tuple[Any, ...], result: dict[str, Any], now: float) -> None:
+    _RECALL_CACHE[key] = (now + RECALL_CACHE_TTL_SECONDS, result)
+    _RECALL_CACHE.move_to_end(key)
+    while len(_RECALL_CACHE) > RECALL_CACHE_MAX_ITEMS:
+        _RECALL_CACHE.popitem(last=False)
+
+
+# project_id -> (expires_at, newest rows). Serves recall's empty-query branch,
+# whose limit is capped at RECALL_LATEST_ROWS. Memory writes in this process
+# evict their project; writes elsewhere (other workers, ingestion) show up
+# within RECALL_LATEST_CACHE_TTL_SECONDS.
+RECALL_LATEST_ROWS = 50
+_LATEST_MEMORIES: OrderedDict[int, tuple[float, list[Row[Any]]]] = OrderedDict()
+
+
+def _forget_latest_memories(*project_ids: int) -> None:
+    for project_id in project_ids:
+        _LATEST_MEMORIES.pop(project_id, None)
+
+
+async def _latest_memory_rows(db: AsyncSession, project_id: int, limit: int) -> list[Row[Any]]:
+    now = time.monotonic()
+    entry = _LATEST_MEMORIES.get(project_id)
+    if entry is not None and entry[0] > now:
+        _LATEST_MEMORIES.move_to_end(project_id)
+        return entry[1][:limit]
+    fetch = RECALL_LATEST_ROWS if RECALL_LATEST_CACHE_TTL_SECONDS > 0 else limit
+    stmt = lambda_stmt(
+        lambda: select(*_MEMORY_OUT_COLUMNS, _MEMORY_TAG_NAMES)
+        .where(Memory.project_id == project_id)
+        .order_by(Memory.created_at.desc(), Memory.id.desc())
+        .limit(fetch)
+    )
+    rows = list((await db.execute(stmt)).all())
+    if RECALL_LATEST_CACHE_TTL_SECONDS > 0:
+        _LATEST_MEMORIES[project_id] = (now + RECALL_LATEST_CACHE_TTL_SECONDS, rows)
+        _LATEST_MEMORIES.move_to_end(project_id)
+        while len(_LATEST_MEMORIES) > RECALL_CACHE_MAX_ITEMS:
+            _LATEST_MEMORIES.popitem(last=False)
+    return rows[:limit]
+
+
+async def _recall_rows_by_ids(db: AsyncSession, memory_ids: Sequence[int]) -> list[Row[Any]]:
+    """Response columns plus tag names for ranked ids, in ranking order.
+
+    Routes-side stand-in for fetch_memories_by_ids: recall only needs the
+    output columns, and carrying tag_names saves a separate tag query.
+    The ids go over as one int[] parameter unnested WITH ORDINALITY, so
+    Postgres returns the rows in ranking order with no Python reorder.
+    """
+    if not memory_ids:
+        return []
+    ranked = (
+        func.unnest(literal(list(memory_ids), ARRAY(Integer)))
+        .table_valued("id", with_ordinality="ord")
+        .render_derived(name="ranked")
+    )
+    stmt = (
+        select(*_MEMORY_OUT_COLUMNS, _MEMORY_TAG_NAMES)
+        .join_from(ranked, Memory, Memory.id == ranked.c.id)
+        .order_by(ranked.c.ord)
+    )
+    return list((await db.execute(stmt)).all())
+
+
+# (query, format, ((memory id, updated_at), ...)) -> pack text. updated_at
+# moves on every edit, so a key can only ever map to one rendering and the
+# cache needs no TTL, just an LRU bound.
+_PACK_CACHE: OrderedDict[tuple[Any, ...], str] = OrderedDict()
+
+
+def _cached_memory_pack(query_text: str, memories: Sequence[Memory | Row[Any]], output_format: str) -> str:
+    key = (query_text, output_format, tuple((m.id, m.updated_at) for m in memories))
+    pack = _PACK_CACHE.get(key)
+    if pack is not None:
+        _PACK_CACHE.move_to_end(key)
+        return pack
+    pack = build_memory_pack(query_text, [(m.type, m.content) for m in memories], output_format=output_format)
+    if RECALL_PACK_CACHE_MAX_ITEMS > 0:
+        _PACK_CACHE[key] = pack
+        while len(_PACK_CACHE) > RECALL_PACK_CACHE_MAX_ITEMS:
+            _PACK_CACHE.popitem(last=False)
+    return pack
+
+
 async def _run_rag_recall_with_timing(
     *,
     db: AsyncSession,
@@ -2336,22 +2988,55 @@ async def _run_rag_recall_with_timing(
     try:
         loop = asyncio.get_running_loop()
         started = loop.time()
+        config = config or HybridRecallConfig(
+            fts_weight=RECALL_WEIGHT_FTS,
+            vector_weight=RECALL_WEIGHT_VECTOR,
+            recency_weight=RECALL_WEIGHT_RECENCY,
+            vector_min_score=RECALL_VECTOR_MIN_SCORE,
+            vector_candidates=RECALL_VECTOR_CANDIDATES,
+        )
+        cache_key: tuple[Any, ...] | None = None
+        leader: asyncio.Future[dict[str, Any]] | None = None
+        if RECALL_CACHE_TTL_SECONDS > 0 and RECALL_CACHE_MAX_ITEMS > 0:
+            fingerprint = await _project_memory_fingerprint(db, project_id)
+            cache_key = (project_id, query_text, limit, config, *fingerprint)
+            while True:
+                cached = _recall_cache_get(cache_key, loop.time())
+                if cached is not None:
+                    return cached, int((loop.time() - started) * 1000)
+                inflight = _RECALL_INFLIGHT.get(cache_key)
+                if inflight is None:
+                    break
+                try:
+                    cached = await asyncio.shield(inflight)
+                except asyncio.CancelledError:
+                    # A cancelled leader (e.g. a RAG task that lost the hedge
+                    # race or failed) leaves the key free: run it ourselves.
+                    if not inflight.cancelled() or asyncio.current_task().cancelling():
+                        raise
+                    continue
+                return cached, int((loop.time() - started) * 1000)
+            leader = loop.create_future()
+            _RECALL_INFLIGHT[cache_key] = leader
         try:
             result = await run_hybrid_rag_recall(
                 db,
                 project_id=project_id,
                 query_text=query_text,
                 limit=limit,
-                config=config or HybridRecallConfig(
-                    fts_weight=RECALL_WEIGHT_FTS,
-                    vector_weight=RECALL_WEIGHT_VECTOR,
-                    recency_weight=RECALL_WEIGHT_RECENCY,
-                    vector_min_score=RECALL_VECTOR_MIN_SCORE,
-                    vector_candidates=RECALL_VECTOR_CANDIDATES,
-                ),
+                config=config,
             )
         except RecallEngineUnavailableError as exc:
             raise HTTPException(status_code=503, detail=str(exc)) from exc
+        else:
+            if leader is not None:
+                _recall_cache_put(cache_key, result, loop.time())
+                leader.set_result(result)
+        finally:
+            if leader is not None:
+                _RECALL_INFLIGHT.pop(cache_key, None)
+                if not leader.done():
+                    leader.cancel()
         elapsed = int((loop.time() - started) * 1000)
         return result, elapsed
     finally:
@@ -2375,6 +3060,67 @@ async def _run_rag_recall(
         )
 
 
+async def _hedged_rag_recall(
+    cag_task: asyncio.Task[tuple[Any, int]],
+    delay_seconds: float,
+    **rag_kwargs: Any,
+) -> tuple[dict[str, Any], int] | None:
+    """RAG leg of a hedged recall.
+
+    Gives CAG a head start of delay_seconds and starts RAG as soon as CAG
+    misses or the delay runs out. Returns None without touching the database
+    when CAG answered (or failed) inside the head start.
+    """
+    await asyncio.wait({cag_task}, timeout=delay_seconds)
+    if cag_task.done() and (cag_task.exception() is not None or cag_task.result()[0] is not None):
+        return None
+    return await _run_rag_recall(**rag_kwargs)
+
+
+@dataclass(frozen=True)
+class _RecallOutcome:
+    served_by: str
+    strategy: str
+    score_details: dict[str, Any]
+    input_memory_ids: list[int]
+    ranked_memory_ids: list[int]
+    top_with_rank: list[tuple[Row[Any], float | None]]
+    cag_pack: str | None = None
+    cag_kv_cache_id: str | None = None
+    cag_memory_matrix: list[list[float]] | None = None
+
+
+async def _recall_outcome(db: AsyncSession, query_text: str, served_by: str, result: Any) -> _RecallOutcome:
+    """Turn a CAG answer or a RAG result into the fields recall responds with."""
+    if served_by == "cag":
+        return _RecallOutcome(
+            served_by="cag",
+            strategy="cag",
+            score_details={
+                "source": result.source,
+                "score": result.score,
+                "snippets": list(result.snippets),
+                "snippet_count": len(result.snippets),
+            },
+            input_memory_ids=[],
+            ranked_memory_ids=[],
+            top_with_rank=[],
+            cag_pack=build_memory_pack(query_text, [("doc", snippet) for snippet in result.snippets]),
+            cag_kv_cache_id=result.kv_cache_id,
+            cag_memory_matrix=result.memory_matrix,
+        )
+    memories = await _recall_rows_by_ids(db, result["ranked_ids"])
+    score_by_id = result["scores"]
+    return _RecallOutcome(
+        served_by="rag",
+        strategy=result["strategy"],
+        score_details=result["score_details"],
+        input_memory_ids=result["input_ids"],
+        ranked_memory_ids=result["ranked_ids"],
+        top_with_rank=[(mem, score_by_id.get(mem.id)) for mem in memories],
+    )
+
+
 @router.post("/projects/{project_id}/memories", response_model=MemoryOut, status_code=201)
 async def create_memory(
     project_id: int,
@@ -2384,74 +3130,183 @@ async def create_memory(
     ctx: RequestContext = Depends(get_actor_context),
 ) -> MemoryOut:
     require_role(ctx, "member")
-    client_ip = _extract_client_ip(request)
-    account_key = str(ctx.org_id or "")
-    allowed, detail = check_write_limits(client_ip, account_key)
-    if not allowed:
-        code = 503 if detail and detail.startswith("Service unavailable") else 429
-        raise HTTPException(status_code=code, detail=detail)
-    project = await get_project_or_404(db, project_id, ctx)
+    # Scope check (400 without an org) happens before any DB work.
+    scoped_project_id = _scoped_project_id(project_id, ctx)
 
     auth_user_id: int | None = getattr(request.state, "auth_user_id", None)
-    await _check_daily_limit(db, auth_user_id, "memories_created", DAILY_MEMORY_LIMIT)
+    await _check_rate_and_db_limits(
+        check_write_limits,
+        _extract_client_ip(request),
+        str(ctx.org_id or ""),
+        _check_daily_limit(
+            db,
+            auth_user_id,
+            "memories_created",
+            is_unlimited=getattr(request.state, "auth_is_unlimited", None),
+        ),
+    )
 
-    embedding = compute_embedding(
-        " ".join(part for part in [payload.title or "", payload.content or ""] if part).strip()
+    [(embedding, hilbert_index, content_hash)] = await _embed_and_hash(
+        [" ".join(part for part in [payload.title or "", payload.content or ""] if part).strip()],
+        [payload.content],
     )
     memory = Memory(
-        project_id=project.id,
+        project_id=scoped_project_id,
         created_by_user_id=ctx.actor_user_id,
         type=payload.type,
         source=payload.source,
         title=payload.title,
         content=payload.content,
         metadata_json=payload.metadata or {},
-        content_hash=_content_hash(payload.content),
+        content_hash=content_hash,
         search_vector=embedding,
         embedding_vector=embedding,
-        hilbert_index=compute_hilbert_index(embedding),
+        hilbert_index=hilbert_index,
     )
     db.add(memory)
-    await db.flush()
+    await _flush_project_child(db)
+    # The flush succeeded, so the subquery resolved to project_id; record that
+    # instead of letting the expired attribute trigger a reload.
+    set_committed_value(memory, "project_id", project_id)
+    # The scope clauses pin Project.org_id to ctx.org_id whenever one is set.
+    org_id = ctx.org_id
+    if org_id is None:
+        org_id = (await db.execute(select(Project.org_id).where(Project.id == project_id))).scalar_one()
 
     # Upsert tags
     tag_names: list[str] = []
     if payload.tags:
-        tags = await _upsert_tags(db, project.id, payload.tags)
-        for tag in tags:
-            db.add(MemoryTag(memory_id=memory.id, tag_id=tag.id))
+        tags = await _upsert_tags(db, memory.project_id, payload.tags, link_memory_id=memory.id)
         tag_names = [t.name for t in tags]
 
     await write_audit(
         db,
         ctx=ctx,
-        org_id=project.org_id,
+        org_id=org_id,
         action="memory.create",
         entity_type="memory",
         entity_id=memory.id,
         metadata={"type": memory.type, "source": memory.source},
     )
-    await write_usage(
+    await _increment_daily_counter(
         db,
-        request=request,
-        ctx=ctx,
-        event_type="memory_created",
-        org_id=project.org_id,
-        project_id=project.id,
+        auth_user_id,
+        "memories_created",
+        with_usage_period=True,
+        usage_events=[
+            _usage_event_values(request, event_type="memory_created", org_id=org_id, project_id=memory.project_id)
+        ],
+        is_unlimited=getattr(request.state, "auth_is_unlimited", None),
     )
-    await _increment_daily_counter(db, auth_user_id, "memories_created")
-    await _increment_usage_period(db, auth_user_id, "memories_created")
     _billing_hook("memory_created", auth_user_id)
     await db.commit()
-    await db.refresh(memory)
+    _forget_latest_memories(project_id)
 
     # Fire-and-forget embedding task (no-op until WORKER_ENABLED=true + pgvector ready)
-    from app.worker.tasks import compute_memory_embedding, _enqueue_if_enabled
-    _enqueue_if_enabled(compute_memory_embedding, memory.id)
+    worker_tasks._enqueue_if_enabled(worker_tasks.compute_memory_embedding, memory.id)
 
     return _memory_to_out(memory, tag_names)
 
 
+@router.post("/projects/{project_id}/memories/batch", response_model=List[MemoryOut], status_code=201)
+async def create_memories_batch(
+    project_id: int,
+    payload: MemoryBatchCreate,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    ctx: RequestContext = Depends(get_actor_context),
+) -> Response:
+    """Create up to 500 memories in one transaction.
+
+    Same auth, RBAC and usage limits as POST /projects/{project_id}/memories,
+    but the rows go out as one multi-row INSERT ... RETURNING and the batch is
+    recorded as a single audit entry.
+    """
+    require_role(ctx, "member")
+    org_id = await _resolve_project_org_id(db, project_id, ctx)
+
+    auth_user_id: int | None = getattr(request.state, "auth_user_id", None)
+    await _check_rate_and_db_limits(
+        check_write_limits,
+        _extract_client_ip(request),
+        str(ctx.org_id or ""),
+        _check_daily_limit(
+            db,
+            auth_user_id,
+            "memories_created",
+            is_unlimited=getattr(request.state, "auth_is_unlimited", None),
+        ),
+    )
+
+    embedded = await _embed_and_hash(
+        [" ".join(part for part in [item.title or "", item.content or ""] if part).strip() for item in payload.items],
+        [item.content for item in payload.items],
+    )
+    memories: list[Memory] = []
+    for item, (embedding, hilbert_index, content_hash) in zip(payload.items, embedded):
+        memories.append(
+            Memory(
+                project_id=project_id,
+                created_by_user_id=ctx.actor_user_id,
+                type=item.type,
+                source=item.source,
+                title=item.title,
+                content=item.content,
+                metadata_json=item.metadata or {},
+                content_hash=content_hash,
+                search_vector=embedding,
+                embedding_vector=embedding,
+                hilbert_index=hilbert_index,
+            )
+        )
+    db.add_all(memories)
+    # The org lookup may be a cached hit for a project deleted since; the FK
+    # then turns that into a 404.
+    await _flush_project_child(db)
+
+    # Resolve every distinct tag name in the batch with a single upsert.
+    names_by_item = [_clean_tag_names(item.tags) for item in payload.items]
+    all_names = list(dict.fromkeys(name for names in names_by_item for name in names))
+    tag_by_name = dict(zip(all_names, await _upsert_clean_tags(db, project_id, all_names)))
+    tag_names_by_memory = {memory.id: names for memory, names in zip(memories, names_by_item)}
+    await _link_memory_tags(
+        db,
+        [(memory_id, tag_by_name[name].id) for memory_id, names in tag_names_by_memory.items() for name in names],
+    )
+
+    await write_audit(
+        db,
+        ctx=ctx,
+        org_id=org_id,
+        action="memory.batch_create",
+        entity_type="project",
+        entity_id=project_id,
+        metadata={"count": len(memories), "memory_ids": [m.id for m in memories]},
+    )
+    usage_values = _usage_event_values(request, event_type="memory_created", org_id=org_id, project_id=project_id)
+    await _increment_daily_counter(
+        db,
+        auth_user_id,
+        "memories_created",
+        amount=len(memories),
+        with_usage_period=True,
+        usage_events=[usage_values] * len(memories),
+        is_unlimited=getattr(request.state, "auth_is_unlimited", None),
+    )
+    _billing_hook("memory_created", auth_user_id, quantity=len(memories))
+    await db.commit()
+    _forget_latest_memories(project_id)
+
+    for memory in memories:
+        worker_tasks._enqueue_if_enabled(worker_tasks.compute_memory_embedding, memory.id)
+
+    return _json_list_response(
+        _MEMORY_LIST_ADAPTER,
+        [_memory_to_out(m, tag_names_by_memory.get(m.id, [])) for m in memories],
+        status_code=201,
+    )
+
+
 @router.post("/integrations/memories", response_model=MemoryOut, status_code=201)
 async def capture_memory(
     payload: MemoryCaptureIn,
@@ -2491,13 +3346,13 @@ async def list_integration_memories(
     offset: int = Query(default=0, ge=0),
     db: AsyncSession = Depends(get_db),
     ctx: RequestContext = Depends(get_actor_context),
-) -> List[MemoryOut]:
+) -> Response:
     require_role(ctx, "viewer")
-    stmt = select(Memory)
+    stmt = select(*_MEMORY_OUT_COLUMNS, _MEMORY_TAG_NAMES)
 
     if project_id is not None:
-        project = await get_project_or_404(db, project_id, ctx)
-        stmt = stmt.where(Memory.project_id == project.id)
+        await _resolve_project_org_id(db, project_id, ctx)
+        stmt = stmt.where(Memory.project_id == project_id)
     else:
         if ctx.org_id is None:
             raise HTTPException(status_code=400, detail="X-Org-Id required")
@@ -2510,9 +3365,8 @@ async def list_integration_memories(
             .offset(offset)
             .limit(limit)
         )
-    ).scalars().all()
-    tag_map = await _load_tag_names(db, [m.id for m in items])
-    return [_memory_to_out(m, tag_map.get(m.id, [])) for m in items]
+    ).all()
+    return _json_list_response(_MEMORY_LIST_ADAPTER, [_memory_to_out(m, m.tag_names or []) for m in items])
 
 
 @router.post("/integrations/memories/{memory_id}/contextualize")
@@ -2522,32 +3376,52 @@ async def contextualize_memory(
     ctx: RequestContext = Depends(get_actor_context),
 ) -> dict[str, Any]:
     require_role(ctx, "member")
-    memory = (await db.execute(select(Memory).where(Memory.id == memory_id).limit(1))).scalar_one_or_none()
+    memory = (
+        await db.execute(select(Memory).options(*_SKIP_EMBEDDINGS).where(Memory.id == memory_id).limit(1))
+    ).scalar_one_or_none()
     if memory is None:
         raise HTTPException(status_code=404, detail="Memory not found")
     project = await get_project_or_404(db, memory.project_id, ctx)
-    from app.worker.tasks import _enqueue_if_enabled, contextualize_memory_with_ollama
-    _enqueue_if_enabled(contextualize_memory_with_ollama, memory.id)
+    worker_tasks._enqueue_if_enabled(worker_tasks.contextualize_memory_with_ollama, memory.id)
     return {"status": "queued", "memory_id": memory.id, "project_id": project.id}
 
 
 @router.get("/projects/{project_id}/memories", response_model=List[MemoryOut])
 async def list_memories(
     project_id: int,
+    limit: int = Query(default=50, ge=1, le=200),
+    before_created_at: datetime | None = Query(
+        default=None, description="Keyset cursor: created_at of the last item of the previous page"
+    ),
+    before_id: int | None = Query(default=None, ge=1, description="Keyset cursor: id of the last item of the previous page"),
     db: AsyncSession = Depends(get_db),
     ctx: RequestContext = Depends(get_actor_context),
-) -> List[MemoryOut]:
+) -> Response:
     require_role(ctx, "viewer")
-    project = await get_project_or_404(db, project_id, ctx)
-    items = (
-        await db.execute(
-            select(Memory)
-            .where(Memory.project_id == project.id)
-            .order_by(Memory.created_at.desc(), Memory.id.desc())
-        )
-    ).scalars().all()
-    tag_map = await _load_tag_names(db, [m.id for m in items])
-    return [_memory_to_out(m, tag_map.get(m.id, [])) for m in items]
+    if (before_created_at is None) != (before_id is None):
+        raise HTTPException(status_code=422, detail="before_created_at and before_id must be provided together")
+    if ctx.org_id is None and not ctx.bootstrap_mode:
+        raise HTTPException(status_code=400, detail="X-Org-Id required")
+    org_id = ctx.org_id
+    # lambda_stmt: the statement is built and its cache key computed once per
+    # shape (scoped / keyset page); later calls only bind the new values.
+    stmt = lambda_stmt(
+        lambda: select(*_MEMORY_OUT_COLUMNS, _MEMORY_TAG_NAMES)
+        .join(Project, Project.id == Memory.project_id)
+        .where(Project.id == project_id)
+        .order_by(Memory.created_at.desc(), Memory.id.desc())
+        .limit(limit)
+    )
+    if org_id is not None:
+        stmt += lambda s: s.where(Project.org_id == org_id)
+    if before_created_at is not None:
+        # Row comparison matches the sort order, so each page is a bounded
+        # range scan on ix_memories_project_created_id.
+        stmt += lambda s: s.where(tuple_(Memory.created_at, Memory.id) < tuple_(before_created_at, before_id))
+    items = (await db.execute(stmt)).all()
+    if not items:
+        await _ensure_project_exists(db, project_id, ctx)
+    return _json_list_response(_MEMORY_LIST_ADAPTER, [_memory_to_out(m, m.tag_names or []) for m in items])
 
 
 @router.get("/projects/{project_id}/memories/{memory_id}", response_model=MemoryOut)
@@ -2558,18 +3432,19 @@ async def get_memory(
     ctx: RequestContext = Depends(get_actor_context),
 ) -> MemoryOut:
     require_role(ctx, "viewer")
-    project = await get_project_or_404(db, project_id, ctx)
-    memory = (
+    # Scope check, response columns and tag names in one statement.
+    row = (
         await db.execute(
-            select(Memory)
-            .where(Memory.project_id == project.id, Memory.id == memory_id)
+            select(*_MEMORY_OUT_COLUMNS, _MEMORY_TAG_NAMES)
+            .join(Project, Project.id == Memory.project_id)
+            .where(*_project_scope_clauses(project_id, ctx), Memory.id == memory_id)
             .limit(1)
         )
-    ).scalar_one_or_none()
-    if memory is None:
+    ).first()
+    if row is None:
+        await _ensure_project_exists(db, project_id, ctx)
         raise HTTPException(status_code=404, detail="Memory not found")
-    tag_map = await _load_tag_names(db, [memory.id])
-    return _memory_to_out(memory, tag_map.get(memory.id, []))
+    return _memory_to_out(row, row.tag_names or [])
 
 
 @router.patch("/projects/{project_id}/memories/{memory_id}", response_model=MemoryOut)
@@ -2580,20 +3455,10 @@ async def update_memory(
     db: AsyncSession = Depends(get_db),
     ctx: RequestContext = Depends(get_actor_context),
 ) -> MemoryOut:
-    from app.worker.tasks import compute_memory_embedding, _enqueue_if_enabled
     from app.models import MemoryEmbedding
 
     require_role(ctx, "member")
-    project = await get_project_or_404(db, project_id, ctx)
-    memory = (
-        await db.execute(
-            select(Memory)
-            .where(Memory.project_id == project.id, Memory.id == memory_id)
-            .limit(1)
-        )
-    ).scalar_one_or_none()
-    if memory is None:
-        raise HTTPException(status_code=404, detail="Memory not found")
+    memory, org_id, tag_names = await _get_scoped_memory_or_404(db, project_id, memory_id, ctx)
 
     content_fields_changed = False
     if payload.type is not None:
@@ -2608,6 +3473,7 @@ async def update_memory(
         if not clean_content:
             raise HTTPException(status_code=422, detail="content must not be empty")
         memory.content = clean_content
+        memory.content_hash = _content_hash(clean_content)
         content_fields_changed = True
     if payload.metadata is not None:
         memory.metadata_json = payload.metadata
@@ -2618,11 +3484,10 @@ async def update_memory(
         embedding_text = " ".join(
             part for part in [memory.title or "", memory.content or ""] if part
         ).strip()
-        embedding = compute_embedding(embedding_text)
+        [(embedding, hilbert_index)] = await _embed_texts([embedding_text])
         memory.search_vector = embedding
         memory.embedding_vector = embedding
-        memory.hilbert_index = compute_hilbert_index(embedding)
-        memory.content_hash = _content_hash(memory.content)
+        memory.hilbert_index = hilbert_index
         embedding_row = (
             await db.execute(select(MemoryEmbedding).where(MemoryEmbedding.memory_id == memory.id).limit(1))
         ).scalar_one_or_none()
@@ -2634,30 +3499,25 @@ async def update_memory(
             embedding_row.updated_at = datetime.now(timezone.utc)
 
     if payload.tags is not None:
-        existing_links = (
-            await db.execute(select(MemoryTag).where(MemoryTag.memory_id == memory.id))
-        ).scalars().all()
-        for link in existing_links:
-            await db.delete(link)
-        tags = await _upsert_tags(db, project.id, payload.tags)
-        for tag in tags:
-            db.add(MemoryTag(memory_id=memory.id, tag_id=tag.id))
+        await db.execute(delete(MemoryTag).where(MemoryTag.memory_id == memory.id))
+        tags = await _upsert_tags(db, memory.project_id, payload.tags, link_memory_id=memory.id)
+        tag_names = sorted(tag.name for tag in tags)
 
     await write_audit(
         db,
         ctx=ctx,
-        org_id=project.org_id,
+        org_id=org_id,
         action="memory.update",
         entity_type="memory",
         entity_id=memory.id,
         metadata={"type": memory.type, "source": memory.source},
     )
     await db.commit()
-    await db.refresh(memory)
+    _forget_latest_memories(project_id)
+    # eager_defaults brought updated_at back with the UPDATE, so no refresh.
     if content_fields_changed:
-        _enqueue_if_enabled(compute_memory_embedding, memory.id)
-    tag_map = await _load_tag_names(db, [memory.id])
-    return _memory_to_out(memory, tag_map.get(memory.id, []))
+        worker_tasks._enqueue_if_enabled(worker_tasks.compute_memory_embedding, memory.id)
+    return _memory_to_out(memory, tag_names)
 
 
 @router.delete("/projects/{project_id}/memories/{memory_id}", status_code=204)
@@ -2668,21 +3528,12 @@ async def delete_memory(
     ctx: RequestContext = Depends(get_actor_context),
 ) -> None:
     require_role(ctx, "member")
-    project = await get_project_or_404(db, project_id, ctx)
-    memory = (
-        await db.execute(
-            select(Memory)
-            .where(Memory.project_id == project.id, Memory.id == memory_id)
-            .limit(1)
-        )
-    ).scalar_one_or_none()
-    if memory is None:
-        raise HTTPException(status_code=404, detail="Memory not found")
+    memory, org_id, _ = await _get_scoped_memory_or_404(db, project_id, memory_id, ctx)
 
     await write_audit(
         db,
         ctx=ctx,
-        org_id=project.org_id,
+        org_id=org_id,
         action="memory.delete",
         entity_type="memory",
         entity_id=memory.id,
@@ -2690,6 +3541,7 @@ async def delete_memory(
     )
     await db.delete(memory)
     await db.commit()
+    _forget_latest_memories(project_id)
 
 
 @router.post("/brain/batch", response_model=BrainBatchOut)
@@ -2861,6 +3713,14 @@ async def undo_brain_batch(
     return response
 
 
+_FTS_CONFIG = literal_column("'english'::regconfig")
+# Scalar subquery: parsed once per statement (InitPlan) and shared by the @@
+# filter and the rank, with a constant regconfig for the GIN index. Built once
+# here; the query text is bound per call as :fts_query.
+_FTS_TSQUERY = select(func.websearch_to_tsquery(_FTS_CONFIG, bindparam("fts_query", type_=String))).scalar_subquery()
+_FTS_RANK = func.ts_rank_cd(Memory.search_tsv, _FTS_TSQUERY).label("rank_score")
+
+
 @router.get("/projects/{project_id}/search", response_model=SearchOut)
 async def search_memories(
     project_id: int,
@@ -2872,66 +3732,62 @@ async def search_memories(
     limit: int = Query(default=20, ge=1, le=100),
     db: AsyncSession = Depends(get_db),
     ctx: RequestContext = Depends(get_actor_context),
-) -> SearchOut:
+) -> Response:
     """FTS search with optional filters. Ranks by ts_rank_cd + recency boost."""
     require_role(ctx, "viewer")
-    project = await get_project_or_404(db, project_id, ctx)
+    org_id = await _resolve_project_org_id(db, project_id, ctx)
 
     query_clean = q.strip()
-    stmt = select(Memory).where(Memory.project_id == project.id)
+    # lambda_stmt, as in list_memories: each filter shape is built and keyed
+    # once; later calls only bind the new values.
+    stmt = lambda_stmt(
+        lambda: select(*_MEMORY_OUT_COLUMNS, _MEMORY_TAG_NAMES).where(Memory.project_id == project_id)
+    )
 
     if type:
-        stmt = stmt.where(Memory.type == type)
+        stmt += lambda s: s.where(Memory.type == type)
     if source:
-        stmt = stmt.where(Memory.source == source)
+        stmt += lambda s: s.where(Memory.source == source)
     if tag:
-        tag_row = (
-            await db.execute(
-                select(Tag)
-                .where(Tag.project_id == project.id, func.lower(Tag.name) == tag.lower())
-                .limit(1)
-            )
-        ).scalar_one_or_none()
-        if tag_row:
-            stmt = stmt.join(MemoryTag, MemoryTag.memory_id == Memory.id).where(
-                MemoryTag.tag_id == tag_row.id
+        tag_lower = tag.lower()
+        # Semi-join on the tag instead of resolving it first; an unknown tag
+        # simply yields no rows.
+        stmt += lambda s: s.where(
+            Memory.id.in_(
+                select(MemoryTag.memory_id)
+                .join(Tag, Tag.id == MemoryTag.tag_id)
+                .where(Tag.project_id == project_id, func.lower(Tag.name) == tag_lower)
             )
-        else:
-            # Tag doesn't exist → no results
-            return SearchOut(project_id=project.id, query=query_clean, total=0, items=[])
+        )
 
-    top_with_rank: list[tuple[Memory, float | None]] = []
+    top_with_rank: list[tuple[Row[Any], float | None]] = []
     if query_clean:
-        tsquery = func.websearch_to_tsquery("english", query_clean)
-        rank_expr = func.ts_rank_cd(Memory.search_tsv, tsquery).label("rank_score")
-        fts_stmt = (
-            stmt.add_columns(rank_expr)
-            .where(Memory.search_tsv.op("@@")(tsquery))
-            .order_by(desc(rank_expr), Memory.created_at.desc(), Memory.id.desc())
+        stmt += lambda s: (
+            s.add_columns(_FTS_RANK)
+            .where(Memory.search_tsv.op("@@")(_FTS_TSQUERY))
+            .order_by(desc(_FTS_RANK), Memory.created_at.desc(), Memory.id.desc())
             .limit(limit)
         )
-        rows = (await db.execute(fts_stmt)).all()
-        top_with_rank = [(row[0], float(row[1])) for row in rows]
+        rows = (await db.execute(stmt, {"fts_query": query_clean})).all()
+        top_with_rank = [(row, float(row.rank_score)) for row in rows]
     else:
-        recent = (
-            await db.execute(
-                stmt.order_by(Memory.created_at.desc(), Memory.id.desc()).limit(limit)
-            )
-        ).scalars().all()
+        stmt += lambda s: s.order_by(Memory.created_at.desc(), Memory.id.desc()).limit(limit)
+        recent = (await db.execute(stmt)).all()
         top_with_rank = [(m, None) for m in recent]
 
     await write_usage(
         db, request=request, ctx=ctx,
-        event_type="search_called", org_id=project.org_id, project_id=project.id,
+        event_type="search_called", org_id=org_id, project_id=project_id,
     )
     await db.commit()
 
-    tag_map = await _load_tag_names(db, [m.id for m, _ in top_with_rank])
-    return SearchOut(
-        project_id=project.id,
-        query=query_clean,
-        total=len(top_with_rank),
-        items=[_recall_item_to_out(m, tag_map.get(m.id, []), rs) for m, rs in top_with_rank],
+    return _json_response(
+        SearchOut.model_construct(
+            project_id=project_id,
+            query=query_clean,
+            total=len(top_with_rank),
+            items=[_recall_item_to_out(m, m.tag_names or [], rs) for m, rs in top_with_rank],
+        )
     )
 
 
@@ -2945,23 +3801,28 @@ async def recall(
     format: str = Query(default="text", description="Output format: 'text' (default), 'toon' (compact), 'toonx' (versioned structured transport), or 'auto' (use query profile preference when available)"),
     db: AsyncSession = Depends(get_db),
     ctx: RequestContext = Depends(get_actor_context),
-) -> RecallOut:
+) -> Response:
     require_role(ctx, "viewer")
-    project = await get_project_or_404(db, project_id, ctx)
+    query_clean = query.strip()
+    project, query_profile = await _get_project_and_query_profile_or_404(db, project_id, ctx, query_clean)
     client_ip = _extract_client_ip(request)
     account_key = str(getattr(request.state, "auth_user_id", "") or getattr(request.state, "api_key_id", "") or "anon")
-    allowed, detail = check_recall_limits(client_ip, account_key)
-    if not allowed:
-        code = 503 if detail and detail.startswith("Service unavailable") else 429
-        raise HTTPException(status_code=code, detail=detail)
-
     auth_user_id: int | None = getattr(request.state, "auth_user_id", None)
-    await _check_daily_limit(db, auth_user_id, "recall_queries", DAILY_RECALL_LIMIT)
+    await _check_rate_and_db_limits(
+        check_recall_limits,
+        client_ip,
+        account_key,
+        _check_daily_limit(
+            db,
+            auth_user_id,
+            "recall_queries",
+            is_unlimited=getattr(request.state, "auth_is_unlimited", None),
+        ),
+    )
 
-    query_clean = query.strip()
     loop = asyncio.get_running_loop()
     request_started = loop.time()
-    top_with_rank: list[tuple[Memory, float | None]] = []
+    top_with_rank: list[tuple[Row[Any], float | None]] = []
     strategy = "recency"
     served_by = "rag"
     input_memory_ids: list[int] = []
@@ -2979,7 +3840,6 @@ async def recall(
 
     cag_kv_cache_id: str | None = None
     cag_memory_matrix: list[list[float]] | None = None
-    query_profile = await _lookup_query_profile(db, project_id=project.id, query_text=query_clean) if query_clean else None
     rag_config, profile_tuning = _query_profile_recall_config(query_profile)
     if profile_tuning["applied"]:
         weight_details = {
@@ -2989,22 +3849,16 @@ async def recall(
         }
 
     if query_clean:
-        if is_local_cag():
-            cag_started = loop.time()
-            cag_answer = maybe_answer_from_cache(query_clean)
-            cag_duration_ms = int((loop.time() - cag_started) * 1000)
+        if is_local_cag() or not CAG_ENABLED:
+            # With CAG disabled nothing can win a hedge: skip the hedge delay
+            # lookup and the CAG thread hop and go straight to RAG.
+            cag_answer = None
+            if CAG_ENABLED:
+                cag_started = loop.time()
+                cag_answer = maybe_answer_from_cache(query_clean)
+                cag_duration_ms = int((loop.time() - cag_started) * 1000)
             if cag_answer is not None:
-                served_by = "cag"
-                strategy = "cag"
-                cag_kv_cache_id = cag_answer.kv_cache_id
-                cag_memory_matrix = cag_answer.memory_matrix
-                score_details = {
-                    "source": cag_answer.source,
-                    "score": cag_answer.score,
-                    "snippets": list(cag_answer.snippets),
-                    "snippet_count": len(cag_answer.snippets),
-                }
-                cag_pack = build_memory_pack(query_clean, [("doc", snippet) for snippet in cag_answer.snippets])
+                outcome = await _recall_outcome(db, query_clean, "cag", cag_answer)
             else:
                 rag_result, rag_duration_ms = await _run_rag_recall_with_timing(
                     db=db,
@@ -3013,128 +3867,54 @@ async def recall(
                     limit=limit,
                     config=rag_config,
                 )
-                served_by = "rag"
-                strategy = rag_result["strategy"]
-                input_memory_ids = rag_result["input_ids"]
-                ranked_memory_ids = rag_result["ranked_ids"]
-                score_details = rag_result["score_details"]
-                memories = await fetch_memories_by_ids(db, ranked_memory_ids)
-                score_by_id = rag_result["scores"]
-                top_with_rank = [(mem, score_by_id.get(mem.id)) for mem in memories]
+                outcome = await _recall_outcome(db, query_clean, "rag", rag_result)
         else:
-            hedge_delay_ms = _resolve_hedge_delay_ms(project.org_id)
+            # Both legs start now; the RAG leg itself waits out CAG's head start
+            # (or a CAG miss), so a fast CAG hit never touches the database.
+            # Start CAG first: its thread lookup runs while the hedge delay
+            # comes back from the local cache or Redis.
             cag_task = asyncio.create_task(_timed_cag_lookup(query_clean))
-            rag_task: asyncio.Task | None = None
+            hedge_delay_ms = await _resolve_hedge_delay_ms(project.org_id)
+            rag_task = asyncio.create_task(
+                _hedged_rag_recall(
+                    cag_task,
+                    hedge_delay_ms / 1000.0,
+                    project_id=project.id,
+                    query_text=query_clean,
+                    limit=limit,
+                    config=rag_config,
+                )
+            )
             try:
-                # Give CAG a head-start. If it answers quickly, we avoid launching RAG.
-                done, _ = await asyncio.wait({cag_task}, timeout=hedge_delay_ms / 1000.0)
+                done, _ = await asyncio.wait({cag_task, rag_task}, return_when=asyncio.FIRST_COMPLETED)
+                cag_answer = None
                 if cag_task in done:
-                    cag_answer, cag_duration_ms = await cag_task
-                    if cag_answer is not None:
-                        served_by = "cag"
-                        strategy = "cag"
-                        cag_kv_cache_id = cag_answer.kv_cache_id
-                        cag_memory_matrix = cag_answer.memory_matrix
-                        score_details = {
-                            "source": cag_answer.source,
-                            "score": cag_answer.score,
-                            "snippets": list(cag_answer.snippets),
-                            "snippet_count": len(cag_answer.snippets),
-                        }
-                        cag_pack = build_memory_pack(query_clean, [("doc", snippet) for snippet in cag_answer.snippets])
-                    else:
-                        rag_result, rag_duration_ms = await _run_rag_recall(
-                            project_id=project.id,
-                            query_text=query_clean,
-                            limit=limit,
-                            config=rag_config,
-                        )
-                        served_by = "rag"
-                        strategy = rag_result["strategy"]
-                        input_memory_ids = rag_result["input_ids"]
-                        ranked_memory_ids = rag_result["ranked_ids"]
-                        score_details = rag_result["score_details"]
-                        memories = await fetch_memories_by_ids(db, ranked_memory_ids)
-                        score_by_id = rag_result["scores"]
-                        top_with_rank = [(mem, score_by_id.get(mem.id)) for mem in memories]
+                    cag_answer, cag_duration_ms = cag_task.result()
+                if cag_answer is not None:
+                    outcome = await _recall_outcome(db, query_clean, "cag", cag_answer)
                 else:
-                    # CAG is slow: hedge by launching RAG and take the first useful result.
-                    rag_task = asyncio.create_task(
-                        _run_rag_recall(project_id=project.id, query_text=query_clean, limit=limit, config=rag_config)
-                    )
-                    done, _ = await asyncio.wait({cag_task, rag_task}, return_when=asyncio.FIRST_COMPLETED)
-                    if rag_task in done:
-                        rag_result, rag_duration_ms = await rag_task
-                        served_by = "rag"
-                        strategy = rag_result["strategy"]
-                        input_memory_ids = rag_result["input_ids"]
-                        ranked_memory_ids = rag_result["ranked_ids"]
-                        score_details = rag_result["score_details"]
-                        memories = await fetch_memories_by_ids(db, ranked_memory_ids)
-                        score_by_id = rag_result["scores"]
-                        top_with_rank = [(mem, score_by_id.get(mem.id)) for mem in memories]
-                        if not cag_task.done():
-                            cag_task.cancel()
-                            try:
-                                await cag_task
-                            except asyncio.CancelledError:
-                                pass
-                    else:
-                        cag_answer, cag_duration_ms = await cag_task
-                        if cag_answer is not None:
-                            served_by = "cag"
-                            strategy = "cag"
-                            cag_kv_cache_id = cag_answer.kv_cache_id
-                            cag_memory_matrix = cag_answer.memory_matrix
-                            score_details = {
-                                "source": cag_answer.source,
-                                "score": cag_answer.score,
-                                "snippets": list(cag_answer.snippets),
-                                "snippet_count": len(cag_answer.snippets),
-                            }
-                            cag_pack = build_memory_pack(query_clean, [("doc", snippet) for snippet in cag_answer.snippets])
-                            if rag_task is not None and not rag_task.done():
-                                rag_task.cancel()
-                                try:
-                                    await rag_task
-                                except asyncio.CancelledError:
-                                    pass
-                        else:
-                            if rag_task is None:
-                                    rag_task = asyncio.create_task(
-                                        _run_rag_recall(project_id=project.id, query_text=query_clean, limit=limit, config=rag_config)
-                                    )
-                            rag_result, rag_duration_ms = await rag_task
-                            served_by = "rag"
-                            strategy = rag_result["strategy"]
-                            input_memory_ids = rag_result["input_ids"]
-                            ranked_memory_ids = rag_result["ranked_ids"]
-                            score_details = rag_result["score_details"]
-                            memories = await fetch_memories_by_ids(db, ranked_memory_ids)
-                            score_by_id = rag_result["scores"]
-                            top_with_rank = [(mem, score_by_id.get(mem.id)) for mem in memories]
+                    # RAG finished first, or CAG missed and the RAG leg is running.
+                    rag_outcome = await rag_task
+                    assert rag_outcome is not None
+                    rag_result, rag_duration_ms = rag_outcome
+                    outcome = await _recall_outcome(db, query_clean, "rag", rag_result)
             finally:
-                if not cag_task.done():
-                    cag_task.cancel()
-                    try:
-                        await cag_task
-                    except asyncio.CancelledError:
-                        pass
-                if rag_task is not None and not rag_task.done():
-                    rag_task.cancel()
-                    try:
-                        await rag_task
-                    except asyncio.CancelledError:
-                        pass
+                pending = [task for task in (cag_task, rag_task) if not task.done()]
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+        served_by = outcome.served_by
+        strategy = outcome.strategy
+        score_details = outcome.score_details
+        input_memory_ids = outcome.input_memory_ids
+        ranked_memory_ids = outcome.ranked_memory_ids
+        top_with_rank = outcome.top_with_rank
+        cag_pack = outcome.cag_pack
+        cag_kv_cache_id = outcome.cag_kv_cache_id
+        cag_memory_matrix = outcome.cag_memory_matrix
     else:
         rag_started = loop.time()
-        recent_result = await db.execute(
-            select(Memory)
-            .where(Memory.project_id == project.id)
-            .order_by(Memory.created_at.desc(), Memory.id.desc())
-            .limit(limit)
-        )
-        top_with_rank = [(m, None) for m in recent_result.scalars().all()]
+        top_with_rank = [(m, None) for m in await _latest_memory_rows(db, project.id, limit)]
         ranked_memory_ids = [m.id for m, _ in top_with_rank]
         score_details = {"reason": "empty_query"}
         rag_duration_ms = int((loop.time() - rag_started) * 1000)
@@ -3159,11 +3939,7 @@ async def recall(
         format_resolution_reason = "invalid_format_fallback"
 
     if cag_pack is None:
-        pack = build_memory_pack(
-            query_clean,
-            [(m.type, m.content) for m, _ in top_with_rank],
-            output_format=output_format,
-        )
+        pack = _cached_memory_pack(query_clean, [m for m, _ in top_with_rank], output_format)
     else:
         # Re-format the CAG pack in TOON if requested (cag_pack is always text).
         if output_format == "toon":
@@ -3175,8 +3951,7 @@ async def recall(
         else:
             pack = cag_pack
 
-    tag_map = await _load_tag_names(db, [m.id for m, _ in top_with_rank]) if top_with_rank else {}
-    out_items = [_recall_item_to_out(m, tag_map.get(m.id, []), rs) for m, rs in top_with_rank]
+    out_items = [_recall_item_to_out(m, m.tag_names or [], rs) for m, rs in top_with_rank]
     mir = build_mir_from_recall(
         project_id=project.id,
         query=query_clean,
@@ -3196,19 +3971,17 @@ async def recall(
         refresh_mir_bundle(mir, target_format=output_format)
 
     total_duration_ms = int((loop.time() - request_started) * 1000)
-    await write_usage(
+    await _increment_daily_counter(
         db,
-        request=request,
-        ctx=ctx,
-        event_type="recall_called",
-        org_id=project.org_id,
-        project_id=project.id,
+        auth_user_id,
+        "recall_queries",
+        with_usage_period=True,
+        is_unlimited=getattr(request.state, "auth_is_unlimited", None),
     )
-    await _increment_daily_counter(db, auth_user_id, "recall_queries")
-    await _increment_usage_period(db, auth_user_id, "recall_queries")
     _billing_hook("recall_called", auth_user_id)
-    await _write_recall_log(
+    await _write_recall_telemetry(
         db,
+        request=request,
         project=project,
         ctx=ctx,
         strategy=strategy,
@@ -3217,13 +3990,7 @@ async def recall(
         ranked_memory_ids=ranked_memory_ids,
         weights=weight_details if query_clean else {},
         score_details=score_details,
-    )
-    await _write_recall_timing(
-        db,
-        project=project,
-        ctx=ctx,
         served_by=served_by,
-        strategy=strategy,
         hedge_delay_ms=hedge_delay_ms,
         cag_duration_ms=cag_duration_ms,
         rag_duration_ms=rag_duration_ms,
@@ -3251,20 +4018,23 @@ async def recall(
     response.headers["X-ContextCache-Recall-Requested-Format"] = requested_format or "text"
     response.headers["X-ContextCache-Recall-Resolved-Format"] = output_format
     response.headers["X-ContextCache-Recall-Format-Reason"] = format_resolution_reason or "unknown"
-    return RecallOut(
-        project_id=project.id,
-        query=query_clean,
-        memory_pack_text=pack,
-        items=out_items,
-        compilation_id=compilation_id,
-        renderer=mir.renderer,
-        mir=mir,
-        requested_format=requested_format or "text",
-        resolved_format=output_format,
-        format_resolution_reason=format_resolution_reason,
-        query_profile_id=query_profile_id,
-        global_kv_cache_id=cag_kv_cache_id,
-        global_memory_matrix=cag_memory_matrix,
+    return _json_response(
+        RecallOut.model_construct(
+            project_id=project.id,
+            query=query_clean,
+            memory_pack_text=pack,
+            items=out_items,
+            compilation_id=compilation_id,
+            renderer=mir.renderer,
+            mir=mir,
+            requested_format=requested_format or "text",
+            resolved_format=output_format,
+            format_resolution_reason=format_resolution_reason,
+            query_profile_id=query_profile_id,
+            global_kv_cache_id=cag_kv_cache_id,
+            global_memory_matrix=cag_memory_matrix,
+        ),
+        response,
     )
 
 
@@ -3276,7 +4046,7 @@ async def compile_context(
     response: Response,
     db: AsyncSession = Depends(get_db),
     ctx: RequestContext = Depends(get_actor_context),
-) -> RecallOut:
+) -> Response:
     result = await recall(
         project_id=project_id,
         request=request,
@@ -3287,7 +4057,7 @@ async def compile_context(
         db=db,
         ctx=ctx,
     )
-    response.headers["X-ContextCache-Compiler-Surface"] = "context_compile"
+    result.headers["X-ContextCache-Compiler-Surface"] = "context_compile"
     return result
 
 
@@ -75,6 +75,10 @@ class MemoryCreate(BaseModel):
     tags: List[str] = Field(default_factory=list)
 
 
+class MemoryBatchCreate(BaseModel):
+    items: List[MemoryCreate] = Field(min_length=1, max_length=500)
+
+
 class MemoryUpdate(BaseModel):
     type: MemoryType | None = None
     source: MemorySource | None = None
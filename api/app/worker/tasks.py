@@ -71,8 +71,17 @@ async def _run_in_db(coro):
     """Create a fresh async engine/session, run *coro(session)*, commit, dispose."""
     from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
     from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import NullPool
 
-    engine = create_async_engine(DATABASE_URL, pool_pre_ping=True)
+    from app.db import DB_PGBOUNCER, pgbouncer_connect_args
+
+    # The engine lives for a single task and is disposed right after, so a pool
+    # (and pre-ping on a brand-new connection) would only add overhead.
+    engine = create_async_engine(
+        DATABASE_URL,
+        poolclass=NullPool,
+        connect_args=pgbouncer_connect_args() if DB_PGBOUNCER else {},
+    )
     async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
     try:
         async with async_session() as session:
@@ -639,14 +648,8 @@ def process_raw_capture_task(self, capture_id: int) -> dict:
             capture.last_error_at = now
             capture.dead_lettered_at = now
             return {"status": "skipped_no_project", "capture_id": capture_id}
-        project = (
-            await session.execute(
-                select(Project.id)
-                .where(Project.id == project_id, Project.org_id == capture.org_id)
-                .limit(1)
-            )
-        ).scalar_one_or_none()
-        if project is None:
+        project = await session.get(Project, project_id)
+        if project is None or project.org_id != capture.org_id:
             logger.warning(
                 "[worker] process_raw_capture_task project missing or cross-org id=%s project_id=%s org_id=%s",
                 capture_id,
@@ -17,7 +17,9 @@ from sqlalchemy.pool import NullPool
 import app.db as db_module
 import app.main as main_module
 import app.migrate as migrate_module
+import app.rate_limit as rate_limit_module
 import app.rotate_key as rotate_key_module
+import app.routes as routes_module
 import app.seed as seed_module
 from app.auth_utils import SESSION_COOKIE_NAME, hash_token, now_utc, session_expiry
 from app.db import get_db, hash_api_key
@@ -131,6 +133,16 @@ async def clean_db(test_engine: AsyncEngine) -> AsyncIterator[None]:
                 """
             )
         )
+    # Ids restart with every test, so in-process caches keyed by id must too.
+    routes_module._PROJECT_ORG_CACHE.clear()
+    routes_module._RECALL_CACHE.clear()
+    routes_module._PACK_CACHE.clear()
+    routes_module._LATEST_MEMORIES.clear()
+    routes_module._HEDGE_P95_CACHE.clear()
+    routes_module._USAGE_TOTALS_CACHE.clear()
+    # The in-memory rate-limit fallback would otherwise count writes across
+    # tests that all come from the same client IP.
+    rate_limit_module._REQUESTS.clear()
     yield
 
 
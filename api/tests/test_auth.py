@@ -12,8 +12,8 @@ from app import external_auth as external_auth_module
 from app import rate_limit as rate_limit_module
 from app import routes as routes_module
 from app.auth_routes import _resolve_admin_audit_org_id
-from app.auth_utils import hash_token, now_utc
-from app.models import AuditLog, AuthInvite, AuthMagicLink, AuthSession, AuthUser, Membership, OrgSubscription, Organization, UsageCounter, User, UserSubscription, Waitlist
+from app.auth_utils import hash_token, ip_prefix, now_utc
+from app.models import AuditLog, AuthInvite, AuthMagicLink, AuthSession, AuthUser, Membership, OrgSubscription, Organization, UsageCounter, UsagePeriod, User, UserSubscription, Waitlist
 from .conftest import Ctx, auth_headers, login_via_magic_link, session_auth_headers
 
 pytestmark = pytest.mark.asyncio
@@ -337,21 +337,88 @@ async def test_weekly_limit_still_enforced_when_daily_limit_disabled(
     )
     await db_session.commit()
 
-    monkeypatch.setattr(routes_module, "DAILY_MEMORY_LIMIT", 0)
-    monkeypatch.setattr(routes_module, "WEEKLY_MEMORY_LIMIT", 5)
+    monkeypatch.setitem(routes_module._PERIOD_LIMITS, ("day", "memories_created"), 0)
+    monkeypatch.setitem(routes_module._PERIOD_LIMITS, ("week", "memories_created"), 5)
 
     with pytest.raises(HTTPException) as excinfo:
         await routes_module._check_daily_limit(
             db_session,
             auth_user.id,
             "memories_created",
-            routes_module.DAILY_MEMORY_LIMIT,
         )
 
     assert excinfo.value.status_code == 429
     assert "Weekly limit reached" in str(excinfo.value.detail)
 
 
+async def test_increment_daily_counter_enforces_weekly_limit_from_upsert(
+    db_session: AsyncSession,
+    monkeypatch,
+) -> None:
+    auth_user = AuthUser(email="weekly-increment@example.com", is_admin=False)
+    db_session.add(auth_user)
+    await db_session.flush()
+    db_session.add(UsageCounter(user_id=auth_user.id, day=now_utc().date(), memories_created=4))
+    await db_session.commit()
+
+    monkeypatch.setitem(routes_module._PERIOD_LIMITS, ("day", "memories_created"), 0)
+    monkeypatch.setitem(routes_module._PERIOD_LIMITS, ("week", "memories_created"), 5)
+
+    await routes_module._increment_daily_counter(db_session, auth_user.id, "memories_created")
+    with pytest.raises(HTTPException) as excinfo:
+        await routes_module._increment_daily_counter(db_session, auth_user.id, "memories_created")
+
+    assert excinfo.value.status_code == 429
+    assert "Weekly limit reached" in str(excinfo.value.detail)
+    await db_session.commit()
+    counter = (
+        await db_session.execute(select(UsageCounter).where(UsageCounter.user_id == auth_user.id))
+    ).scalar_one()
+    await db_session.refresh(counter)
+    assert counter.memories_created == 6
+
+
+async def test_increment_daily_counter_bumps_usage_period_in_same_statement(
+    db_session: AsyncSession,
+) -> None:
+    auth_user = AuthUser(email="period-increment@example.com", is_admin=False)
+    db_session.add(auth_user)
+    await db_session.commit()
+
+    await routes_module._increment_daily_counter(
+        db_session, auth_user.id, "recall_queries", amount=2, with_usage_period=True
+    )
+    await routes_module._increment_daily_counter(
+        db_session, auth_user.id, "recall_queries", with_usage_period=True
+    )
+    # projects_created has no monthly column; only the daily counter moves.
+    await routes_module._increment_daily_counter(
+        db_session, auth_user.id, "projects_created", with_usage_period=True
+    )
+    await db_session.commit()
+
+    period = (
+        await db_session.execute(select(UsagePeriod).where(UsagePeriod.user_id == auth_user.id))
+    ).scalar_one()
+    await db_session.refresh(period)
+    assert period.search_queries == 3
+    assert period.memories_created == 0
+    counter = (
+        await db_session.execute(select(UsageCounter).where(UsageCounter.user_id == auth_user.id))
+    ).scalar_one()
+    await db_session.refresh(counter)
+    assert counter.recall_queries == 3
+    assert counter.projects_created == 1
+
+
+async def test_ip_prefix_masks_ipv4_and_compressed_ipv6() -> None:
+    assert ip_prefix("203.0.113.77") == "203.0.113.0/24"
+    assert ip_prefix("2001:db8:85a3::8a2e:370:7334") == "2001:db8:85a3::/64"
+    assert ip_prefix("::ffff:203.0.113.77") == "203.0.113.0/24"
+    assert ip_prefix("testclient") == "testclient"
+    assert ip_prefix("") is None
+
+
 async def test_admin_invite_endpoints_require_admin(client, db_session: AsyncSession) -> None:
     admin_headers = await _login_session(
         client,
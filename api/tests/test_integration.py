@@ -12,6 +12,9 @@ from sqlalchemy.dialects import postgresql
 from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app import audit_buffer as audit_buffer_module
+from app import rate_limit as rate_limit_module
+from app import routes as routes_module
 from app.analyzer.algorithm import build_vector_candidate_stmt
 from app.auth_utils import hash_token, now_utc
 from app.db import hash_api_key
@@ -36,6 +39,7 @@ from app.models import (
     Tag,
     RetrievalFeedback,
     UsageCounter,
+    UsageEvent,
     User,
     MemoryTag,
 )
@@ -292,6 +296,40 @@ async def test_membership_routes_require_owner(client, db_session: AsyncSession,
     assert len(allowed.json()) >= 1
 
 
+async def test_create_membership_upserts_role(client, db_session: AsyncSession, app_ctx: Ctx) -> None:
+    owner_headers = await _login_org_member(client, db_session, app_ctx, role="owner")
+    email = f"invitee-{uuid.uuid4().hex[:8]}@example.com"
+    created = await client.post(
+        f"/orgs/{app_ctx.org_id}/memberships",
+        headers=owner_headers,
+        json={"email": email, "role": "viewer"},
+    )
+    assert created.status_code == 201
+    updated = await client.post(
+        f"/orgs/{app_ctx.org_id}/memberships",
+        headers=owner_headers,
+        json={"email": email.upper(), "role": "admin"},
+    )
+    assert updated.status_code == 201
+    assert updated.json()["id"] == created.json()["id"]
+    assert updated.json()["role"] == "admin"
+
+    membership_id = created.json()["id"]
+    patched = await client.patch(
+        f"/orgs/{app_ctx.org_id}/memberships/{membership_id}",
+        headers=owner_headers,
+        json={"role": "member"},
+    )
+    assert patched.status_code == 200
+    assert patched.json()["email"] == email
+    assert patched.json()["role"] == "member"
+    deleted = await client.delete(
+        f"/orgs/{app_ctx.org_id}/memberships/{membership_id}",
+        headers=owner_headers,
+    )
+    assert deleted.status_code == 204
+
+
 @pytest.mark.parametrize("role", ["member", "owner"])
 async def test_create_memory_allowed_for_member_owner(
     client,
@@ -343,6 +381,187 @@ async def test_recall_returns_rank_score_for_fts_matches(
     assert items[0]["rank_score"] is not None
 
 
+async def test_list_memories_keyset_pagination(
+    client,
+    db_session: AsyncSession,
+    app_ctx: Ctx,
+) -> None:
+    owner_headers = await _login_org_member(client, db_session, app_ctx, role="owner")
+    for idx in range(3):
+        created = await client.post(
+            f"/projects/{app_ctx.project_id}/memories",
+            headers=owner_headers,
+            json={"type": "note", "content": f"Paged memory {idx}"},
+        )
+        assert created.status_code == 201
+
+    full = await client.get(f"/projects/{app_ctx.project_id}/memories", headers=owner_headers)
+    assert full.status_code == 200
+    all_ids = [item["id"] for item in full.json()]
+
+    first = await client.get(
+        f"/projects/{app_ctx.project_id}/memories",
+        headers=owner_headers,
+        params={"limit": 2},
+    )
+    assert [item["id"] for item in first.json()] == all_ids[:2]
+    last = first.json()[-1]
+    second = await client.get(
+        f"/projects/{app_ctx.project_id}/memories",
+        headers=owner_headers,
+        params={"limit": 2, "before_created_at": last["created_at"], "before_id": last["id"]},
+    )
+    assert second.status_code == 200
+    assert [item["id"] for item in second.json()] == all_ids[2:4]
+
+    half_cursor = await client.get(
+        f"/projects/{app_ctx.project_id}/memories",
+        headers=owner_headers,
+        params={"before_id": last["id"]},
+    )
+    assert half_cursor.status_code == 422
+
+
+async def test_create_memory_in_unknown_project_returns_404(
+    client,
+    db_session: AsyncSession,
+    app_ctx: Ctx,
+) -> None:
+    owner_headers = await _login_org_member(client, db_session, app_ctx, role="owner")
+    response = await client.post(
+        f"/projects/{app_ctx.project_id + 1000}/memories",
+        headers=owner_headers,
+        json={"type": "note", "content": "Nowhere to go"},
+    )
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Project not found"
+
+
+async def test_create_memories_batch(
+    client,
+    db_session: AsyncSession,
+    app_ctx: Ctx,
+) -> None:
+    owner_headers = await _login_org_member(client, db_session, app_ctx, role="owner")
+    created = await client.post(
+        f"/projects/{app_ctx.project_id}/memories/batch",
+        headers=owner_headers,
+        json={
+            "items": [
+                {"type": "note", "content": "Batch memory one", "tags": ["Shared", "one"]},
+                {"type": "decision", "content": "Batch memory two", "tags": ["shared", "shared"]},
+            ]
+        },
+    )
+    assert created.status_code == 201
+    body = created.json()
+    assert [item["content"] for item in body] == ["Batch memory one", "Batch memory two"]
+    assert sorted(body[0]["tags"]) == ["one", "shared"]
+    assert body[1]["tags"] == ["shared"]
+
+    listed = await client.get(f"/projects/{app_ctx.project_id}/memories", headers=owner_headers)
+    assert {item["id"] for item in body} <= {item["id"] for item in listed.json()}
+
+    # Existing tags are reused case-insensitively; only "new" is inserted.
+    single = await client.post(
+        f"/projects/{app_ctx.project_id}/memories",
+        headers=owner_headers,
+        json={"type": "note", "content": "Tagged again", "tags": ["SHARED", "new", "New"]},
+    )
+    assert single.status_code == 201
+    assert single.json()["tags"] == ["shared", "new"]
+    tag_names = (
+        await db_session.execute(select(Tag.name).where(Tag.project_id == app_ctx.project_id))
+    ).scalars().all()
+    assert sorted(tag_names) == ["new", "one", "shared"]
+    # Usage events ride along with the counter upsert: one per created memory.
+    usage_events = (
+        await db_session.execute(
+            select(UsageEvent.project_id).where(UsageEvent.event_type == "memory_created")
+        )
+    ).scalars().all()
+    assert usage_events == [app_ctx.project_id] * 3
+
+    empty = await client.post(
+        f"/projects/{app_ctx.project_id}/memories/batch",
+        headers=owner_headers,
+        json={"items": []},
+    )
+    assert empty.status_code == 422
+
+
+async def test_search_filters_by_fts_and_tag(
+    client,
+    db_session: AsyncSession,
+    app_ctx: Ctx,
+) -> None:
+    owner_headers = await _login_org_member(client, db_session, app_ctx, role="owner")
+    for content, tags in [
+        ("Postgres vacuum tuning for bloated tables.", ["db"]),
+        ("Postgres connection pooling with pgbouncer.", ["ops"]),
+    ]:
+        created = await client.post(
+            f"/projects/{app_ctx.project_id}/memories",
+            headers=owner_headers,
+            json={"type": "finding", "content": content, "tags": tags},
+        )
+        assert created.status_code == 201
+
+    search = await client.get(
+        f"/projects/{app_ctx.project_id}/search",
+        headers=owner_headers,
+        params={"q": "postgres", "tag": "DB"},
+    )
+    assert search.status_code == 200
+    body = search.json()
+    assert body["total"] == 1
+    assert "vacuum" in body["items"][0]["content"]
+    assert body["items"][0]["rank_score"] is not None
+    assert body["items"][0]["tags"] == ["db"]
+
+    missing = await client.get(
+        f"/projects/{app_ctx.project_id}/search",
+        headers=owner_headers,
+        params={"q": "postgres", "tag": "nope"},
+    )
+    assert missing.status_code == 200
+    assert missing.json()["total"] == 0
+
+    # Same statement shape, new bound values.
+    pooling = await client.get(
+        f"/projects/{app_ctx.project_id}/search",
+        headers=owner_headers,
+        params={"q": "pgbouncer", "tag": "ops"},
+    )
+    assert [item["tags"] for item in pooling.json()["items"]] == [["ops"]]
+
+
+async def test_concurrent_identical_recalls_run_hybrid_search_once(
+    app_ctx: Ctx,
+    monkeypatch,
+) -> None:
+    calls = 0
+
+    async def _slow_recall(db, *, project_id, query_text, limit, config=None):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return {"strategy": "hybrid", "input_ids": [], "ranked_ids": [], "scores": {}, "score_details": {}}
+
+    monkeypatch.setattr(routes_module, "run_hybrid_rag_recall", _slow_recall)
+
+    results = await asyncio.gather(
+        *(
+            routes_module._run_rag_recall(project_id=app_ctx.project_id, query_text="same query", limit=5)
+            for _ in range(5)
+        )
+    )
+
+    assert calls == 1
+    assert all(result is results[0][0] for result, _ in results)
+    assert not routes_module._RECALL_INFLIGHT
+
+
 async def test_recall_returns_503_when_private_engine_raises(
     client,
     db_session: AsyncSession,
@@ -496,6 +715,58 @@ async def test_recall_cag_toon_format_returns_pack_without_crashing(
     assert body["global_kv_cache_id"] == "kv-test-123"
 
 
+async def test_hedged_recall_starts_rag_only_after_cag_miss(
+    client,
+    db_session: AsyncSession,
+    app_ctx: Ctx,
+    monkeypatch,
+) -> None:
+    from app.analyzer.cag import CAGAnswer
+
+    rag_calls = 0
+
+    async def _counting_rag(**kwargs):
+        nonlocal rag_calls
+        rag_calls += 1
+        result = {"strategy": "hybrid", "input_ids": [], "ranked_ids": [], "scores": {}, "score_details": {}}
+        return result, 1
+
+    def _cag(query: str):
+        if query == "cag miss":
+            return None
+        return CAGAnswer(source="test-cache", score=0.9, snippets=["Cached"], kv_cache_id=None, memory_matrix=None)
+
+    monkeypatch.setattr("app.routes.is_local_cag", lambda: False)
+    monkeypatch.setattr("app.routes.maybe_answer_from_cache", _cag)
+
+    async def _hedge_delay_ms(org_id: int) -> int:
+        return 5_000
+
+    monkeypatch.setattr("app.routes._resolve_hedge_delay_ms", _hedge_delay_ms)
+    monkeypatch.setattr("app.routes._run_rag_recall", _counting_rag)
+
+    viewer_headers = await _login_org_member(client, db_session, app_ctx, role="viewer")
+    hit = await client.get(
+        f"/projects/{app_ctx.project_id}/recall",
+        headers=viewer_headers,
+        params={"query": "cag hit", "limit": 5},
+    )
+    assert hit.status_code == 200
+    assert hit.headers["X-ContextCache-Recall-Served-By"] == "cag"
+    assert rag_calls == 0
+
+    # A miss starts RAG right away instead of waiting out the hedge delay.
+    miss = await client.get(
+        f"/projects/{app_ctx.project_id}/recall",
+        headers=viewer_headers,
+        params={"query": "cag miss", "limit": 5},
+    )
+    assert miss.status_code == 200
+    assert miss.headers["X-ContextCache-Recall-Served-By"] == "rag"
+    assert rag_calls == 1
+    assert int(miss.headers["X-ContextCache-Recall-Duration-Ms"]) < 5_000
+
+
 async def test_create_memory_persists_embedding_vectors(
     client,
     app_ctx: Ctx,
@@ -701,6 +972,47 @@ async def test_usage_limits_are_zeroed_for_unlimited_user(
     }
 
 
+async def test_unlimited_user_is_counted_but_not_limited(
+    client,
+    db_session: AsyncSession,
+    app_ctx: Ctx,
+    monkeypatch,
+) -> None:
+    owner_headers = await _login_org_member(client, db_session, app_ctx, role="owner")
+    owner_auth = (
+        await db_session.execute(
+            select(AuthUser).where(AuthUser.email == app_ctx.users["owner"]).limit(1)
+        )
+    ).scalar_one()
+    owner_auth.is_unlimited = True
+    # Already at both daily limits.
+    db_session.add(UsageCounter(user_id=owner_auth.id, day=now_utc().date(), memories_created=1, recall_queries=2))
+    await db_session.commit()
+
+    monkeypatch.setitem(routes_module._PERIOD_LIMITS, ("day", "recall_queries"), 2)
+    monkeypatch.setitem(routes_module._PERIOD_LIMITS, ("day", "memories_created"), 1)
+
+    recall = await client.get(
+        f"/projects/{app_ctx.project_id}/recall",
+        headers=owner_headers,
+        params={"query": "anything"},
+    )
+    assert recall.status_code == 200
+    created = await client.post(
+        f"/projects/{app_ctx.project_id}/memories",
+        headers=owner_headers,
+        json={"type": "note", "content": "Past the daily limit"},
+    )
+    assert created.status_code == 201
+
+    counter = (
+        await db_session.execute(select(UsageCounter).where(UsageCounter.user_id == owner_auth.id))
+    ).scalar_one()
+    await db_session.refresh(counter)
+    assert counter.recall_queries == 3
+    assert counter.memories_created == 2
+
+
 async def test_user_plan_change_applies_to_next_org_creation(
     client,
     db_session: AsyncSession,
@@ -890,7 +1202,11 @@ async def test_cag_hit_short_circuits_before_rag_in_hedged_mode(
     from app.analyzer.cag import CAGAnswer
 
     monkeypatch.setattr("app.routes.is_local_cag", lambda: False)
-    monkeypatch.setattr("app.routes._resolve_hedge_delay_ms", lambda org_id: 250)
+
+    async def _hedge_delay_ms(org_id: int) -> int:
+        return 250
+
+    monkeypatch.setattr("app.routes._resolve_hedge_delay_ms", _hedge_delay_ms)
 
     async def _fast_cag(_query_text: str):
         return (
@@ -1608,6 +1924,109 @@ async def test_reject_inbox_item_writes_audit_log(
     assert audit_row.entity_type == "inbox_item"
 
 
+async def _buffered_audit_actions(db_session: AsyncSession, org_id: int) -> list[str]:
+    return list(
+        (
+            await db_session.execute(
+                select(AuditLog.action).where(AuditLog.org_id == org_id).order_by(AuditLog.id.asc())
+            )
+        ).scalars().all()
+    )
+
+
+def _stage_buffered_audit(db_session: AsyncSession, org_id: int, action: str) -> None:
+    audit_buffer_module.stage(
+        db_session,
+        org_id=org_id,
+        actor_user_id=None,
+        api_key_prefix=None,
+        action=action,
+        entity_type="org",
+        entity_id=org_id,
+        metadata={"buffered": True},
+    )
+
+
+async def test_buffered_audit_row_is_written_after_commit(
+    client,
+    db_session: AsyncSession,
+    app_ctx: Ctx,
+    test_engine,
+    monkeypatch,
+) -> None:
+    monkeypatch.setattr(audit_buffer_module, "AUDIT_LOG_BUFFERED", True)
+    audit_buffer_module.start(test_engine)
+    try:
+        owner_headers = await _login_org_member(client, db_session, app_ctx, role="owner")
+        response = await client.post(
+            f"/orgs/{app_ctx.org_id}/projects",
+            headers=owner_headers,
+            json={"name": "Buffered audit project"},
+        )
+        assert response.status_code == 201
+        # The background writer picks the row up within one flush interval.
+        for _ in range(50):
+            if "project.create" in await _buffered_audit_actions(db_session, app_ctx.org_id):
+                break
+            await asyncio.sleep(0.02)
+        assert "project.create" in await _buffered_audit_actions(db_session, app_ctx.org_id)
+    finally:
+        await audit_buffer_module.stop(test_engine)
+
+
+async def test_buffered_audit_row_is_discarded_on_rollback(
+    db_session: AsyncSession,
+    app_ctx: Ctx,
+    test_engine,
+    monkeypatch,
+) -> None:
+    monkeypatch.setattr(audit_buffer_module, "AUDIT_LOG_BUFFERED", True)
+    audit_buffer_module.start(test_engine)
+    try:
+        _stage_buffered_audit(db_session, app_ctx.org_id, "buffered.rolled_back")
+        await db_session.rollback()
+        _stage_buffered_audit(db_session, app_ctx.org_id, "buffered.committed")
+        await db_session.commit()
+    finally:
+        await audit_buffer_module.stop(test_engine)
+
+    assert await _buffered_audit_actions(db_session, app_ctx.org_id) == ["buffered.committed"]
+
+
+async def test_buffered_audit_stop_flushes_in_flight_and_queued_rows(
+    db_session: AsyncSession,
+    app_ctx: Ctx,
+    test_engine,
+    monkeypatch,
+) -> None:
+    monkeypatch.setattr(audit_buffer_module, "AUDIT_LOG_BUFFERED", True)
+    monkeypatch.setattr(audit_buffer_module, "AUDIT_FLUSH_INTERVAL_MS", 1)
+    write_started = asyncio.Event()
+    original_write_batch = audit_buffer_module._write_batch
+
+    async def _slow_write_batch(engine, batch):
+        write_started.set()
+        # Still writing when stop() is called.
+        await asyncio.sleep(0.2)
+        await original_write_batch(engine, batch)
+
+    monkeypatch.setattr(audit_buffer_module, "_write_batch", _slow_write_batch)
+    audit_buffer_module.start(test_engine)
+    try:
+        _stage_buffered_audit(db_session, app_ctx.org_id, "buffered.in_flight")
+        await db_session.commit()
+        await asyncio.wait_for(write_started.wait(), 2)
+        _stage_buffered_audit(db_session, app_ctx.org_id, "buffered.queued")
+        await db_session.commit()
+    finally:
+        await audit_buffer_module.stop(test_engine)
+
+    assert await _buffered_audit_actions(db_session, app_ctx.org_id) == [
+        "buffered.in_flight",
+        "buffered.queued",
+    ]
+
+
 async def test_admin_recall_logs_returns_recent_entries(
     client,
     db_session: AsyncSession,
@@ -3232,6 +3651,63 @@ async def test_integration_signature_rejects_stale_timestamp_when_legacy_disable
     assert "stale" in response.json()["detail"].lower()
 
 
+async def test_integration_signature_accepts_timestamped_and_legacy_signatures(
+    client,
+    app_ctx: Ctx,
+    monkeypatch,
+) -> None:
+    monkeypatch.setenv("INTEGRATION_SIGNING_SECRET", "super-secret")
+    monkeypatch.setenv("INTEGRATION_ALLOW_LEGACY_SIGNATURE", "true")
+    # Earlier tests in this module share the in-memory write burst limiter.
+    monkeypatch.setattr(rate_limit_module, "WRITE_RATE_LIMIT_PER_IP_PER_MINUTE", 0)
+    monkeypatch.setattr(rate_limit_module, "WRITE_RATE_LIMIT_PER_ACCOUNT_PER_MINUTE", 0)
+    payload = {
+        "project_id": app_ctx.project_id,
+        "type": "note",
+        "source": "api",
+        "content": "signed integration capture",
+        "metadata": {},
+        "tags": [],
+    }
+    body = json.dumps(payload).encode("utf-8")
+    headers = auth_headers(app_ctx, role="owner")
+    headers["Content-Type"] = "application/json"
+
+    timestamp = str(int(now_utc().timestamp()))
+    digest = hmac.new(b"super-secret", timestamp.encode("utf-8") + b"." + body, hashlib.sha256).hexdigest()
+    signed = await client.post(
+        "/integrations/memories",
+        headers={**headers, "X-Integration-Timestamp": timestamp, "X-Integration-Signature": f"sha256={digest}"},
+        content=body,
+    )
+    assert signed.status_code == 201, signed.text
+
+    legacy_digest = hmac.new(b"super-secret", body, hashlib.sha256).hexdigest()
+    legacy = await client.post(
+        "/integrations/memories",
+        headers={**headers, "X-Integration-Signature": legacy_digest},
+        content=body,
+    )
+    assert legacy.status_code == 201, legacy.text
+
+    blake_digest = hashlib.blake2b(
+        timestamp.encode("utf-8") + b"." + body, key=b"super-secret", digest_size=32
+    ).hexdigest()
+    blake = await client.post(
+        "/integrations/memories",
+        headers={**headers, "X-Integration-Timestamp": timestamp, "X-Integration-Signature": f"blake2b={blake_digest}"},
+        content=body,
+    )
+    assert blake.status_code == 201, blake.text
+
+    tampered = await client.post(
+        "/integrations/memories",
+        headers={**headers, "X-Integration-Signature": legacy_digest},
+        content=body.replace(b"capture", b"Capture"),
+    )
+    assert tampered.status_code == 401
+
+
 async def test_admin_security_posture_reports_strict_timestamp_mode(
     client,
     db_session: AsyncSession,
@@ -256,7 +256,16 @@ def cmd_mem(args: list[str]) -> None:
         project_id = _flag(args, "--project")
         if not project_id:
             _err("--project is required")
-        rows = _request("GET", f"/projects/{project_id}/memories") or []
+        # The endpoint is paginated; follow the keyset cursor like the SDK.
+        rows: list[dict] = []
+        params: dict[str, Any] = {"limit": 200}
+        while True:
+            page = _request("GET", f"/projects/{project_id}/memories?{urlencode(params)}") or []
+            rows.extend(page)
+            if len(page) < params["limit"]:
+                break
+            params["before_created_at"] = page[-1]["created_at"]
+            params["before_id"] = page[-1]["id"]
         _print_table(rows, ["id", "type", "source", "title", "created_at"])
 
     else:
@@ -137,8 +137,20 @@ class _Memories:
         self._t = t
 
     def list(self, project_id: int) -> list[dict]:
-        """Return all memories for a project."""
-        return self._t.request("GET", f"/projects/{project_id}/memories")
+        """Return all memories for a project, newest first.
+
+        The endpoint is paginated; this follows the keyset cursor until the
+        last page.
+        """
+        rows: list[dict] = []
+        params: dict[str, Any] = {"limit": 200}
+        while True:
+            page = self._t.request("GET", f"/projects/{project_id}/memories", params=params)
+            rows.extend(page)
+            if len(page) < params["limit"]:
+                return rows
+            params["before_created_at"] = page[-1]["created_at"]
+            params["before_id"] = page[-1]["id"]
 
     def add(
         self,
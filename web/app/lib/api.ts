@@ -165,7 +165,18 @@ export interface Memory {
 
 export const memories = {
   list: async (projectId: number) => {
-    const rows = await request<any[]>(`/api/projects/${projectId}/memories`);
+    // The endpoint is keyset-paginated; walk every page so callers still get the full list.
+    const pageSize = 200;
+    const rows: any[] = [];
+    const query = new URLSearchParams({ limit: String(pageSize) });
+    for (;;) {
+      const page = await request<any[]>(`/api/projects/${projectId}/memories?${query.toString()}`);
+      rows.push(...page);
+      if (page.length < pageSize) break;
+      const last = page[page.length - 1];
+      query.set('before_created_at', String(last.created_at));
+      query.set('before_id', String(last.id));
+    }
     return rows.map(normalizeMemory);
   },
 